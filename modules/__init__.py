@@ -0,0 +1 @@
+"""Shared helpers for managing the platform team GitHub organization."""
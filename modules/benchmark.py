@@ -0,0 +1,313 @@
+"""
+Program benchmarks on synthetic organizations under Pulumi's mock runtime.
+
+Each size generates a values file with that many members and repositories
+(repositories spread over a few profiles, like a real org), then runs the
+program in a fresh interpreter with `pulumi.runtime.set_mocks`, so nothing
+talks to GitHub, Bitwarden or the Pulumi service. Every run reports:
+
+* import_seconds: importing pulumi, pulumi_github and the program;
+* config_seconds: parsing and validating the values file;
+* construct_seconds: until `program.run` returns;
+* settle_seconds: until every registration has been answered by the mocks;
+* resources_per_second and peak_rss_mb for the whole run;
+* process_seconds: wall time of the interpreter, including start-up.
+
+Results are appended to a JSON Lines history with the commit they were
+measured at. Each run is compared to the median of the last few runs of
+the same size, so growth shows up as a trend rather than as run-to-run
+noise. Metrics below a per-metric floor, such as sub-second timings, are
+not compared. Sizes that exceed --timeout are recorded as timed out
+instead of hanging CI.
+
+Usage:
+    python -m modules.benchmark
+    python -m modules.benchmark --sizes 100 1000 --fail-on-regression 25
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from modules.bulk_import import build_import_plan
+from modules.config_model import (
+    MEMBERS_SECTION,
+    REPOSITORIES_SECTION,
+    PlatformConfig,
+)
+from modules.deploy_plan import PROJECT_ROOT
+from modules.memory_profile import peak_rss_mb
+from modules.repository_profiles import PROFILE_KEY, PROFILES_SECTION
+from modules.resource_names import PROJECT_NAME
+from modules.synthetic_org import generate_org
+
+# Settling grows about n^1.5 in the SDK: roughly 60s at 1k and 11 minutes
+# at 5k, so 10k already reaches the default timeout
+DEFAULT_SIZES = (1_000, 5_000)
+DEFAULT_HISTORY_PATH = Path("build/benchmark-history.jsonl")
+DEFAULT_TIMEOUT = 1800.0
+BENCHMARK_OWNER = "synthetic-org"
+PROFILES = {
+    "service": {"topics": ["service"], "allow-merge-commit": False},
+    "library": {"topics": ["library"], "delete-branch-on-merge": True},
+    "internal": {"extends": "service", "visibility": "private"},
+}
+# Metrics compared between runs: whether a higher value is better, and the
+# value below which changes are noise on a shared runner
+TRACKED_METRICS = {
+    "config_seconds": (False, 1.0),
+    "construct_seconds": (False, 1.0),
+    "settle_seconds": (False, 1.0),
+    "resources_per_second": (True, 0.0),
+    "peak_rss_mb": (False, 100.0),
+}
+# Previous runs of a size whose median is the baseline
+BASELINE_RUNS = 5
+# What the mocks answer the program's Bitwarden lookup with
+MOCK_VAULT_ITEM = {"username": BENCHMARK_OWNER, "password": "benchmark"}
+
+
+def synthetic_values(size: int, seed: int = 0) -> dict[str, Any]:
+    """A values file with `size` members and `size` repositories."""
+    org = generate_org(BENCHMARK_OWNER, repos=size, members=size, seed=seed)
+    # The adoption plan turns org state into values file entries
+    plan = build_import_plan(org.to_state(), PlatformConfig(), BENCHMARK_OWNER, True)
+    profiles = list(PROFILES)
+    for index, entry in enumerate(plan.repositories):
+        entry[PROFILE_KEY] = profiles[index % len(profiles)]
+        # Visibility comes from the profiles instead
+        entry.pop("visibility", None)
+    return {
+        PROFILES_SECTION: PROFILES,
+        MEMBERS_SECTION: plan.members,
+        REPOSITORIES_SECTION: plan.repositories,
+    }
+
+
+def _set_mocks(mocks: Any, stack: str, preview: bool | None = None) -> None:
+    """Run the program against `mocks`, Bitwarden invokes included.
+
+    The mock monitor answers RegisterPackage, but the SDK only registers
+    a parameterized provider such as Bitwarden, and so can only invoke
+    it, when the monitor claims parameterization support. The override
+    is never undone, so call this only in the child interpreter.
+    """
+    import pulumi
+    from pulumi.runtime import settings
+
+    pulumi.runtime.set_mocks(mocks, project=PROJECT_NAME, stack=stack, preview=preview)
+    settings._sync_monitor_supports_parameterization = lambda: True
+
+
+def measure(config_path: Path) -> dict[str, Any]:
+    """Run the program once under mocks; call in a fresh interpreter."""
+    started = time.perf_counter()
+    import pulumi
+    import pulumi_github  # noqa: F401
+    from pulumi.runtime import mocks
+
+    from modules import config_snapshot, program
+
+    imported = time.perf_counter()
+    registered = 0
+
+    class CountingMocks(pulumi.runtime.Mocks):
+        def new_resource(
+            self, args: pulumi.runtime.MockResourceArgs
+        ) -> tuple[str, dict[str, Any]]:
+            nonlocal registered
+            registered += 1
+            return f"{args.name}-id", args.inputs
+
+        def call(
+            self, args: pulumi.runtime.MockCallArgs
+        ) -> tuple[dict[str, Any], list[tuple[str, str]]]:
+            return MOCK_VAULT_ITEM, []
+
+    _set_mocks(CountingMocks(), stack="bench", preview=False)
+    timings: dict[str, float] = {}
+
+    def run() -> None:
+        config = config_snapshot.load(config_path)
+        timings["config"] = time.perf_counter()
+        # The Bitwarden lookup is answered by the mocks, as in the tests
+        program.run(config=config)
+        timings["construct"] = time.perf_counter()
+
+    # Waits until the mocks have answered every registration
+    mocks.test(run)()
+    settled = time.perf_counter()
+    return {
+        "resources": registered,
+        "import_seconds": round(imported - started, 3),
+        "config_seconds": round(timings["config"] - imported, 3),
+        "construct_seconds": round(timings["construct"] - timings["config"], 3),
+        "settle_seconds": round(settled - timings["config"], 3),
+        "resources_per_second": round(registered / (settled - timings["config"]), 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def run_size(size: int, timeout: float = DEFAULT_TIMEOUT) -> dict[str, Any]:
+    """Generate a config of `size` and measure it in a child interpreter."""
+    with tempfile.TemporaryDirectory(prefix="benchmark-") as directory:
+        config_path = Path(directory) / "values.yaml"
+        with config_path.open("w") as f:
+            yaml.safe_dump(synthetic_values(size), f, sort_keys=False)
+        started = time.perf_counter()
+        try:
+            result = subprocess.run(  # nosec B603
+                [sys.executable, "-m", "modules.benchmark", "--measure", config_path],
+                cwd=PROJECT_ROOT,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                check=False,
+            )
+        except subprocess.TimeoutExpired:
+            return {"size": size, "status": "timeout", "timeout_seconds": timeout}
+    record: dict[str, Any] = {
+        "size": size,
+        "process_seconds": round(time.perf_counter() - started, 3),
+    }
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        return {**record, "status": "error", "error": lines[-1] if lines else ""}
+    return {**record, "status": "ok", **json.loads(result.stdout.splitlines()[-1])}
+
+
+def current_commit() -> str | None:
+    try:
+        result = subprocess.run(  # nosec B603 B607
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def read_history(path: Path) -> list[dict[str, Any]]:
+    if not path.is_file():
+        return []
+    with path.open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(path: Path, records: list[dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as f:
+        f.writelines(json.dumps(record, sort_keys=True) + "\n" for record in records)
+
+
+def compare(
+    record: dict[str, Any],
+    history: list[dict[str, Any]],
+    runs: int = BASELINE_RUNS,
+) -> dict[str, float]:
+    """Percent change of each tracked metric against its recent median.
+
+    The baseline is the median of the last `runs` successful runs of the
+    same size. Positive values are regressions, whatever the metric's
+    direction. Metrics under their noise floor on both sides are skipped.
+    """
+    previous = [
+        old
+        for old in history
+        if old.get("size") == record["size"] and old.get("status") == "ok"
+    ][-runs:]
+    if not previous or record.get("status") != "ok":
+        return {}
+    changes = {}
+    for metric, (higher_is_better, floor) in TRACKED_METRICS.items():
+        values = [old[metric] for old in previous if old.get(metric) is not None]
+        after = record.get(metric)
+        if not values or after is None:
+            continue
+        before = statistics.median(values)
+        if not before or max(before, after) < floor:
+            continue
+        change = (after - before) / before * 100
+        changes[metric] = round(-change if higher_is_better else change, 1)
+    return changes
+
+
+def render(record: dict[str, Any], changes: dict[str, float]) -> str:
+    if record["status"] != "ok":
+        detail = record.get("error") or f"after {record.get('timeout_seconds')}s"
+        return f"{record['size']:>7}  {record['status']}: {detail}"
+    trend = ", ".join(f"{metric} {change:+.1f}%" for metric, change in changes.items())
+    return (
+        f"{record['size']:>7}  {record['resources']:>7} resources  "
+        f"import {record['import_seconds']:.2f}s  "
+        f"config {record['config_seconds']:.2f}s  "
+        f"construct {record['construct_seconds']:.2f}s  "
+        f"settle {record['settle_seconds']:.2f}s  "
+        f"{record['resources_per_second']:.0f}/s  "
+        f"{record['peak_rss_mb']:.0f} MB"
+        + (f"\n         vs recent median: {trend}" if trend else "")
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the program on synthetic organizations."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY_PATH)
+    parser.add_argument(
+        "--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds per size"
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        type=float,
+        metavar="PERCENT",
+        help="Exit 1 when a metric got this much worse than its recent median",
+    )
+    parser.add_argument("--measure", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        print(json.dumps(measure(args.measure)))
+        return 0
+
+    history = read_history(args.history)
+    run_info = {
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+    }
+    records, status = [], 0
+    for size in args.sizes:
+        record = {**run_info, **run_size(size, args.timeout)}
+        changes = compare(record, history)
+        print(render(record, changes), flush=True)
+        if record["status"] == "error":
+            status = 1
+        elif args.fail_on_regression is not None and any(
+            change > args.fail_on_regression for change in changes.values()
+        ):
+            status = 1
+        records.append(record)
+    append_history(args.history, records)
+    print(f"Appended {len(records)} result(s) to {args.history}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+"""
+Long-lived Bitwarden session broker.
+
+Keeps one logged-in, unlocked `bw` session and a synced local vault alive
+between runs, and serves item lookups over a Unix socket. Scripts, the
+Pulumi program and the tests ask the broker instead of logging out,
+logging back in and unlocking on every invocation.
+
+The socket is bound before the first login and unlock, which run in the
+background and make early requests wait rather than the broker's start.
+The vault is only re-synced when the last sync is older than
+--sync-interval, and item lookups are cached until the next sync. The
+broker locks the vault and exits after --idle-timeout without requests.
+
+Usage:
+    python3 -m modules.bitwarden_broker start
+    export BW_SESSION=$(python3 -m modules.bitwarden_broker session)
+    eval "$(python3 -m modules.bitwarden_broker exports 'GitHub Secrets' \\
+        pulumi-github-token=GITHUB_TOKEN pulumi-github-owner=GITHUB_OWNER)"
+"""
+
+import argparse
+import json
+import os
+import shlex
+import socket
+import socketserver
+import subprocess  # nosec B404
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+DEFAULT_SYNC_INTERVAL = 300.0
+DEFAULT_IDLE_TIMEOUT = 8 * 3600.0
+
+
+def default_socket_path() -> Path:
+    """Socket location, overridable with BW_BROKER_SOCKET."""
+    override = os.getenv("BW_BROKER_SOCKET")
+    if override:
+        return Path(override)
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(runtime_dir) / f"platform-admin-bw-{os.getuid()}.sock"
+
+
+class BrokerError(RuntimeError):
+    """Raised when the broker or the Bitwarden CLI reports a failure."""
+
+
+class BitwardenBroker:
+    """Owns the Bitwarden CLI session and an item cache."""
+
+    def __init__(
+        self,
+        bw_command: str = "bw",
+        sync_interval: float = DEFAULT_SYNC_INTERVAL,
+    ) -> None:
+        self.bw_command = bw_command
+        self.sync_interval = sync_interval
+        self.session = os.getenv("BW_SESSION") or ""
+        self._items: dict[str, dict[str, Any]] = {}
+        self._last_sync = 0.0
+        self._unlocked = False
+        self._lock = threading.Lock()
+
+    def _bw(self, *args: str) -> str:
+        env = dict(os.environ)
+        if self.session:
+            env["BW_SESSION"] = self.session
+        result = subprocess.run(  # nosec B603
+            [self.bw_command, *args],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=False,
+        )
+        if result.returncode != 0:
+            raise BrokerError(f"bw {args[0]} failed: {result.stderr.strip()}")
+        return result.stdout.strip()
+
+    def ensure_unlocked(self) -> None:
+        """Log in and unlock only if the CLI is not already in that state."""
+        if self._unlocked:
+            return
+        status = json.loads(self._bw("status")).get("status")
+        if status == "unauthenticated":
+            self._bw("login", "--apikey")
+            status = "locked"
+        if status == "locked" or not self.session:
+            self.session = self._bw("unlock", "--passwordenv", "BW_PASSWORD", "--raw")
+            if not self.session:
+                raise BrokerError("Failed to unlock Bitwarden vault")
+        self._unlocked = True
+
+    def sync_if_stale(self, force: bool = False) -> bool:
+        """Sync the local vault when the last sync is older than the interval."""
+        now = time.time()
+        if not force and now - self._last_sync < self.sync_interval:
+            return False
+        last = self._bw("sync", "--last")
+        if last and not force:
+            synced_at = datetime.fromisoformat(last.replace("Z", "+00:00"))
+            if now - synced_at.timestamp() < self.sync_interval:
+                self._last_sync = synced_at.timestamp()
+                return False
+        self._bw("sync")
+        self._last_sync = now
+        self._items.clear()
+        return True
+
+    def warm_up(self) -> None:
+        """Unlock and sync ahead of the first request; failures are retried then."""
+        try:
+            with self._lock:
+                self.ensure_unlocked()
+                self.sync_if_stale()
+        except (OSError, BrokerError) as e:
+            print(f"bitwarden-broker: warm-up failed: {e}", file=sys.stderr)
+
+    def get_item(self, name: str) -> dict[str, Any]:
+        with self._lock:
+            self.ensure_unlocked()
+            self.sync_if_stale()
+            if name not in self._items:
+                self._items[name] = json.loads(self._bw_unlocked("get", "item", name))
+            return self._items[name]
+
+    def _bw_unlocked(self, *args: str) -> str:
+        try:
+            return self._bw(*args)
+        except BrokerError:
+            # The vault may have been locked behind our back; unlock and retry once
+            self._unlocked = False
+            self.ensure_unlocked()
+            return self._bw(*args)
+
+    def get_session(self) -> str:
+        with self._lock:
+            self.ensure_unlocked()
+            self.sync_if_stale()
+            return self.session
+
+    def sync(self) -> None:
+        with self._lock:
+            self.ensure_unlocked()
+            self.sync_if_stale(force=True)
+
+    def lock(self) -> None:
+        with self._lock:
+            if self.session:
+                self._bw("lock")
+                self.session = ""
+            self._unlocked = False
+            self._items.clear()
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Answer one protocol request."""
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True}
+        if op == "get_item":
+            return {"ok": True, "item": self.get_item(str(request["name"]))}
+        if op == "session":
+            return {"ok": True, "session": self.get_session()}
+        if op == "sync":
+            self.sync()
+            return {"ok": True}
+        raise BrokerError(f"Unknown operation: {op}")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "BrokerServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            self.server.last_request = time.time()
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise BrokerError("Request must be a JSON object")
+                if request.get("op") == "shutdown":
+                    response: dict[str, Any] = {"ok": True}
+                    threading.Thread(target=self.server.shutdown).start()
+                else:
+                    response = self.server.broker.handle(request)
+            except (BrokerError, KeyError, ValueError) as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class BrokerServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server exposing a BitwardenBroker."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, broker: BitwardenBroker) -> None:
+        self.broker = broker
+        self.last_request = time.time()
+        if path.exists():
+            path.unlink()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # The socket hands out vault secrets, so only the owner may connect
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(str(path), _Handler)
+        finally:
+            os.umask(old_umask)
+
+
+def serve(
+    path: Path,
+    broker: BitwardenBroker,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+) -> None:
+    """Serve until shut down or idle, then lock the vault."""
+    server = BrokerServer(path, broker)
+    # Login, unlock and sync can take a while; clients can already connect
+    warm_up = threading.Thread(target=broker.warm_up, daemon=True)
+    warm_up.start()
+
+    def watch_idle() -> None:
+        while time.time() - server.last_request < idle_timeout:
+            time.sleep(min(idle_timeout, 30.0))
+        server.shutdown()
+
+    threading.Thread(target=watch_idle, daemon=True).start()
+    try:
+        server.serve_forever(poll_interval=0.1)
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+        warm_up.join()
+        broker.lock()
+
+
+def request(op: str, path: Path | None = None, **params: Any) -> dict[str, Any]:
+    """Send one request to a running broker."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path or default_socket_path()))
+        sock.sendall(json.dumps({"op": op, **params}).encode() + b"\n")
+        with sock.makefile("rb") as reader:
+            response: dict[str, Any] = json.loads(reader.readline())
+    if not response.get("ok"):
+        raise BrokerError(response.get("error", "broker request failed"))
+    return response
+
+
+def is_running(path: Path | None = None) -> bool:
+    try:
+        request("ping", path)
+    except (OSError, BrokerError):
+        return False
+    return True
+
+
+def ensure_running(path: Path | None = None, timeout: float = 10.0) -> None:
+    """Start a detached broker if one is not already listening."""
+    path = path or default_socket_path()
+    if is_running(path):
+        return
+    log_path = path.with_suffix(".log")
+    with open(log_path, "ab") as log:
+        child = subprocess.Popen(  # nosec B603
+            [sys.executable, "-m", "modules.bitwarden_broker", "serve"],
+            env={**os.environ, "BW_BROKER_SOCKET": str(path)},
+            stdout=log,
+            stderr=log,
+            stdin=subprocess.DEVNULL,
+            cwd=Path(__file__).resolve().parent.parent,
+            start_new_session=True,
+        )
+    # The broker binds its socket before unlocking, so this only covers startup
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if is_running(path):
+            return
+        if child.poll() is not None:
+            raise BrokerError(
+                f"Broker exited with status {child.returncode}, see {log_path}"
+            )
+        time.sleep(0.1)
+    # Do not leave a broker behind that the caller has given up on
+    child.terminate()
+    raise BrokerError(f"Broker did not start, see {log_path}")
+
+
+def get_item(name: str, path: Path | None = None) -> dict[str, Any]:
+    """Fetch a vault item through the broker."""
+    item: dict[str, Any] = request("get_item", path, name=name)["item"]
+    return item
+
+
+def item_field(item: dict[str, Any], name: str) -> str:
+    """Return the value of a custom field on a vault item."""
+    for field in item.get("fields") or []:
+        if field.get("name") == name:
+            return str(field.get("value") or "")
+    raise BrokerError(f"Field '{name}' not found on item '{item.get('name')}'")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Bitwarden session broker.")
+    parser.add_argument("--socket", type=Path, default=None)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the broker in foreground")
+    serve_parser.add_argument("--bw", default="bw")
+    serve_parser.add_argument(
+        "--sync-interval", type=float, default=DEFAULT_SYNC_INTERVAL
+    )
+    serve_parser.add_argument(
+        "--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT
+    )
+    commands.add_parser("start", help="Start a background broker if needed")
+    commands.add_parser("stop", help="Stop the broker and lock the vault")
+    commands.add_parser("sync", help="Force a vault sync")
+    commands.add_parser("session", help="Print the BW_SESSION key")
+    get_parser = commands.add_parser("get", help="Print a vault item or field")
+    get_parser.add_argument("item")
+    get_parser.add_argument("--field")
+    exports_parser = commands.add_parser(
+        "exports", help="Print shell exports for item fields"
+    )
+    exports_parser.add_argument("item")
+    exports_parser.add_argument("mappings", nargs="+", metavar="FIELD=VAR")
+
+    args = parser.parse_args(argv)
+    path = args.socket or default_socket_path()
+
+    try:
+        if args.command == "serve":
+            broker = BitwardenBroker(args.bw, args.sync_interval)
+            serve(path, broker, args.idle_timeout)
+        elif args.command == "start":
+            ensure_running(path)
+        elif args.command == "stop":
+            if is_running(path):
+                request("shutdown", path)
+        elif args.command == "sync":
+            request("sync", path)
+        elif args.command == "session":
+            print(request("session", path)["session"])
+        elif args.command == "get":
+            item = get_item(args.item, path)
+            print(item_field(item, args.field) if args.field else json.dumps(item))
+        elif args.command == "exports":
+            item = get_item(args.item, path)
+            for mapping in args.mappings:
+                field, _, variable = mapping.partition("=")
+                value = shlex.quote(item_field(item, field))
+                print(f"export {variable or field}={value}")
+    except (OSError, BrokerError) as e:
+        print(f"bitwarden-broker: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
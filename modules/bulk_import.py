@@ -0,0 +1,234 @@
+"""
+Adopt an existing GitHub organization into config and stack state.
+
+Lists members, repositories and branch protection in bulk, appends config
+entries for everything the values file does not manage yet, and writes a
+single Pulumi bulk-import file so one `pulumi import --file` adopts all of
+it instead of one import per resource.
+
+Usage:
+    python -m modules.bulk_import --owner my-org --import-file import.json
+    python -m modules.bulk_import --owner my-org --update-config --run --stack dev
+"""
+
+import argparse
+import json
+import os
+import subprocess  # nosec B404
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from modules import config_snapshot
+from modules.config import DEFAULT_CONFIG_PATH
+from modules.config_model import MEMBERS_SECTION, REPOSITORIES_SECTION, PlatformConfig
+from modules.deploy_plan import PROJECT_ROOT
+from modules.github_client import GitHubClient
+from modules.member_sources import iter_members
+from modules.org_state import OrgState, fetch_org_state, state_key
+from modules.resource_names import (
+    BRANCH_PROTECTION_TYPE,
+    MEMBERSHIP_TYPE,
+    PROTECTED_BRANCH,
+    REPOSITORY_TYPE,
+    branch_protection_resource_name,
+    membership_resource_name,
+    repository_resource_name,
+)
+
+
+@dataclass
+class ImportPlan:
+    """Config entries and import records for unmanaged org entities."""
+
+    members: list[dict[str, Any]] = field(default_factory=list)
+    repositories: list[dict[str, Any]] = field(default_factory=list)
+    resources: list[dict[str, str]] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+
+    def import_file(self) -> dict[str, Any]:
+        """Contents of a `pulumi import --file` document."""
+        return {"resources": self.resources}
+
+
+def build_import_plan(
+    state: OrgState,
+    existing: PlatformConfig,
+    owner: str,
+    include_private: bool = False,
+) -> ImportPlan:
+    """Plan config entries and imports for entities the config does not manage."""
+    # Members from rosters are managed too, even though the values file
+    # does not list them
+    managed_members = {state_key(member.username) for member in iter_members(existing)}
+    managed_repos = {state_key(repo.name) for repo in existing.repositories}
+    plan = ImportPlan()
+
+    for key in sorted(state.members.keys() - managed_members):
+        member = state.members[key]
+        # The login doubles as the display name; edit it after adoption
+        plan.members.append(
+            {
+                "name": member.username,
+                "github-role": member.role,
+                "github-username": member.username,
+            }
+        )
+        plan.resources.append(
+            {
+                "type": MEMBERSHIP_TYPE,
+                "name": membership_resource_name(member.username),
+                "id": f"{owner}:{member.username}",
+            }
+        )
+
+    for key in sorted(state.repositories.keys() - managed_repos):
+        repo = state.repositories[key]
+        # The program does not manage archiving, and private repositories are
+        # only adopted on request
+        if repo.archived or (repo.visibility != "public" and not include_private):
+            plan.skipped.append(repo.name)
+            continue
+        entry: dict[str, Any] = {"name": repo.name}
+        if repo.description:
+            entry["description"] = repo.description
+        if repo.visibility != "public":
+            # Keep the visibility instead of the public default
+            entry["visibility"] = repo.visibility
+        plan.repositories.append(entry)
+        plan.resources.append(
+            {
+                "type": REPOSITORY_TYPE,
+                "name": repository_resource_name(repo.name),
+                "id": repo.name,
+            }
+        )
+        if repo.protection and repo.protection.pattern == PROTECTED_BRANCH:
+            plan.resources.append(
+                {
+                    "type": BRANCH_PROTECTION_TYPE,
+                    "name": branch_protection_resource_name(repo.name),
+                    "id": f"{repo.name}:{PROTECTED_BRANCH}",
+                }
+            )
+    return plan
+
+
+def append_entries(path: Path, section: str, entries: list[dict[str, Any]]) -> None:
+    """Append list entries to a top-level section, keeping existing comments."""
+    if not entries:
+        return
+    rendered = yaml.safe_dump(entries, sort_keys=False, allow_unicode=True)
+    block = "".join(f"  {line}\n" for line in rendered.splitlines())
+    lines = path.read_text().splitlines(keepends=True)
+
+    start = next(
+        (i for i, line in enumerate(lines) if line.startswith(f"{section}:")), None
+    )
+    if start is None:
+        if lines and not lines[-1].endswith("\n"):
+            lines[-1] += "\n"
+        lines += [f"\n{section}:\n", block]
+    else:
+        # The section ends at the next top-level key; skip its trailing blanks
+        end = next(
+            (
+                i
+                for i in range(start + 1, len(lines))
+                if lines[i].strip()
+                and not lines[i][0].isspace()
+                and not lines[i].startswith("#")
+            ),
+            len(lines),
+        )
+        while end > start + 1 and not lines[end - 1].strip():
+            end -= 1
+        if lines[start].rstrip().endswith("[]"):
+            lines[start] = f"{section}:\n"
+        if end > 0 and not lines[end - 1].endswith("\n"):
+            lines[end - 1] += "\n"
+        lines.insert(end, block)
+    path.write_text("".join(lines))
+
+
+def run_import(import_file: Path, stack: str) -> int:
+    """Adopt every resource in the import file with one engine run."""
+    command = [
+        "pulumi",
+        "import",
+        "--file",
+        str(import_file),
+        "--stack",
+        stack,
+        "--yes",
+        # The program declares neither protection nor generated code
+        "--protect=false",
+        "--generate-code=false",
+    ]
+    result = subprocess.run(command, cwd=PROJECT_ROOT, check=False)  # nosec B603
+    return result.returncode
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Adopt existing GitHub members and repositories."
+    )
+    parser.add_argument("--owner", default=os.getenv("GITHUB_OWNER"))
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG_PATH))
+    parser.add_argument("--import-file", default="bulk-import.json")
+    parser.add_argument("--stack", default="dev")
+    parser.add_argument(
+        "--include-private",
+        action="store_true",
+        help="Adopt private repositories too, keeping their visibility",
+    )
+    parser.add_argument(
+        "--update-config",
+        action="store_true",
+        help="Append the new entries to the values file",
+    )
+    parser.add_argument(
+        "--run", action="store_true", help="Run pulumi import with the generated file"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.owner:
+        parser.error("--owner or GITHUB_OWNER is required")
+    if args.run and not args.update_config:
+        # Imported resources missing from the config would be deleted next update
+        parser.error("--run requires --update-config")
+
+    state = fetch_org_state(GitHubClient.from_env(), args.owner)
+    plan = build_import_plan(
+        state, config_snapshot.load(args.config), args.owner, args.include_private
+    )
+
+    with open(args.import_file, "w") as f:
+        json.dump(plan.import_file(), f, indent=2)
+        f.write("\n")
+    print(
+        f"Planned {len(plan.resources)} imports: {len(plan.members)} members, "
+        f"{len(plan.repositories)} repositories -> {args.import_file}"
+    )
+    if plan.skipped:
+        print(
+            f"Skipped {len(plan.skipped)} private or archived repositories: "
+            f"{', '.join(plan.skipped)}"
+        )
+
+    if args.update_config:
+        config_path = Path(args.config)
+        append_entries(config_path, MEMBERS_SECTION, plan.members)
+        append_entries(config_path, REPOSITORIES_SECTION, plan.repositories)
+        print(f"Appended new entries to {config_path}")
+
+    if args.run and plan.resources:
+        return run_import(Path(args.import_file).resolve(), args.stack)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Record/replay transport for the GitHub client.
+
+Record mode wraps a live transport and captures normalized request and
+response pairs into a cassette file. Replay mode serves responses straight
+from the cassette without touching the network.
+
+Cassette layout (little-endian):
+
+    MAGIC
+    entry blobs      zlib(status/headers JSON + "\\n" + body), one per request
+    metadata         JSON object (owner, recorded_at, ...)
+    index            sorted fixed-width rows of (key digest, offset, length)
+    footer           metadata offset/length, index offset/count, MAGIC
+
+The index is binary-searched in place through a memory map, so opening a
+cassette costs the same regardless of how many requests it holds.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import urllib.parse
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from modules.github_client import Request, Response, Transport, urllib_transport
+
+MAGIC = b"GHCASS1\0"
+_INDEX_ROW = struct.Struct("<16sQI")
+_FOOTER = struct.Struct("<QIQI8s")
+# Only headers that change how the client behaves are kept
+_KEPT_HEADERS = ("content-type", "link")
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+def request_key(request: Request) -> str:
+    """Normalize a request into a host- and credential-independent key."""
+    parsed = urllib.parse.urlsplit(request.url)
+    path = parsed.path.removeprefix("/api/v3")
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parsed.query)))
+    key = f"{request.method} {path}?{query}"
+    if request.body:
+        key += f" {hashlib.sha256(request.body).hexdigest()}"
+    return key
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+
+class CassetteRecorder:
+    """Transport that forwards to a live transport and records every exchange."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        inner: Transport = urllib_transport,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.inner = inner
+        self.metadata = dict(metadata or {})
+        self._entries: dict[bytes, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(MAGIC)
+
+    def __call__(self, request: Request) -> Response:
+        response = self.inner(request)
+        head = {
+            "status": response.status,
+            "headers": {
+                name: response.headers[name]
+                for name in _KEPT_HEADERS
+                if name in response.headers
+            },
+        }
+        blob = zlib.compress(json.dumps(head).encode() + b"\n" + response.body)
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(blob)
+            self._entries[_digest(request_key(request))] = (offset, len(blob))
+        return response
+
+    def close(self) -> None:
+        """Write the metadata and index, then atomically publish the cassette."""
+        with self._lock:
+            meta = json.dumps(
+                {"recorded_at": int(time.time()), **self.metadata}
+            ).encode()
+            meta_offset = self._file.tell()
+            self._file.write(meta)
+            index_offset = self._file.tell()
+            for digest, (offset, length) in sorted(self._entries.items()):
+                self._file.write(_INDEX_ROW.pack(digest, offset, length))
+            self._file.write(
+                _FOOTER.pack(
+                    meta_offset, len(meta), index_offset, len(self._entries), MAGIC
+                )
+            )
+            self._file.close()
+            os.replace(self._tmp_path, self.path)
+
+    def __enter__(self) -> "CassetteRecorder":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class CassettePlayer:
+    """Transport that answers requests from a recorded cassette."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        footer = self._map[-_FOOTER.size :]
+        meta_offset, meta_len, index_offset, count, magic = _FOOTER.unpack(footer)
+        self._index_offset: int = index_offset
+        self._count: int = count
+        if magic != MAGIC or self._map[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a GitHub cassette")
+        self.metadata: dict[str, Any] = json.loads(
+            self._map[meta_offset : meta_offset + meta_len]
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _find(self, digest: bytes) -> tuple[int, int] | None:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            row_digest, offset, length = _INDEX_ROW.unpack_from(
+                self._map, self._index_offset + mid * _INDEX_ROW.size
+            )
+            if row_digest == digest:
+                return offset, length
+            if row_digest < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def __call__(self, request: Request) -> Response:
+        key = request_key(request)
+        found = self._find(_digest(key))
+        if found is None:
+            raise CassetteMissError(f"No recorded response for {key} in {self.path}")
+        offset, length = found
+        raw = zlib.decompress(self._map[offset : offset + length])
+        head, _, body = raw.partition(b"\n")
+        meta = json.loads(head)
+        return Response(status=meta["status"], headers=meta["headers"], body=body)
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def transport_from_env(
+    metadata: Mapping[str, Any] | None = None,
+) -> CassetteRecorder | CassettePlayer | None:
+    """Build a cassette transport from GITHUB_CASSETTE and GITHUB_CASSETTE_MODE.
+
+    Returns None when no cassette is configured, meaning requests go to the
+    live API as usual.
+    """
+    path = os.getenv("GITHUB_CASSETTE")
+    if not path:
+        return None
+    mode = os.getenv("GITHUB_CASSETTE_MODE", REPLAY)
+    if mode == RECORD:
+        return CassetteRecorder(path, metadata=metadata)
+    if mode == REPLAY:
+        return CassettePlayer(path)
+    raise ValueError(f"GITHUB_CASSETTE_MODE must be '{RECORD}' or '{REPLAY}'")
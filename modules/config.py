@@ -0,0 +1,15 @@
+"""Loading of the platform team values file."""
+
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+DEFAULT_CONFIG_PATH = Path("config/platform_team_values.yaml")
+
+
+def load_values(path: str | Path = DEFAULT_CONFIG_PATH) -> dict[str, Any]:
+    """Load the platform team values file, returning an empty mapping if blank."""
+    with open(path) as f:
+        data = yaml.safe_load(f)
+    return data or {}
@@ -0,0 +1,450 @@
+"""
+Typed model of the platform team values file.
+
+The values file is validated against a schema that is compiled once into
+per-section lookup tables (allowed keys, required keys, field types,
+choices and unique keys). One pass over the document checks every entry
+and builds slotted records for the valid ones. Every problem is reported
+with its location, e.g. `github_organization_members[3].github-role`,
+instead of stopping at the first. Repository settings are resolved
+through the profiles in modules.repository_profiles.
+
+Usage:
+    python -m modules.config_model
+    python -m modules.config_model config/platform_team_values.yaml
+"""
+
+import argparse
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from modules.config import DEFAULT_CONFIG_PATH, load_values
+from modules.org_state import state_key
+from modules.repository_profiles import (
+    DEFAULT_SETTINGS,
+    EXTENDS_KEY,
+    PROFILE_KEY,
+    PROFILES_SECTION,
+    SETTING_TYPES,
+    VISIBILITIES,
+    ProfileError,
+    ProfileResolver,
+    RepositorySettings,
+)
+
+MEMBERS_SECTION = "github_organization_members"
+REPOSITORIES_SECTION = "github_repositories"
+MEMBER_SOURCES_SECTION = "github_member_sources"
+SOURCE_FORMATS = ("csv", "jsonl")
+ROLES = ("member", "admin")
+DEFAULT_ROLE = "member"
+
+
+@dataclass(frozen=True, slots=True)
+class Member:
+    """An organization member from the values file."""
+
+    name: str
+    username: str
+    role: str = DEFAULT_ROLE
+    email: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Repository:
+    """A managed repository from the values file."""
+
+    name: str
+    description: str = ""
+    settings: RepositorySettings = DEFAULT_SETTINGS
+
+
+@dataclass(frozen=True, slots=True)
+class MemberSource:
+    """An external member roster, read by modules.member_sources."""
+
+    path: str
+    format: str | None = None
+    # Member keys (`name`, `github-username`, ...) to source columns
+    columns: tuple[tuple[str, str], ...] = ()
+    # Columns and the value a row must have to be included
+    where: tuple[tuple[str, str], ...] = ()
+    default_role: str = DEFAULT_ROLE
+
+
+@dataclass(frozen=True, slots=True)
+class PlatformConfig:
+    """The validated values file."""
+
+    members: tuple[Member, ...] = ()
+    repositories: tuple[Repository, ...] = ()
+    member_sources: tuple[MemberSource, ...] = ()
+
+
+class ConfigIssue(NamedTuple):
+    """One validation problem and where it is."""
+
+    location: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.location}: {self.message}"
+
+
+class ConfigError(ValueError):
+    """Raised when the values file does not match the schema."""
+
+    def __init__(self, issues: list[ConfigIssue], source: str = "values file"):
+        self.issues = issues
+        lines = [f"{len(issues)} problem(s) in {source}:"]
+        lines += [f"  {issue}" for issue in issues]
+        super().__init__("\n".join(lines))
+
+
+@dataclass(frozen=True)
+class Field:
+    """Schema for one key of a section entry."""
+
+    key: str
+    required: bool = False
+    choices: tuple[str, ...] = ()
+    unique: bool = False
+    kind: type | tuple[type, ...] = str
+    # Element type for list items or mapping values
+    items: type | None = None
+
+
+@dataclass(frozen=True)
+class Section:
+    """Schema for a top-level section of entries."""
+
+    name: str
+    fields: tuple[Field, ...]
+    build: Callable[[dict[str, Any], ProfileResolver], Any] = lambda entry, _: entry
+
+
+def _build_repository(entry: dict[str, Any], resolver: ProfileResolver) -> Repository:
+    selected = entry.get(PROFILE_KEY) or ()
+    overrides = {key: value for key, value in entry.items() if key in SETTING_TYPES}
+    settings = resolver.resolve(
+        (selected,) if isinstance(selected, str) else tuple(selected), overrides
+    )
+    return Repository(entry["name"], entry.get("description", ""), settings)
+
+
+_SETTING_FIELDS = tuple(
+    Field(
+        key,
+        kind=value_type,
+        choices=VISIBILITIES if key == "visibility" else (),
+        items=str if value_type is list else None,
+    )
+    for key, value_type in SETTING_TYPES.items()
+)
+
+SCHEMA = (
+    Section(
+        MEMBERS_SECTION,
+        (
+            Field("name", required=True, unique=True),
+            Field("github-username", required=True, unique=True),
+            Field("github-role", choices=ROLES),
+            Field("email"),
+        ),
+        lambda entry, _: Member(
+            entry["name"],
+            entry["github-username"],
+            entry.get("github-role", DEFAULT_ROLE),
+            entry.get("email"),
+        ),
+    ),
+    Section(
+        REPOSITORIES_SECTION,
+        (
+            Field("name", required=True, unique=True),
+            Field("description"),
+            Field(PROFILE_KEY, kind=(str, list), items=str),
+            *_SETTING_FIELDS,
+        ),
+        _build_repository,
+    ),
+    Section(
+        MEMBER_SOURCES_SECTION,
+        (
+            Field("path", required=True, unique=True),
+            Field("format", choices=SOURCE_FORMATS),
+            Field("columns", kind=dict, items=str),
+            Field("where", kind=dict, items=str),
+            Field("default-role", choices=ROLES),
+        ),
+        lambda entry, _: MemberSource(
+            entry["path"],
+            entry.get("format"),
+            tuple(entry.get("columns", {}).items()),
+            tuple(entry.get("where", {}).items()),
+            entry.get("default-role", DEFAULT_ROLE),
+        ),
+    ),
+)
+
+# Entries of the profiles mapping, keyed by profile name
+PROFILE_SCHEMA = Section(PROFILES_SECTION, (Field(EXTENDS_KEY), *_SETTING_FIELDS))
+
+
+class _CompiledSection(NamedTuple):
+    name: str
+    allowed: frozenset[str]
+    required: frozenset[str]
+    # Keys that accept string values, which the fast path can check
+    strings: frozenset[str]
+    types: dict[str, type | tuple[type, ...]]
+    items: tuple[tuple[str, type], ...]
+    choices: tuple[tuple[str, frozenset[str]], ...]
+    unique: tuple[str, ...]
+    build: Callable[[dict[str, Any], ProfileResolver], Any]
+
+
+def _accepts_string(kind: type | tuple[type, ...]) -> bool:
+    return str in kind if isinstance(kind, tuple) else kind is str
+
+
+def _compile(section: Section) -> _CompiledSection:
+    fields = section.fields
+    return _CompiledSection(
+        section.name,
+        frozenset(f.key for f in fields),
+        frozenset(f.key for f in fields if f.required),
+        frozenset(f.key for f in fields if _accepts_string(f.kind)),
+        {f.key: f.kind for f in fields},
+        tuple((f.key, f.items) for f in fields if f.items),
+        tuple((f.key, frozenset(f.choices)) for f in fields if f.choices),
+        tuple(f.key for f in fields if f.unique),
+        section.build,
+    )
+
+
+class Validator:
+    """A schema compiled into lookup tables for one-pass validation."""
+
+    def __init__(
+        self,
+        schema: tuple[Section, ...] = SCHEMA,
+        profile_schema: Section = PROFILE_SCHEMA,
+    ) -> None:
+        self._sections = tuple(_compile(section) for section in schema)
+        self._profiles = _compile(profile_schema)
+        self._top_level = frozenset(
+            [self._profiles.name, *(section.name for section in schema)]
+        )
+
+    def __call__(self, data: Any, source: str = "values file") -> PlatformConfig:
+        issues: list[ConfigIssue] = []
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            raise ConfigError([ConfigIssue("<root>", "expected a mapping")], source)
+        for key in sorted(map(str, data.keys() - self._top_level)):
+            issues.append(ConfigIssue(str(key), "unknown top-level key"))
+
+        resolver = self._check_profiles(data.get(self._profiles.name), issues)
+        records: dict[str, tuple[Any, ...]] = {}
+        for section in self._sections:
+            records[section.name] = self._check_section(
+                section, data.get(section.name), resolver, issues
+            )
+        if issues:
+            raise ConfigError(issues, source)
+        return PlatformConfig(
+            members=records[MEMBERS_SECTION],
+            repositories=records[REPOSITORIES_SECTION],
+            member_sources=records[MEMBER_SOURCES_SECTION],
+        )
+
+    def _check_profiles(
+        self, profiles: Any, issues: list[ConfigIssue]
+    ) -> ProfileResolver:
+        section = self._profiles
+        if profiles is None:
+            return ProfileResolver()
+        if not isinstance(profiles, dict):
+            issues.append(ConfigIssue(section.name, "expected a mapping"))
+            return ProfileResolver()
+
+        valid = {}
+        for name, profile in profiles.items():
+            location = f"{section.name}.{name}"
+            if not isinstance(profile, dict):
+                issues.append(ConfigIssue(location, "expected a mapping"))
+                continue
+            count = len(issues)
+            _describe(section, profile, location, issues)
+            if len(issues) == count:
+                valid[str(name)] = profile
+        resolver = ProfileResolver(valid)
+        for name in valid:
+            try:
+                resolver.flatten(name)
+            except ProfileError as error:
+                issues.append(
+                    ConfigIssue(f"{section.name}.{name}.{EXTENDS_KEY}", str(error))
+                )
+        return resolver
+
+    @staticmethod
+    def _check_section(
+        section: _CompiledSection,
+        entries: Any,
+        resolver: ProfileResolver,
+        issues: list[ConfigIssue],
+    ) -> tuple[Any, ...]:
+        if entries is None:
+            return ()
+        if not isinstance(entries, list):
+            issues.append(ConfigIssue(section.name, "expected a list"))
+            return ()
+
+        seen: dict[str, dict[str, int]] = {key: {} for key in section.unique}
+        built = []
+        for index, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                issues.append(
+                    ConfigIssue(f"{section.name}[{index}]", "expected a mapping")
+                )
+                continue
+            # Set and type checks first; messages are only built for bad entries
+            keys = entry.keys()
+            valid = (
+                keys <= section.strings
+                and section.required <= keys
+                and all(isinstance(value, str) for value in entry.values())
+                and not any(
+                    key in entry and entry[key] not in choices
+                    for key, choices in section.choices
+                )
+            )
+            if not valid:
+                count = len(issues)
+                _describe(section, entry, f"{section.name}[{index}]", issues)
+                valid = len(issues) == count
+            for key in section.unique:
+                value = entry.get(key)
+                if not isinstance(value, str):
+                    continue
+                # GitHub names are case-insensitive
+                first = seen[key].setdefault(state_key(value), index)
+                if first != index:
+                    valid = False
+                    issues.append(
+                        ConfigIssue(
+                            f"{section.name}[{index}].{key}",
+                            f"'{value}' duplicates {section.name}[{first}]",
+                        )
+                    )
+            if not valid:
+                continue
+            try:
+                built.append(section.build(entry, resolver))
+            except ProfileError as error:
+                issues.append(
+                    ConfigIssue(f"{section.name}[{index}].{PROFILE_KEY}", str(error))
+                )
+        return tuple(built)
+
+
+def _describe(
+    section: _CompiledSection,
+    entry: dict[str, Any],
+    location: str,
+    issues: list[ConfigIssue],
+) -> None:
+    """Report everything wrong with one entry of a section."""
+    for key in sorted(map(str, entry.keys() - section.allowed)):
+        issues.append(ConfigIssue(f"{location}.{key}", "unknown key"))
+    for key in section.required:
+        if key not in entry:
+            issues.append(ConfigIssue(f"{location}.{key}", "is required"))
+    for key, value in entry.items():
+        expected = section.types.get(key)
+        if expected is not None and not isinstance(value, expected):
+            names = expected if isinstance(expected, tuple) else (expected,)
+            wanted = " or ".join(_TYPE_NAMES[t] for t in names)
+            issues.append(
+                ConfigIssue(
+                    f"{location}.{key}",
+                    f"expected {wanted}, got {type(value).__name__}",
+                )
+            )
+    for key, item_type in section.items:
+        value = entry.get(key)
+        if isinstance(value, list) and not all(
+            isinstance(item, item_type) for item in value
+        ):
+            issues.append(
+                ConfigIssue(
+                    f"{location}.{key}",
+                    f"expected a list of {_ITEM_NAMES[item_type]}",
+                )
+            )
+        elif isinstance(value, dict) and not all(
+            isinstance(item, item_type) for item in value.values()
+        ):
+            issues.append(
+                ConfigIssue(
+                    f"{location}.{key}",
+                    f"expected a mapping of {_ITEM_NAMES[item_type]}",
+                )
+            )
+    for key, choices in section.choices:
+        value = entry.get(key)
+        if isinstance(value, str) and value not in choices:
+            issues.append(
+                ConfigIssue(
+                    f"{location}.{key}",
+                    f"'{value}' is not one of {', '.join(sorted(choices))}",
+                )
+            )
+
+
+_TYPE_NAMES: dict[type, str] = {
+    str: "a string",
+    bool: "a boolean",
+    list: "a list",
+    dict: "a mapping",
+}
+_ITEM_NAMES: dict[type, str] = {str: "strings"}
+
+
+VALIDATOR = Validator()
+
+
+def validate(data: Any, source: str = "values file") -> PlatformConfig:
+    """Validate a parsed values file and return its typed model."""
+    return VALIDATOR(data, source)
+
+
+def load_config(path: str | Path = DEFAULT_CONFIG_PATH) -> PlatformConfig:
+    """Load and validate the values file."""
+    return validate(load_values(path), str(path))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate the values file.")
+    parser.add_argument("path", nargs="?", default=str(DEFAULT_CONFIG_PATH))
+    args = parser.parse_args(argv)
+    try:
+        config = load_config(args.path)
+    except ConfigError as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(
+        f"{args.path}: {len(config.members)} members, "
+        f"{len(config.repositories)} repositories"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
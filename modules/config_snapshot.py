@@ -0,0 +1,199 @@
+"""
+Compiled snapshot of the validated values file.
+
+Parsing the YAML values file and validating it is most of the program's
+start-up time, and every CI job and tool repeats it. `compile-config`
+does it once and writes the normalized result to a snapshot file:
+
+    header   magic, format version, source digest, payload length
+    payload  compact JSON of the typed records
+
+The source digest covers the values file and the modules that define the
+model, so editing either makes the snapshot stale. `load` memory-maps the
+snapshot, checks the digest against the current sources and decodes the
+payload. It falls back to parsing and validating the values file when the
+snapshot is missing, stale or unreadable, so a stale snapshot is never
+used. Repository settings are stored once per distinct value and shared
+again when decoded.
+
+The payload is JSON rather than msgpack or pickle so the snapshot needs
+no new dependency and decoding never runs code.
+
+Usage:
+    python -m modules.config_snapshot
+    python -m modules.config_snapshot --check
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from dataclasses import astuple
+from pathlib import Path
+
+from modules.config import DEFAULT_CONFIG_PATH, load_values
+from modules.config_model import (
+    ConfigError,
+    Member,
+    MemberSource,
+    PlatformConfig,
+    Repository,
+    validate,
+)
+from modules.repository_profiles import RepositorySettings
+
+DEFAULT_SNAPSHOT_PATH = Path("build/config.snapshot")
+MAGIC = b"PTCS"
+FORMAT_VERSION = 1
+# Magic, format version, sha256 of the sources, payload length
+HEADER = struct.Struct(">4sH32sQ")
+# Modules whose code decides what a values file compiles to
+MODEL_MODULES = (
+    "config_model.py",
+    "repository_profiles.py",
+    "config_snapshot.py",
+)
+_MODULES_DIR = Path(__file__).resolve().parent
+
+
+def source_digest(config_path: str | Path = DEFAULT_CONFIG_PATH) -> bytes:
+    """Hash the values file and the model code it is compiled with."""
+    digest = hashlib.sha256()
+    paths = [Path(config_path), *(_MODULES_DIR / name for name in MODEL_MODULES)]
+    for path in paths:
+        # Length-prefixed so moving bytes between files changes the hash
+        content = path.read_bytes()
+        digest.update(len(content).to_bytes(8, "big") + content)
+    return digest.digest()
+
+
+def encode(config: PlatformConfig) -> bytes:
+    """Serialize the records; settings objects are stored once each."""
+    settings: dict[RepositorySettings, int] = {}
+    repositories = [
+        [repo.name, repo.description, settings.setdefault(repo.settings, len(settings))]
+        for repo in config.repositories
+    ]
+    document = {
+        "members": [astuple(member) for member in config.members],
+        "settings": [astuple(value) for value in settings],
+        "repositories": repositories,
+        "member_sources": [astuple(source) for source in config.member_sources],
+    }
+    return json.dumps(document, separators=(",", ":")).encode()
+
+
+def _pairs(items: list[list[str]]) -> tuple[tuple[str, str], ...]:
+    return tuple((key, value) for key, value in items)
+
+
+def decode(payload: bytes) -> PlatformConfig:
+    """Rebuild the typed records from an encoded payload."""
+    document = json.loads(payload)
+    settings = [
+        RepositorySettings(
+            visibility,
+            tuple(topics) if topics is not None else None,
+            *rest,
+        )
+        for visibility, topics, *rest in document["settings"]
+    ]
+    return PlatformConfig(
+        members=tuple(Member(*member) for member in document["members"]),
+        repositories=tuple(
+            Repository(name, description, settings[index])
+            for name, description, index in document["repositories"]
+        ),
+        member_sources=tuple(
+            MemberSource(path, fmt, _pairs(columns), _pairs(where), role)
+            for path, fmt, columns, where, role in document["member_sources"]
+        ),
+    )
+
+
+def load_checked(config_path: str | Path = DEFAULT_CONFIG_PATH) -> PlatformConfig:
+    """Parse the values file and check it for schema errors."""
+    return validate(load_values(config_path), str(config_path))
+
+
+def compile_config(
+    config_path: str | Path = DEFAULT_CONFIG_PATH,
+    snapshot_path: str | Path = DEFAULT_SNAPSHOT_PATH,
+) -> str:
+    """Validate the values file and write its snapshot; returns the digest."""
+    digest = source_digest(config_path)
+    payload = encode(load_checked(config_path))
+    snapshot_path = Path(snapshot_path)
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    # Written beside the target and renamed, so readers never see half a file
+    partial = snapshot_path.with_name(f".{snapshot_path.name}.{os.getpid()}")
+    partial.write_bytes(
+        HEADER.pack(MAGIC, FORMAT_VERSION, digest, len(payload)) + payload
+    )
+    partial.replace(snapshot_path)
+    return digest.hex()
+
+
+def read_snapshot(
+    config_path: str | Path = DEFAULT_CONFIG_PATH,
+    snapshot_path: str | Path = DEFAULT_SNAPSHOT_PATH,
+) -> PlatformConfig | None:
+    """The snapshot's config, or None if it is missing or stale."""
+    try:
+        with (
+            open(snapshot_path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            if len(mapped) < HEADER.size:
+                return None
+            magic, version, digest, length = HEADER.unpack_from(mapped)
+            if (magic, version) != (MAGIC, FORMAT_VERSION):
+                return None
+            if digest != source_digest(config_path):
+                return None
+            return decode(mapped[HEADER.size : HEADER.size + length])
+    except (OSError, ValueError, TypeError, KeyError):
+        # Unreadable or truncated snapshots are rebuilt from the values file
+        return None
+
+
+def load(
+    config_path: str | Path = DEFAULT_CONFIG_PATH,
+    snapshot_path: str | Path = DEFAULT_SNAPSHOT_PATH,
+) -> PlatformConfig:
+    """Load the config from a fresh snapshot, else from the values file."""
+    config = read_snapshot(config_path, snapshot_path)
+    return config if config is not None else load_checked(config_path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compile the values file into a validated snapshot."
+    )
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG_PATH))
+    parser.add_argument("--output", default=str(DEFAULT_SNAPSHOT_PATH))
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report whether the snapshot is fresh (exit 1 if not)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.check:
+        fresh = read_snapshot(args.config, args.output) is not None
+        print(f"{args.output}: {'fresh' if fresh else 'missing or stale'}")
+        return 0 if fresh else 1
+    try:
+        digest = compile_config(args.config, args.output)
+    except ConfigError as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(f"{args.output}: {digest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
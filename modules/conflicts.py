@@ -0,0 +1,151 @@
+"""
+Duplicate and collision detection across values files.
+
+Validation already rejects duplicate keys within one values file. Entries
+split across several files are never validated together, so two of them
+that map to the same GitHub login, repository or membership resource name
+would only fail once the engine registers the second one. This module
+indexes every entry of the given values files in a single pass, on the
+keys the schema marks unique, compared case-insensitively as validation
+and GitHub do, and reports the keys that appear in more than one file.
+
+Usage:
+    python -m modules.conflicts
+    python -m modules.conflicts config/platform_team_values.yaml other.yaml
+"""
+
+import argparse
+import sys
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from modules.config import DEFAULT_CONFIG_PATH, load_values
+from modules.config_model import MEMBERS_SECTION, SCHEMA
+from modules.org_state import state_key
+from modules.resource_names import membership_resource_name
+
+# What collides: the (section, entry key) pairs validation keeps unique
+INDEXED_KEYS = tuple(
+    (section.name, field.key)
+    for section in SCHEMA
+    for field in section.fields
+    if field.unique
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Location:
+    """Where an entry is declared."""
+
+    source: str
+    section: str
+    index: int
+    key: str
+
+    def __str__(self) -> str:
+        return f"{self.source}: {self.section}[{self.index}].{self.key}"
+
+
+@dataclass(frozen=True, slots=True)
+class Conflict:
+    """Two entries that would manage the same thing."""
+
+    value: str
+    other: str
+    first: Location
+    second: Location
+
+    @property
+    def case_only(self) -> bool:
+        return self.value != self.other
+
+    @property
+    def message(self) -> str:
+        if self.case_only:
+            return (
+                f"'{self.value}' collides case-insensitively with "
+                f"'{self.other}' at {self.first}"
+            )
+        if self.first.section == MEMBERS_SECTION and self.first.key == "name":
+            return (
+                f"resource name '{membership_resource_name(self.value)}' is "
+                f"already used, first at {self.first}"
+            )
+        return f"duplicate '{self.value}', first at {self.first}"
+
+    def __str__(self) -> str:
+        return f"{self.second}: {self.message}"
+
+
+class ConflictIndex:
+    """Hash index of every indexed key seen so far."""
+
+    def __init__(self) -> None:
+        # Locations are only built for conflicts, so store the raw parts
+        self._seen: dict[tuple[str, str, str], tuple[str, str, int]] = {}
+        self.conflicts: list[Conflict] = []
+
+    def add(self, source: str, data: Any) -> None:
+        """Index one values file; duplicates within it are left to validation."""
+        if not isinstance(data, dict):
+            return
+        for section, key in INDEXED_KEYS:
+            entries = data.get(section)
+            if not isinstance(entries, list):
+                continue
+            for index, entry in enumerate(entries):
+                value = entry.get(key) if isinstance(entry, dict) else None
+                if not isinstance(value, str):
+                    continue
+                lookup = (section, key, state_key(value))
+                first = self._seen.get(lookup)
+                if first is None:
+                    self._seen[lookup] = (value, source, index)
+                    continue
+                other, first_source, first_index = first
+                if first_source == source:
+                    continue
+                self.conflicts.append(
+                    Conflict(
+                        value,
+                        other,
+                        Location(first_source, section, first_index, key),
+                        Location(source, section, index, key),
+                    )
+                )
+
+
+def find_conflicts(documents: Iterable[tuple[str, Any]]) -> list[Conflict]:
+    """Conflicts across (source, parsed values file) pairs, in file order."""
+    index = ConflictIndex()
+    for source, data in documents:
+        index.add(source, data)
+    return index.conflicts
+
+
+def values_files(directory: Path = DEFAULT_CONFIG_PATH.parent) -> list[Path]:
+    """Every values file in the config directory."""
+    return sorted([*directory.glob("*.yaml"), *directory.glob("*.yml")])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Find entries that collide across values files."
+    )
+    parser.add_argument(
+        "paths", nargs="*", type=Path, help="Values files (default: config/*.yaml)"
+    )
+    args = parser.parse_args(argv)
+
+    paths = args.paths or values_files()
+    conflicts = find_conflicts((str(path), load_values(path)) for path in paths)
+    for conflict in conflicts:
+        print(conflict, file=sys.stderr)
+    print(f"Checked {len(paths)} file(s): {len(conflicts)} conflict(s)")
+    return 1 if conflicts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""
+`platform-admin` command line entry point for local deploys.
+
+Replaces the slow parts of scripts/local-deploy.sh:
+
+* The virtual environment is keyed by a hash of uv.lock and pyproject.toml
+  and only re-synced when that hash changes, instead of being deleted and
+  rebuilt twice per run.
+* The github and bitwarden provider plugins are installed into the shared
+  Pulumi plugin cache up front, while the quality checks run.
+* The quality checks run as parallel subprocesses instead of serial steps.
+* Unchanged deploy inputs skip the engine entirely (see deploy_plan), and
+  secrets come from the Bitwarden session broker.
+
+Usage:
+    platform-admin deploy --stack dev
+    python3 -m modules.deploy_cli deploy --stack dev --action preview
+
+The bootstrap part only uses the standard library. Once the environment is
+ready the command re-executes itself with the environment's interpreter.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess  # nosec B404
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from modules.deploy_plan import PROJECT_ROOT, UNCHANGED, plan, recorded_digest
+
+VENV_DIR = PROJECT_ROOT / ".venv"
+ENV_STAMP = VENV_DIR / ".platform-admin-lock-hash"
+ENV_INPUTS = ("uv.lock", "pyproject.toml")
+BITWARDEN_PLUGIN_FILE = (
+    PROJECT_ROOT / "sdks/bitwarden/pulumi_bitwarden/pulumi-plugin.json"
+)
+GITHUB_SECRETS_ITEM = "GitHub Secrets"
+# Set on the re-executed process so it does not bootstrap again
+_REEXEC_MARKER = "PLATFORM_ADMIN_IN_VENV"
+
+QUALITY_CHECKS: dict[str, list[str]] = {
+    # Validates the values file and compiles the snapshot the engine loads
+    "config": ["modules.config_snapshot"],
+    "conflicts": ["modules.conflicts"],
+    "ruff": ["ruff", "check", "."],
+    "mypy": [
+        "mypy",
+        "__main__.py",
+        "modules/",
+        "--explicit-package-bases",
+        "--ignore-missing-imports",
+        "--show-error-codes",
+    ],
+    "bandit": ["bandit", "-q", "-r", "__main__.py", "modules/", "-ll"],
+    "black": ["black", "--check", "--diff", "__main__.py", "modules/", "tests/"],
+    "isort": ["isort", "--check-only", "--diff", "__main__.py", "modules/", "tests/"],
+    "unit tests": [
+        "pytest",
+        "tests/unit",
+        "--tb=short",
+        "--cov=modules",
+        "--cov-report=term",
+    ],
+}
+
+
+def _step(message: str) -> None:
+    print(f"==> {message}", flush=True)
+
+
+def venv_python() -> Path:
+    return VENV_DIR / "bin" / "python"
+
+
+def environment_key(root: Path = PROJECT_ROOT) -> str:
+    """Hash of the files that decide what the environment contains."""
+    digest = hashlib.sha256()
+    for name in ENV_INPUTS:
+        path = root / name
+        if path.exists():
+            digest.update(name.encode() + b"\0" + path.read_bytes())
+    return digest.hexdigest()
+
+
+def ensure_environment(rebuild: bool = False) -> bool:
+    """Sync the virtual environment if the lock changed. Returns True if synced."""
+    key = environment_key(PROJECT_ROOT)
+    if (
+        not rebuild
+        and venv_python().exists()
+        and ENV_STAMP.exists()
+        and ENV_STAMP.read_text().strip() == key
+    ):
+        return False
+    # uv sync is incremental, so an existing environment is updated in place
+    subprocess.run(  # nosec B603 B607
+        ["uv", "sync", "--locked", "--all-groups"], cwd=PROJECT_ROOT, check=True
+    )
+    ENV_STAMP.write_text(key + "\n")
+    return True
+
+
+@dataclass(frozen=True)
+class Plugin:
+    """A resource plugin the program needs at a specific version."""
+
+    name: str
+    version: str
+
+    def cache_dir(self) -> Path:
+        pulumi_home = Path(os.getenv("PULUMI_HOME", Path.home() / ".pulumi"))
+        return pulumi_home / "plugins" / f"resource-{self.name}-v{self.version}"
+
+
+def required_plugins() -> list[Plugin]:
+    """Resource plugins pinned by the installed SDKs."""
+    from importlib.metadata import version
+
+    bitwarden = json.loads(BITWARDEN_PLUGIN_FILE.read_text())
+    return [
+        Plugin("github", version("pulumi-github")),
+        Plugin(bitwarden["name"], bitwarden["version"]),
+    ]
+
+
+def prewarm_plugins(plugins: list[Plugin]) -> list[Plugin]:
+    """Install plugins missing from the shared cache. Returns those installed."""
+    missing = [plugin for plugin in plugins if not plugin.cache_dir().exists()]
+    for plugin in missing:
+        subprocess.run(  # nosec B603 B607
+            ["pulumi", "plugin", "install", "resource", plugin.name, plugin.version],
+            check=True,
+            capture_output=True,
+        )
+    return missing
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one quality check subprocess."""
+
+    name: str
+    returncode: int
+    output: str
+    seconds: float
+
+    @property
+    def passed(self) -> bool:
+        return self.returncode == 0
+
+
+def _run_check(name: str, command: list[str]) -> CheckResult:
+    started = time.perf_counter()
+    result = subprocess.run(  # nosec B603
+        [sys.executable, "-m", *command],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return CheckResult(
+        name,
+        result.returncode,
+        result.stdout + result.stderr,
+        time.perf_counter() - started,
+    )
+
+
+def run_quality_checks(
+    checks: dict[str, list[str]] = QUALITY_CHECKS,
+) -> list[CheckResult]:
+    """Run all checks concurrently and report them in declaration order."""
+    with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+        futures = [
+            pool.submit(_run_check, name, command) for name, command in checks.items()
+        ]
+        results = [future.result() for future in futures]
+    for result in results:
+        status = "ok" if result.passed else "FAILED"
+        print(f"    {result.name:<12} {status:<6} {result.seconds:5.1f}s")
+        if not result.passed:
+            print(result.output)
+    return results
+
+
+def load_github_secrets(use_broker: bool) -> None:
+    """Export BW_SESSION, GITHUB_TOKEN and GITHUB_OWNER for the engine."""
+    if not use_broker:
+        return
+    from modules import bitwarden_broker
+
+    bitwarden_broker.ensure_running()
+    os.environ["BW_SESSION"] = bitwarden_broker.request("session")["session"]
+    item = bitwarden_broker.get_item(GITHUB_SECRETS_ITEM)
+    os.environ["GITHUB_TOKEN"] = bitwarden_broker.item_field(
+        item, "pulumi-github-token"
+    )
+    os.environ["GITHUB_OWNER"] = bitwarden_broker.item_field(
+        item, "pulumi-github-owner"
+    )
+
+
+def deploy(args: argparse.Namespace) -> int:
+    import dotenv
+
+    dotenv.load_dotenv(PROJECT_ROOT / ".env")
+    if args.action in ("up", "preview") and not args.force:
+        _step(f"Checking deploy inputs against stack {args.stack}")
+        result = plan(args.stack, recorded_digest(args.stack))
+        print(f"    {result.describe()}")
+        if result.status == UNCHANGED:
+            return 0
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # Plugin downloads overlap with the checks rather than the engine start
+        _step("Pre-warming provider plugins")
+        prewarm = pool.submit(prewarm_plugins, required_plugins())
+        if args.skip_quality_checks:
+            _step("Skipping quality checks")
+        else:
+            _step("Running quality checks")
+            if not all(result.passed for result in run_quality_checks()):
+                return 1
+        for plugin in prewarm.result():
+            print(f"    installed {plugin.name} v{plugin.version}")
+
+    _step("Loading secrets")
+    load_github_secrets(use_broker=not args.no_broker)
+
+    command = ["pulumi", args.action, "--stack", args.stack]
+    if args.action in ("up", "destroy"):
+        command.append("--yes")
+    _step(" ".join(command))
+    engine = subprocess.run(command, cwd=PROJECT_ROOT, check=False)  # nosec B603
+    return engine.returncode
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="platform-admin", description="Platform team admin tooling."
+    )
+    parser.add_argument(
+        "--rebuild-env",
+        action="store_true",
+        help="Re-sync the virtual environment even if uv.lock is unchanged",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    deploy_parser = commands.add_parser("deploy", help="Check and deploy a stack")
+    deploy_parser.add_argument("--stack", default="dev")
+    deploy_parser.add_argument(
+        "--action", choices=("up", "preview", "destroy"), default="up"
+    )
+    deploy_parser.add_argument("--skip-quality-checks", action="store_true")
+    deploy_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run even when deploy inputs match the last successful update",
+    )
+    deploy_parser.add_argument(
+        "--no-broker",
+        action="store_true",
+        help="Use BW_SESSION and GITHUB_* from the environment as they are",
+    )
+    preview_parser = commands.add_parser(
+        "preview", help="Preview several stacks concurrently"
+    )
+    preview_parser.add_argument("--stack", action="append", dest="stacks")
+    preview_parser.add_argument("--no-broker", action="store_true")
+    commands.add_parser("check", help="Run the quality checks in parallel")
+    commands.add_parser("env", help="Create or reuse the virtual environment")
+
+    argv = sys.argv[1:] if argv is None else argv
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+
+    if not os.getenv(_REEXEC_MARKER):
+        _step("Preparing virtual environment")
+        synced = ensure_environment(rebuild=args.rebuild_env)
+        print(f"    {'synced' if synced else 'reused'} {VENV_DIR}")
+        if args.command != "env" and Path(sys.prefix).resolve() != VENV_DIR.resolve():
+            python = str(venv_python())
+            os.environ[_REEXEC_MARKER] = "1"
+            os.chdir(PROJECT_ROOT)
+            os.execv(python, [python, "-m", "modules.deploy_cli", *argv])  # nosec B606
+
+    if args.command == "env":
+        return 0
+    if args.command == "preview":
+        from modules import multi_preview
+
+        preview_args = [f"--stack={stack}" for stack in args.stacks or ()]
+        if args.no_broker:
+            preview_args.append("--no-broker")
+        status = multi_preview.main(preview_args)
+    elif args.command == "check":
+        status = 0 if all(r.passed for r in run_quality_checks()) else 1
+    else:
+        status = deploy(args)
+    print(f"Finished in {time.perf_counter() - started:.1f}s")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Content-hash gate for Pulumi deployments.
+
+Computes a digest over the inputs that can change what the program
+registers: the program itself, the values files, the shared modules, the
+project and stack settings, and the pinned SDK and provider versions. The
+program exports the same digest as `deploy_inputs_digest`, so comparing it
+to the output recorded by the last successful update tells us whether a
+preview or update can be skipped without starting the engine.
+
+Docs, scripts and tests are deliberately not inputs. Changes made directly
+in GitHub are not detected either; use --force or the drift check for those.
+
+Usage:
+    python3 -m modules.deploy_plan check --stack dev && echo "nothing to do"
+    python3 -m modules.deploy_plan digest --stack dev
+
+This module only uses the standard library so it can run before the
+virtual environment is built.
+"""
+
+import argparse
+import hashlib
+import json
+import subprocess  # nosec B404
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+DIGEST_OUTPUT = "deploy_inputs_digest"
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Single files, relative to the project root
+INPUT_FILES = (
+    "__main__.py",
+    "Pulumi.yaml",
+    "requirements.txt",
+    "uv.lock",
+    "sdks/bitwarden/pyproject.toml",
+    "sdks/bitwarden/pulumi_bitwarden/pulumi-plugin.json",
+)
+# Directories and the file patterns inside them that count as inputs
+INPUT_TREES = (
+    ("config", "*"),
+    ("modules", "*.py"),
+)
+
+UNCHANGED = 0
+CHANGED = 1
+UNKNOWN = 2
+
+
+def input_paths(root: Path = PROJECT_ROOT, stack: str | None = None) -> list[Path]:
+    """List the deploy inputs that exist, relative to the project root."""
+    candidates = [Path(name) for name in INPUT_FILES]
+    if stack:
+        candidates.append(Path(f"Pulumi.{stack}.yaml"))
+    for directory, pattern in INPUT_TREES:
+        candidates.extend(
+            path.relative_to(root)
+            for path in (root / directory).rglob(pattern)
+            if path.is_file() and "__pycache__" not in path.parts
+        )
+    return sorted({path for path in candidates if (root / path).is_file()})
+
+
+def compute_digest(root: Path = PROJECT_ROOT, stack: str | None = None) -> str:
+    """Hash the names and contents of all deploy inputs."""
+    digest = hashlib.sha256()
+    for path in input_paths(root, stack):
+        # Length-prefix both parts so moving bytes between files changes the hash
+        name = path.as_posix().encode()
+        content = (root / path).read_bytes()
+        digest.update(len(name).to_bytes(4, "big") + name)
+        digest.update(len(content).to_bytes(8, "big") + content)
+    return digest.hexdigest()
+
+
+def recorded_digest(stack: str, pulumi: str = "pulumi") -> str | None:
+    """Read the digest exported by the last successful update, if any."""
+    try:
+        result = subprocess.run(  # nosec B603
+            [pulumi, "stack", "output", "--json", "--stack", stack],
+            capture_output=True,
+            text=True,
+            check=False,
+            cwd=PROJECT_ROOT,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        value = json.loads(result.stdout or "{}").get(DIGEST_OUTPUT)
+    except (ValueError, AttributeError):
+        return None
+    return value if isinstance(value, str) else None
+
+
+@dataclass(frozen=True)
+class DeployPlan:
+    """Outcome of comparing current inputs to the recorded digest."""
+
+    digest: str
+    recorded: str | None
+
+    @property
+    def status(self) -> int:
+        if self.recorded is None:
+            return UNKNOWN
+        return UNCHANGED if self.digest == self.recorded else CHANGED
+
+    def describe(self) -> str:
+        if self.recorded is None:
+            return f"No recorded {DIGEST_OUTPUT}, deploy required"
+        if self.status == CHANGED:
+            return (
+                f"Deploy inputs changed ({self.recorded[:12]} -> "
+                f"{self.digest[:12]}), deploy required"
+            )
+        return f"Deploy inputs unchanged ({self.digest[:12]}), nothing to deploy"
+
+
+def plan(stack: str, recorded: str | None, root: Path = PROJECT_ROOT) -> DeployPlan:
+    """Compare the current inputs of a stack against a recorded digest."""
+    return DeployPlan(digest=compute_digest(root, stack), recorded=recorded)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Decide whether a Pulumi deploy can be skipped."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser(
+        "check", help="Exit 0 when inputs match the last update, 1 when changed"
+    )
+    check.add_argument("--stack", required=True)
+    check.add_argument("--pulumi", default="pulumi", help="Pulumi CLI to call")
+
+    digest = commands.add_parser("digest", help="Print the current input digest")
+    digest.add_argument("--stack")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "digest":
+        print(compute_digest(stack=args.stack))
+        return 0
+
+    result = plan(args.stack, recorded_digest(args.stack, args.pulumi))
+    print(result.describe(), file=sys.stderr)
+    return result.status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+Desired-vs-actual drift detection for the GitHub organization.
+
+Compares the values file against live organization state and emits a
+machine-readable report. This is a cheap alternative to `pulumi refresh`
+when all we need to know is whether GitHub still matches the config.
+
+Usage:
+    python -m modules.drift --output drift-report.json --fail-on-drift
+"""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from modules import config_snapshot
+from modules.config import DEFAULT_CONFIG_PATH
+from modules.config_model import PlatformConfig
+from modules.github_client import GitHubClient
+from modules.member_sources import iter_members
+from modules.org_state import (
+    DEFAULT_PROTECTED_BRANCH,
+    BranchProtectionState,
+    MemberState,
+    OrgState,
+    RepositoryState,
+    fetch_org_state,
+)
+
+MISSING = "missing"
+EXTRA = "extra"
+MISMATCH = "mismatch"
+# Repository settings compared only when both sides know them
+_OPTIONAL_SETTINGS = (
+    "topics",
+    "allow_merge_commit",
+    "allow_squash_merge",
+    "allow_rebase_merge",
+    "delete_branch_on_merge",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DriftItem:
+    """A single difference between desired and actual state."""
+
+    kind: str
+    key: str
+    change: str
+    field: str | None = None
+    expected: Any = None
+    actual: Any = None
+
+
+@dataclass
+class DriftReport:
+    """All differences found by a drift comparison."""
+
+    items: list[DriftItem] = field(default_factory=list)
+
+    @property
+    def has_drift(self) -> bool:
+        return bool(self.items)
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        """Count drift items per entity kind and change type."""
+        counts: dict[str, dict[str, int]] = {}
+        for item in self.items:
+            per_kind = counts.setdefault(item.kind, {MISSING: 0, EXTRA: 0, MISMATCH: 0})
+            per_kind[item.change] += 1
+        return counts
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "has_drift": self.has_drift,
+            "summary": self.summary(),
+            "drift": [asdict(item) for item in self.items],
+        }
+
+
+def desired_state(config: PlatformConfig) -> OrgState:
+    """Build the expected organization state from the values file."""
+    # Defaults mirror what the program registers
+    return OrgState.build(
+        members=(
+            MemberState(username=member.username, role=member.role)
+            for member in iter_members(config)
+        ),
+        repositories=(
+            RepositoryState(
+                name=repo.name,
+                description=repo.description,
+                visibility=repo.settings.visibility,
+                topics=(
+                    tuple(sorted(repo.settings.topics))
+                    if repo.settings.topics is not None
+                    else None
+                ),
+                allow_merge_commit=repo.settings.allow_merge_commit,
+                allow_squash_merge=repo.settings.allow_squash_merge,
+                allow_rebase_merge=repo.settings.allow_rebase_merge,
+                delete_branch_on_merge=repo.settings.delete_branch_on_merge,
+                protection=BranchProtectionState(
+                    pattern=DEFAULT_PROTECTED_BRANCH,
+                    enforce_admins=repo.settings.enforce_admins,
+                    require_signed_commits=repo.settings.require_signed_commits,
+                ),
+            )
+            for repo in config.repositories
+        ),
+    )
+
+
+def _compare_fields(
+    kind: str, key: str, expected: Any, actual: Any, fields: tuple[str, ...]
+) -> list[DriftItem]:
+    return [
+        DriftItem(kind, key, MISMATCH, name, want, have)
+        for name in fields
+        if (want := getattr(expected, name)) != (have := getattr(actual, name))
+    ]
+
+
+def _compare_settings(
+    key: str, expected: RepositoryState, actual: RepositoryState
+) -> list[DriftItem]:
+    return [
+        DriftItem("repository", key, MISMATCH, name, want, have)
+        for name in _OPTIONAL_SETTINGS
+        if (want := getattr(expected, name)) is not None
+        and (have := getattr(actual, name)) is not None
+        and want != have
+    ]
+
+
+def _compare_protection(
+    key: str,
+    expected: BranchProtectionState | None,
+    actual: BranchProtectionState | None,
+) -> list[DriftItem]:
+    if expected is None or expected == actual:
+        return []
+    if actual is None:
+        return [DriftItem("repository", key, MISMATCH, "protection", asdict(expected))]
+    return [
+        DriftItem("repository", key, MISMATCH, f"protection.{name}", want, have)
+        for name in ("pattern", "enforce_admins", "require_signed_commits")
+        if (want := getattr(expected, name)) != (have := getattr(actual, name))
+    ]
+
+
+def compute_drift(
+    desired: OrgState,
+    actual: OrgState,
+    include_extra: bool = True,
+    include_protection: bool = True,
+) -> DriftReport:
+    """Diff two organization states by key."""
+    items: list[DriftItem] = []
+
+    for key in sorted(desired.members.keys() - actual.members.keys()):
+        items.append(DriftItem("member", key, MISSING))
+    if include_extra:
+        for key in sorted(actual.members.keys() - desired.members.keys()):
+            items.append(DriftItem("member", key, EXTRA))
+    for key, want in sorted(desired.members.items()):
+        have = actual.members.get(key)
+        if have is not None and have != want:
+            items.extend(_compare_fields("member", key, want, have, ("role",)))
+
+    for key in sorted(desired.repositories.keys() - actual.repositories.keys()):
+        items.append(DriftItem("repository", key, MISSING))
+    if include_extra:
+        for key in sorted(actual.repositories.keys() - desired.repositories.keys()):
+            items.append(DriftItem("repository", key, EXTRA))
+    for key, want_repo in sorted(desired.repositories.items()):
+        have_repo = actual.repositories.get(key)
+        if have_repo is None or have_repo == want_repo:
+            continue
+        items.extend(
+            _compare_fields(
+                "repository", key, want_repo, have_repo, ("description", "visibility")
+            )
+        )
+        items.extend(_compare_settings(key, want_repo, have_repo))
+        if include_protection:
+            items.extend(
+                _compare_protection(key, want_repo.protection, have_repo.protection)
+            )
+
+    return DriftReport(items)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare the values file to live GitHub state."
+    )
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG_PATH))
+    parser.add_argument("--owner", default=os.getenv("GITHUB_OWNER"))
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument(
+        "--no-protection",
+        action="store_true",
+        help="Skip per-repository branch protection reads",
+    )
+    parser.add_argument(
+        "--ignore-extra",
+        action="store_true",
+        help="Do not report members or repositories missing from the config",
+    )
+    parser.add_argument("--fail-on-drift", action="store_true")
+    args = parser.parse_args(argv)
+
+    if not args.owner:
+        parser.error("--owner or GITHUB_OWNER is required")
+
+    desired = desired_state(config_snapshot.load(args.config))
+    actual = fetch_org_state(
+        GitHubClient.from_env(),
+        args.owner,
+        include_protection=not args.no_protection,
+        # Only managed repositories are compared, so skip the others' reads
+        protected_repos=[repo.name for repo in desired.repositories.values()],
+    )
+    report = compute_drift(
+        desired,
+        actual,
+        include_extra=not args.ignore_extra,
+        include_protection=not args.no_protection,
+    )
+
+    payload = json.dumps(report.to_dict(), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+    print(
+        f"Drift: {len(report.items)} item(s) {json.dumps(report.summary())}",
+        file=sys.stderr,
+    )
+    return 1 if args.fail_on_drift and report.has_drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
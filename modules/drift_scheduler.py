@@ -0,0 +1,326 @@
+"""
+Rotating, prioritized partial refreshes for continuous drift detection.
+
+A full `pulumi refresh` reads every resource in the organization. This
+scheduler instead refreshes a bounded slice per run and records when each
+URN was last refreshed. The slice has two parts:
+
+* rotation slots, 1/24th of the managed resources by default, always go
+  to the least recently refreshed resources, so hourly runs cover every
+  resource at least daily;
+* priority slots go to resources that drifted in an earlier run or whose
+  config changed since the previous run, then to high-risk resources
+  (admin memberships and branch protection rules) by age.
+
+Every target the refresh reports on gets a new timestamp, so the rotation
+keeps moving while some resources drift. The drifted ones are kept in a
+separate set until a refresh finds them clean again.
+
+Usage:
+    python -m modules.drift_scheduler --stack dev --state drift-schedule.json
+    python -m modules.drift_scheduler --stack dev --dry-run
+"""
+
+import argparse
+import io
+import json
+import math
+import subprocess  # nosec B404
+import sys
+import time
+from collections.abc import Collection
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from modules import config_snapshot
+from modules.config import DEFAULT_CONFIG_PATH
+from modules.config_model import PlatformConfig
+from modules.deploy_plan import PROJECT_ROOT
+from modules.impact import plan_impact
+from modules.member_sources import iter_members
+from modules.resource_names import (
+    BRANCH_PROTECTION_TYPE,
+    MEMBERSHIP_TYPE,
+    REPOSITORY_TYPE,
+    branch_protection_resource_name,
+    membership_resource_name,
+    repository_resource_name,
+    urn,
+)
+from modules.stack_index import StackIndex
+from modules.state_analyzer import Checkpoint, iter_checkpoint
+
+DEFAULT_SLICES = 24
+HIGH_RISK_WEIGHT = 4.0
+# Refresh preview steps that change a resource's state
+CHANGE_OPS = frozenset(
+    {
+        "update",
+        "delete",
+        "replace",
+        "create-replacement",
+        "delete-replaced",
+        "read-replacement",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduledResource:
+    """A managed resource that can be refreshed on its own."""
+
+    urn: str
+    high_risk: bool = False
+
+
+def managed_resources(config: PlatformConfig, stack: str) -> list[ScheduledResource]:
+    """URNs the program registers for a values file."""
+    resources = [
+        ScheduledResource(
+            urn(stack, MEMBERSHIP_TYPE, membership_resource_name(member.name)),
+            high_risk=member.role == "admin",
+        )
+        for member in iter_members(config)
+    ]
+    for repo in config.repositories:
+        resources.append(
+            ScheduledResource(
+                urn(stack, REPOSITORY_TYPE, repository_resource_name(repo.name))
+            )
+        )
+        resources.append(
+            ScheduledResource(
+                urn(
+                    stack,
+                    BRANCH_PROTECTION_TYPE,
+                    branch_protection_resource_name(repo.name),
+                ),
+                high_risk=True,
+            )
+        )
+    return resources
+
+
+def deployed_urns(stack: str) -> set[str] | None:
+    """URNs the stack manages, or None if they can't be read."""
+    try:
+        return StackIndex.from_stack(stack).urns(stack)
+    except ValueError:
+        # Stacks last updated before the index existed; read the checkpoint
+        pass
+    try:
+        export = subprocess.Popen(  # nosec B603 B607
+            ["pulumi", "stack", "export", "--stack", stack],
+            cwd=PROJECT_ROOT,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+    except OSError:
+        return None
+    with export:
+        try:
+            checkpoint = iter_checkpoint(export.stdout or io.StringIO(), Checkpoint())
+            urns = {resource["urn"] for resource in checkpoint}
+        except ValueError:
+            urns = set()
+    return urns if export.returncode == 0 else None
+
+
+def load_schedule(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {"last_commit": None, "refreshed": {}, "drifted": []}
+    schedule: dict[str, Any] = json.loads(path.read_text())
+    schedule.setdefault("refreshed", {})
+    schedule.setdefault("drifted", [])
+    return schedule
+
+
+def save_schedule(path: Path, schedule: dict[str, Any]) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(schedule, indent=2, sort_keys=True) + "\n")
+    tmp_path.replace(path)
+
+
+def select_targets(
+    resources: list[ScheduledResource],
+    refreshed: dict[str, float],
+    now: float,
+    budget: int,
+    priority_budget: int = 0,
+    changed: Collection[str] = (),
+    drifted: Collection[str] = (),
+) -> list[str]:
+    """Pick the URNs to refresh this run.
+
+    `budget` slots rotate through everything, oldest first, which bounds the
+    time until every resource has been refreshed. Up to `priority_budget`
+    further slots go to drifted, changed and high-risk resources.
+    """
+
+    def age(resource: ScheduledResource) -> float:
+        last = refreshed.get(resource.urn)
+        return math.inf if last is None else now - last
+
+    rotation = sorted(resources, key=age, reverse=True)[:budget]
+    chosen = {resource.urn for resource in rotation}
+
+    def priority(resource: ScheduledResource) -> tuple[bool, bool, float]:
+        weight = HIGH_RISK_WEIGHT if resource.high_risk else 1.0
+        return (
+            resource.urn in drifted,
+            resource.urn in changed,
+            age(resource) * weight,
+        )
+
+    candidates = [
+        resource
+        for resource in resources
+        if resource.urn not in chosen
+        and (resource.high_risk or resource.urn in changed or resource.urn in drifted)
+    ]
+    prioritized = sorted(candidates, key=priority, reverse=True)[:priority_budget]
+    return [resource.urn for resource in rotation + prioritized]
+
+
+def recently_changed(schedule: dict[str, Any], stack: str) -> set[str]:
+    """URNs whose config changed since the commit of the previous run."""
+    base = schedule.get("last_commit")
+    if not base:
+        return set()
+    try:
+        impact = plan_impact(base, None, stack)
+    except subprocess.CalledProcessError:
+        # The previous commit is unknown here, e.g. after a shallow clone
+        return set()
+    return set() if impact.full else impact.targets
+
+
+def _head_commit() -> str | None:
+    result = subprocess.run(  # nosec B603 B607
+        ["git", "rev-parse", "HEAD"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return result.stdout.strip() or None
+
+
+def _changes_state(step: dict[str, Any]) -> bool:
+    op = step.get("op")
+    if op in CHANGE_OPS:
+        return True
+    if op != "refresh":
+        return False
+    # Refresh steps are listed for every target; compare what they read
+    old, new = step.get("oldState"), step.get("newState")
+    if old is None:
+        return False
+    return new is None or new.get("outputs") != old.get("outputs")
+
+
+def drifted_urns(preview: dict[str, Any]) -> set[str]:
+    """URNs a refresh preview would change, from its --json output."""
+    return {step["urn"] for step in preview.get("steps") or [] if _changes_state(step)}
+
+
+def refresh(stack: str, targets: list[str]) -> set[str] | None:
+    """Preview a refresh of the targets and return those that drifted.
+
+    Returns None when the refresh itself failed.
+    """
+    command = ["pulumi", "refresh", "--stack", stack, "--preview-only", "--json"]
+    for target in targets:
+        command += ["--target", target]
+    result = subprocess.run(  # nosec B603
+        command, cwd=PROJECT_ROOT, capture_output=True, text=True, check=False
+    )
+    sys.stderr.write(result.stderr)
+    if result.returncode != 0:
+        return None
+    try:
+        preview = json.loads(result.stdout)
+    except ValueError:
+        return None
+    return drifted_urns(preview) & set(targets)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Refresh a rotating, prioritized slice of the stack."
+    )
+    parser.add_argument("--stack", default="dev")
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG_PATH))
+    parser.add_argument("--state", type=Path, default=Path("drift-schedule.json"))
+    parser.add_argument(
+        "--slices",
+        type=int,
+        default=DEFAULT_SLICES,
+        help="Runs needed to cover every resource once",
+    )
+    parser.add_argument(
+        "--priority-budget",
+        type=int,
+        help="Extra slots for changed and high-risk resources (default: rotation size)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only print targets")
+    args = parser.parse_args(argv)
+
+    resources = managed_resources(config_snapshot.load(args.config), args.stack)
+    # Config entries that were never deployed cannot be refreshed
+    deployed = deployed_urns(args.stack)
+    if deployed is not None:
+        resources = [r for r in resources if r.urn in deployed]
+    schedule = load_schedule(args.state)
+    changed = recently_changed(schedule, args.stack)
+    budget = max(1, math.ceil(len(resources) / args.slices))
+    now = time.time()
+    priority_budget = budget if args.priority_budget is None else args.priority_budget
+    drifted = set(schedule["drifted"])
+    targets = select_targets(
+        resources,
+        schedule["refreshed"],
+        now,
+        budget,
+        priority_budget,
+        changed,
+        drifted,
+    )
+
+    print(
+        f"Refreshing {len(targets)} of {len(resources)} resources "
+        f"({len(changed)} changed since last run, {len(drifted)} drifted)"
+    )
+    for target in targets:
+        print(f"  {target}")
+    if args.dry_run or not targets:
+        return 0
+
+    found = refresh(args.stack, targets)
+    if found is None:
+        # Nothing was checked, so the slice is tried again next run
+        print("Refresh failed for this slice", file=sys.stderr)
+        return 1
+
+    managed = {resource.urn for resource in resources}
+    schedule["refreshed"] = {
+        key: value for key, value in schedule["refreshed"].items() if key in managed
+    }
+    schedule["refreshed"].update(dict.fromkeys(targets, now))
+    drifted = ((drifted & managed) - set(targets)) | found
+    schedule["drifted"] = sorted(drifted)
+    schedule["last_commit"] = _head_commit()
+    save_schedule(args.state, schedule)
+
+    if found:
+        print(f"Drift detected in {len(found)} resource(s):", file=sys.stderr)
+        for target in sorted(found):
+            print(f"  {target}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
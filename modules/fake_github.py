@@ -0,0 +1,565 @@
+"""
+Local stand-in for the GitHub API, seeded from a synthetic organization.
+
+Serves the REST endpoints used by the drift engine, the integration tests
+and the basic CRUD paths of the Pulumi GitHub provider, plus a minimal
+GraphQL endpoint. Responses carry GitHub-style pagination and rate-limit
+headers, and an optional per-request latency can be injected so validation
+and deploy runs can be benchmarked offline.
+
+Usage:
+    python -m modules.fake_github --repos 2000 --members 500 --latency-ms 50
+
+Point the tooling at it with:
+    export GITHUB_API_URL=http://127.0.0.1:8080    # drift engine and tests
+    export GITHUB_BASE_URL=http://127.0.0.1:8080/  # pulumi_github provider
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+import urllib.parse
+from collections.abc import Callable
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from modules.org_state import (
+    DEFAULT_PROTECTED_BRANCH,
+    BranchProtectionState,
+    MemberState,
+    RepositoryState,
+    state_key,
+)
+from modules.synthetic_org import SyntheticOrg, generate_org
+
+MAX_PER_PAGE = 100
+
+Reply = tuple[int, dict[str, str], Any]
+
+
+def _not_found(message: str = "Not Found") -> Reply:
+    return 404, {}, {"message": message}
+
+
+class FakeGitHubServer:
+    """In-process HTTP server emulating a GitHub organization."""
+
+    def __init__(
+        self,
+        org: SyntheticOrg,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        rate_limit: int | None = None,
+        rate_limit_window: float = 3600.0,
+        default_per_page: int = 30,
+    ) -> None:
+        self.owner = org.owner
+        self.members = {state_key(m.username): m for m in org.members}
+        self.repositories = {state_key(r.name): r for r in org.repositories}
+        self.branches = {state_key(k): list(v) for k, v in org.branches.items()}
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.default_per_page = default_per_page
+        self.request_count = 0
+
+        self._ids: dict[str, int] = {}
+        # Serialized list responses, kept until members or repositories change
+        self._listings: dict[tuple[str, str], list[Any]] = {}
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._window_used = 0
+        self._thread: threading.Thread | None = None
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+
+        org_path = r"/orgs/(?P<org>[^/]+)"
+        repo_path = r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)"
+        branch_path = repo_path + r"/branches/(?P<branch>[^/]+)"
+        self._routes: list[tuple[str, re.Pattern[str], Callable[..., Reply]]] = [
+            ("GET", re.compile(r"/user"), self._get_user),
+            ("GET", re.compile(r"/rate_limit"), self._get_rate_limit),
+            ("GET", re.compile(org_path), self._get_org),
+            ("GET", re.compile(org_path + r"/members"), self._list_members),
+            (
+                "GET",
+                re.compile(org_path + r"/memberships/(?P<user>[^/]+)"),
+                self._get_membership,
+            ),
+            (
+                "PUT",
+                re.compile(org_path + r"/memberships/(?P<user>[^/]+)"),
+                self._put_membership,
+            ),
+            (
+                "DELETE",
+                re.compile(org_path + r"/(?:memberships|members)/(?P<user>[^/]+)"),
+                self._delete_membership,
+            ),
+            ("GET", re.compile(org_path + r"/repos"), self._list_repos),
+            ("POST", re.compile(org_path + r"/repos"), self._create_repo),
+            ("GET", re.compile(repo_path), self._get_repo),
+            ("PATCH", re.compile(repo_path), self._update_repo),
+            ("DELETE", re.compile(repo_path), self._delete_repo),
+            ("GET", re.compile(repo_path + r"/branches"), self._list_branches),
+            ("GET", re.compile(branch_path), self._get_branch),
+            ("GET", re.compile(branch_path + r"/protection"), self._get_protection),
+            ("PUT", re.compile(branch_path + r"/protection"), self._put_protection),
+            (
+                "DELETE",
+                re.compile(branch_path + r"/protection"),
+                self._delete_protection,
+            ),
+            (
+                "POST",
+                re.compile(branch_path + r"/protection/required_signatures"),
+                self._enable_signatures,
+            ),
+            (
+                "DELETE",
+                re.compile(branch_path + r"/protection/required_signatures"),
+                self._disable_signatures,
+            ),
+            ("POST", re.compile(r"(?:/api)?/graphql"), self._graphql),
+        ]
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> "FakeGitHubServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeGitHubServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    # Request handling
+
+    def handle(
+        self, method: str, raw_path: str, host: str, body: bytes
+    ) -> tuple[int, dict[str, str], bytes]:
+        """Route a request and encode the JSON response."""
+        if self.latency:
+            time.sleep(self.latency)
+
+        parsed = urllib.parse.urlsplit(raw_path)
+        path = parsed.path.removeprefix("/api/v3").rstrip("/") or "/"
+        query = dict(urllib.parse.parse_qsl(parsed.query))
+        payload = json.loads(body) if body else {}
+
+        headers, exhausted = self._consume_rate_limit()
+        reply: Reply = (403, {}, {"message": "API rate limit exceeded"})
+        if not exhausted:
+            reply = self._route(method, path, query, payload, host)
+        status, extra, result = reply
+        headers.update(extra)
+        headers["Content-Type"] = "application/json; charset=utf-8"
+        data = b"" if result is None else json.dumps(result).encode()
+        return status, headers, data
+
+    def _route(
+        self,
+        method: str,
+        path: str,
+        query: dict[str, str],
+        payload: Any,
+        host: str,
+    ) -> Reply:
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match and route_method == method:
+                with self._lock:
+                    return handler(
+                        query=query, payload=payload, host=host, **match.groupdict()
+                    )
+        return _not_found()
+
+    def _consume_rate_limit(self) -> tuple[dict[str, str], bool]:
+        with self._lock:
+            self.request_count += 1
+            now = time.time()
+            if now - self._window_start >= self.rate_limit_window:
+                self._window_start = now
+                self._window_used = 0
+            limit = self.rate_limit or 5000
+            exhausted = self.rate_limit is not None and self._window_used >= limit
+            if self.rate_limit is not None and not exhausted:
+                self._window_used += 1
+            headers = {
+                "X-RateLimit-Limit": str(limit),
+                "X-RateLimit-Remaining": str(limit - self._window_used),
+                "X-RateLimit-Used": str(self._window_used),
+                "X-RateLimit-Reset": str(
+                    int(self._window_start + self.rate_limit_window)
+                ),
+                "X-RateLimit-Resource": "core",
+            }
+            return headers, exhausted
+
+    def _listing(
+        self, key: tuple[str, str], build: Callable[[], list[Any]]
+    ) -> list[Any]:
+        """Items of a list endpoint, serialized once and then sliced per page."""
+        items = self._listings.get(key)
+        if items is None:
+            items = self._listings[key] = build()
+        return items
+
+    def _paginate(
+        self, items: list[Any], query: dict[str, str], path: str, host: str
+    ) -> Reply:
+        try:
+            per_page = int(query.get("per_page", self.default_per_page))
+            page = int(query.get("page", 1))
+        except ValueError:
+            per_page = page = 0
+        if per_page < 1 or page < 1:
+            return 422, {}, {"message": "page and per_page must be positive integers"}
+        per_page = min(per_page, MAX_PER_PAGE)
+        last = max((len(items) + per_page - 1) // per_page, 1)
+
+        def link(number: int) -> str:
+            params = urllib.parse.urlencode({**query, "page": number})
+            return f"http://{host}{path}?{params}"
+
+        rels = []
+        if page < last:
+            rels += [f'<{link(page + 1)}>; rel="next"', f'<{link(last)}>; rel="last"']
+        if page > 1:
+            rels += [f'<{link(1)}>; rel="first"', f'<{link(page - 1)}>; rel="prev"']
+        headers = {"Link": ", ".join(rels)} if rels else {}
+        start = (page - 1) * per_page
+        return 200, headers, items[start : start + per_page]
+
+    # JSON shapes
+
+    def _id(self, key: str) -> int:
+        return self._ids.setdefault(key, len(self._ids) + 1)
+
+    def _user_json(self, login: str) -> dict[str, Any]:
+        return {
+            "login": login,
+            "id": self._id(f"user:{state_key(login)}"),
+            "type": "User",
+            "site_admin": False,
+        }
+
+    def _membership_json(self, member: MemberState) -> dict[str, Any]:
+        return {
+            "state": "active",
+            "role": member.role,
+            "user": self._user_json(member.username),
+            "organization": {"login": self.owner},
+        }
+
+    def _repo_json(self, repo: RepositoryState) -> dict[str, Any]:
+        repo_id = self._id(f"repo:{state_key(repo.name)}")
+        return {
+            "id": repo_id,
+            "node_id": f"R_{repo_id}",
+            "name": repo.name,
+            "full_name": f"{self.owner}/{repo.name}",
+            "owner": {"login": self.owner, "type": "Organization"},
+            "description": repo.description,
+            "visibility": repo.visibility,
+            "private": repo.visibility != "public",
+            "default_branch": repo.default_branch,
+            "archived": repo.archived,
+            "has_issues": repo.has_issues,
+            "has_wiki": repo.has_wiki,
+        }
+
+    def _protection_json(self, protection: BranchProtectionState) -> dict[str, Any]:
+        return {
+            "enforce_admins": {"enabled": protection.enforce_admins},
+            "required_signatures": {"enabled": protection.require_signed_commits},
+        }
+
+    def _lookup_repo(self, owner: str, repo: str) -> RepositoryState | None:
+        if state_key(owner) != state_key(self.owner):
+            return None
+        return self.repositories.get(state_key(repo))
+
+    # Route handlers
+
+    def _get_user(self, **_: Any) -> Reply:
+        return 200, {}, self._user_json("fake-admin")
+
+    def _get_rate_limit(self, **_: Any) -> Reply:
+        limit = self.rate_limit or 5000
+        core = {"limit": limit, "remaining": limit - self._window_used}
+        return 200, {}, {"resources": {"core": core}, "rate": core}
+
+    def _get_org(self, org: str, **_: Any) -> Reply:
+        if state_key(org) != state_key(self.owner):
+            return _not_found()
+        return 200, {}, {"login": self.owner, "id": self._id("org")}
+
+    def _list_members(
+        self, org: str, query: dict[str, str], host: str, **_: Any
+    ) -> Reply:
+        if state_key(org) != state_key(self.owner):
+            return _not_found()
+        role = query.get("role", "all")
+        members = self._listing(
+            ("members", role),
+            lambda: [
+                self._user_json(m.username)
+                for m in self.members.values()
+                if role == "all" or m.role == role
+            ],
+        )
+        return self._paginate(members, query, f"/orgs/{org}/members", host)
+
+    def _get_membership(self, user: str, **_: Any) -> Reply:
+        member = self.members.get(state_key(user))
+        if member is None:
+            return _not_found()
+        return 200, {}, self._membership_json(member)
+
+    def _put_membership(self, user: str, payload: Any, **_: Any) -> Reply:
+        member = MemberState(username=user, role=payload.get("role", "member"))
+        self.members[state_key(user)] = member
+        self._listings.clear()
+        return 200, {}, self._membership_json(member)
+
+    def _delete_membership(self, user: str, **_: Any) -> Reply:
+        if self.members.pop(state_key(user), None) is None:
+            return _not_found()
+        self._listings.clear()
+        return 204, {}, None
+
+    def _list_repos(
+        self, org: str, query: dict[str, str], host: str, **_: Any
+    ) -> Reply:
+        if state_key(org) != state_key(self.owner):
+            return _not_found()
+        kind = query.get("type", "all")
+        repos = self._listing(
+            ("repos", kind),
+            lambda: [
+                self._repo_json(r)
+                for r in self.repositories.values()
+                if kind in ("all", r.visibility)
+            ],
+        )
+        return self._paginate(repos, query, f"/orgs/{org}/repos", host)
+
+    def _create_repo(self, payload: Any, **_: Any) -> Reply:
+        name = payload.get("name", "")
+        if not name or state_key(name) in self.repositories:
+            return 422, {}, {"message": "Repository creation failed."}
+        visibility = payload.get(
+            "visibility", "private" if payload.get("private") else "public"
+        )
+        repo = RepositoryState(name, payload.get("description") or "", visibility)
+        self.repositories[state_key(name)] = repo
+        self.branches[state_key(name)] = [DEFAULT_PROTECTED_BRANCH]
+        self._listings.clear()
+        return 201, {}, self._repo_json(repo)
+
+    def _get_repo(self, owner: str, repo: str, **_: Any) -> Reply:
+        found = self._lookup_repo(owner, repo)
+        if found is None:
+            return _not_found()
+        return 200, {}, self._repo_json(found)
+
+    def _update_repo(self, owner: str, repo: str, payload: Any, **_: Any) -> Reply:
+        found = self._lookup_repo(owner, repo)
+        if found is None:
+            return _not_found()
+        updated = replace(
+            found,
+            description=payload.get("description", found.description) or "",
+            visibility=payload.get("visibility", found.visibility),
+        )
+        self.repositories[state_key(repo)] = updated
+        self._listings.clear()
+        return 200, {}, self._repo_json(updated)
+
+    def _delete_repo(self, owner: str, repo: str, **_: Any) -> Reply:
+        if self._lookup_repo(owner, repo) is None:
+            return _not_found()
+        del self.repositories[state_key(repo)]
+        self.branches.pop(state_key(repo), None)
+        self._listings.clear()
+        return 204, {}, None
+
+    def _branch_json(self, repo: RepositoryState, branch: str) -> dict[str, Any]:
+        protected = repo.protection is not None and repo.protection.pattern == branch
+        return {
+            "name": branch,
+            "protected": protected,
+            "commit": {"sha": f"{self._id(f'commit:{repo.name}:{branch}'):040x}"},
+        }
+
+    def _list_branches(
+        self, owner: str, repo: str, query: dict[str, str], host: str, **_: Any
+    ) -> Reply:
+        found = self._lookup_repo(owner, repo)
+        if found is None:
+            return _not_found()
+        branches = [self._branch_json(found, b) for b in self.branches[state_key(repo)]]
+        return self._paginate(branches, query, f"/repos/{owner}/{repo}/branches", host)
+
+    def _get_branch(self, owner: str, repo: str, branch: str, **_: Any) -> Reply:
+        found = self._lookup_repo(owner, repo)
+        if found is None or branch not in self.branches[state_key(repo)]:
+            return _not_found("Branch not found")
+        return 200, {}, self._branch_json(found, branch)
+
+    def _get_protection(self, owner: str, repo: str, branch: str, **_: Any) -> Reply:
+        found = self._lookup_repo(owner, repo)
+        if found is None or branch not in self.branches[state_key(repo)]:
+            return _not_found("Branch not found")
+        if found.protection is None or found.protection.pattern != branch:
+            return _not_found("Branch not protected")
+        return 200, {}, self._protection_json(found.protection)
+
+    def _set_protection(
+        self, owner: str, repo: str, branch: str, **changes: bool
+    ) -> Reply:
+        found = self._lookup_repo(owner, repo)
+        if found is None or branch not in self.branches[state_key(repo)]:
+            return _not_found("Branch not found")
+        current = found.protection or BranchProtectionState(branch, False, False)
+        protection = replace(current, pattern=branch, **changes)
+        self.repositories[state_key(repo)] = replace(found, protection=protection)
+        return 200, {}, self._protection_json(protection)
+
+    def _put_protection(
+        self, owner: str, repo: str, branch: str, payload: Any, **_: Any
+    ) -> Reply:
+        return self._set_protection(
+            owner, repo, branch, enforce_admins=bool(payload.get("enforce_admins"))
+        )
+
+    def _delete_protection(self, owner: str, repo: str, branch: str, **_: Any) -> Reply:
+        found = self._lookup_repo(owner, repo)
+        if found is None or found.protection is None:
+            return _not_found("Branch not protected")
+        self.repositories[state_key(repo)] = replace(found, protection=None)
+        return 204, {}, None
+
+    def _enable_signatures(self, owner: str, repo: str, branch: str, **_: Any) -> Reply:
+        return self._set_protection(owner, repo, branch, require_signed_commits=True)
+
+    def _disable_signatures(
+        self, owner: str, repo: str, branch: str, **_: Any
+    ) -> Reply:
+        status, headers, _body = self._set_protection(
+            owner, repo, branch, require_signed_commits=False
+        )
+        return (204 if status == 200 else status), headers, None
+
+    def _graphql(self, payload: Any, **_: Any) -> Reply:
+        # Only the introspection-style queries used for health and rate
+        # checks are supported; everything else reports a GraphQL error.
+        query = payload.get("query", "")
+        data: dict[str, Any] = {}
+        if "rateLimit" in query:
+            limit = self.rate_limit or 5000
+            data["rateLimit"] = {
+                "limit": limit,
+                "remaining": limit - self._window_used,
+                "cost": 1,
+            }
+        if "viewer" in query:
+            data["viewer"] = {"login": "fake-admin"}
+        if not data:
+            return 200, {}, {"errors": [{"message": "Unsupported query"}]}
+        return 200, {}, {"data": data}
+
+
+def _make_handler(server: FakeGitHubServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _dispatch(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            status, headers, data = server.handle(
+                self.command, self.path, self.headers.get("Host", ""), body
+            )
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a local fake GitHub API.")
+    parser.add_argument("--owner", default="synthetic-org")
+    parser.add_argument("--repos", type=int, default=100)
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--branches", type=int, default=3)
+    parser.add_argument("--protected-ratio", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args(argv)
+
+    org = generate_org(
+        owner=args.owner,
+        repos=args.repos,
+        members=args.members,
+        branches_per_repo=args.branches,
+        protected_ratio=args.protected_ratio,
+        seed=args.seed,
+    )
+    server = FakeGitHubServer(
+        org,
+        host=args.host,
+        port=args.port,
+        latency=args.latency_ms / 1000,
+        rate_limit=args.rate_limit,
+    )
+    print(f"Fake GitHub API for '{org.owner}' listening on {server.url}")
+    print(f"  export GITHUB_API_URL={server.url}")
+    print(f"  export GITHUB_BASE_URL={server.url}/")
+    print(f"  export GITHUB_OWNER={org.owner} GITHUB_TOKEN=fake-token")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
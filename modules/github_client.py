@@ -0,0 +1,163 @@
+"""
+Minimal GitHub REST client used by the drift and validation tooling.
+
+The client only depends on the standard library so it can run inside the
+Pulumi program environment as well as in CI. HTTP is delegated to a
+pluggable transport, which keeps the client easy to point at other
+endpoints and easy to exercise in tests.
+"""
+
+import json
+import os
+import re
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+DEFAULT_API_URL = "https://api.github.com"
+
+_LINK_NEXT = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+
+@dataclass(frozen=True)
+class Request:
+    """An outgoing HTTP request."""
+
+    method: str
+    url: str
+    headers: Mapping[str, str] = field(default_factory=dict)
+    body: bytes | None = None
+
+
+@dataclass(frozen=True)
+class Response:
+    """An HTTP response with lower-cased header names."""
+
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        """Decode the response body as JSON."""
+        if not self.body:
+            return None
+        return json.loads(self.body)
+
+
+Transport = Callable[[Request], Response]
+
+
+class GitHubAPIError(Exception):
+    """Raised when the GitHub API returns an error status."""
+
+    def __init__(self, status: int, url: str, message: str = "") -> None:
+        super().__init__(f"GitHub API returned {status} for {url}: {message}")
+        self.status = status
+        self.url = url
+
+
+def urllib_transport(request: Request) -> Response:
+    """Send a request with urllib, returning error statuses instead of raising."""
+    http_request = urllib.request.Request(  # nosec B310
+        request.url,
+        data=request.body,
+        headers=dict(request.headers),
+        method=request.method,
+    )
+    try:
+        with urllib.request.urlopen(http_request) as response:  # nosec B310
+            return Response(
+                status=response.status,
+                headers={k.lower(): v for k, v in response.headers.items()},
+                body=response.read(),
+            )
+    except urllib.error.HTTPError as e:
+        return Response(
+            status=e.code,
+            headers={k.lower(): v for k, v in e.headers.items()},
+            body=e.read(),
+        )
+
+
+class GitHubClient:
+    """Thin GitHub REST client with pagination support."""
+
+    def __init__(
+        self,
+        token: str,
+        base_url: str = DEFAULT_API_URL,
+        transport: Transport | None = None,
+        per_page: int = 100,
+    ) -> None:
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        self.transport = transport if transport is not None else urllib_transport
+        self.per_page = per_page
+
+    @classmethod
+    def from_env(cls, transport: Transport | None = None) -> "GitHubClient":
+        """Build a client from GITHUB_TOKEN and the optional GITHUB_API_URL."""
+        token = os.getenv("GITHUB_TOKEN")
+        if not token:
+            raise RuntimeError("GITHUB_TOKEN must be set")
+        return cls(
+            token,
+            base_url=os.getenv("GITHUB_API_URL", DEFAULT_API_URL),
+            transport=transport,
+        )
+
+    def _url(self, endpoint: str, params: Mapping[str, Any] | None = None) -> str:
+        if endpoint.startswith(("http://", "https://")):
+            url = endpoint
+        else:
+            url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        if params:
+            url = f"{url}?{urllib.parse.urlencode(params)}"
+        return url
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Mapping[str, Any] | None = None,
+        json_body: Any = None,
+    ) -> Response:
+        """Send a request and return the raw response."""
+        headers = {
+            "Authorization": f"token {self.token}",
+            "Accept": "application/vnd.github.v3+json",
+        }
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers["Content-Type"] = "application/json"
+        return self.transport(
+            Request(method, self._url(endpoint, params), headers, body)
+        )
+
+    def get(self, endpoint: str, params: Mapping[str, Any] | None = None) -> Any:
+        """Make a GET request and return the decoded JSON body."""
+        response = self.request("GET", endpoint, params)
+        if response.status >= 400:
+            raise GitHubAPIError(
+                response.status, self._url(endpoint, params), response.body.decode()
+            )
+        return response.json()
+
+    def paginate(
+        self, endpoint: str, params: Mapping[str, Any] | None = None
+    ) -> Iterator[Any]:
+        """Yield every item of a list endpoint, following Link headers."""
+        url: str | None = self._url(
+            endpoint, {"per_page": self.per_page, **(params or {})}
+        )
+        while url:
+            response = self.request("GET", url)
+            if response.status >= 400:
+                raise GitHubAPIError(response.status, url, response.body.decode())
+            yield from response.json()
+            match = _LINK_NEXT.search(response.headers.get("link", ""))
+            url = match.group(1) if match else None
@@ -0,0 +1,266 @@
+"""
+Change-impact planning for config edits.
+
+Diffs the values file between two git revisions and maps the added,
+removed and changed entries to the URNs the program registers for them,
+so a preview can be restricted with --target and --replace instead of
+walking the whole organization. If anything else that feeds the program
+changed (code, lock file, stack config), the plan asks for a full preview.
+
+Usage:
+    python -m modules.impact --base origin/main --stack dev
+    python -m modules.impact --base origin/main --stack dev --preview
+"""
+
+import argparse
+import json
+import subprocess  # nosec B404
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+import yaml
+
+from modules.config import DEFAULT_CONFIG_PATH, load_values
+from modules.config_model import MEMBER_SOURCES_SECTION
+from modules.deploy_plan import INPUT_FILES, PROJECT_ROOT
+from modules.repository_profiles import PROFILE_KEY, PROFILES_SECTION
+from modules.resource_names import (
+    BRANCH_PROTECTION_TYPE,
+    MEMBERSHIP_TYPE,
+    REPOSITORY_TYPE,
+    branch_protection_resource_name,
+    membership_resource_name,
+    repository_resource_name,
+    urn,
+)
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+# Fields whose change makes the provider replace the resource
+_MEMBER_REPLACE_FIELDS = ("github-username",)
+_MEMBER_UPDATE_FIELDS = ("github-role",)
+_REPOSITORY_UPDATE_FIELDS = (
+    "description",
+    "visibility",
+    "topics",
+    "allow-merge-commit",
+    "allow-squash-merge",
+    "allow-rebase-merge",
+    "delete-branch-on-merge",
+)
+_PROTECTION_UPDATE_FIELDS = ("enforce-admins", "require-signed-commits")
+# Selecting other profiles can change any setting
+_REPOSITORY_PROFILE_FIELD = PROFILE_KEY
+
+
+@dataclass
+class Impact:
+    """Resources touched by a config change."""
+
+    full: bool = False
+    targets: set[str] = field(default_factory=set)
+    replace: set[str] = field(default_factory=set)
+    changes: list[dict[str, Any]] = field(default_factory=list)
+    reasons: list[str] = field(default_factory=list)
+
+    def pulumi_args(self) -> list[str]:
+        """--target/--replace arguments for pulumi preview or up."""
+        if self.full:
+            return []
+        args: list[str] = []
+        for target in sorted(self.targets):
+            args += ["--target", target]
+        for target in sorted(self.replace):
+            args += ["--replace", target]
+        return args
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "full": self.full,
+            "reasons": self.reasons,
+            "targets": sorted(self.targets),
+            "replace": sorted(self.replace),
+            "changes": self.changes,
+        }
+
+
+def _index(entries: list[dict[str, Any]] | None) -> dict[str, dict[str, Any]]:
+    return {str(entry.get("name")): entry for entry in entries or []}
+
+
+def _diff_entries(
+    old: list[dict[str, Any]] | None, new: list[dict[str, Any]] | None
+) -> tuple[list[str], list[str], dict[str, list[str]]]:
+    """Return added keys, removed keys and changed fields per key."""
+    old_index, new_index = _index(old), _index(new)
+    added = sorted(new_index.keys() - old_index.keys())
+    removed = sorted(old_index.keys() - new_index.keys())
+    changed = {}
+    for key in sorted(old_index.keys() & new_index.keys()):
+        before, after = old_index[key], new_index[key]
+        fields = sorted(
+            name
+            for name in before.keys() | after.keys()
+            if before.get(name) != after.get(name)
+        )
+        if fields:
+            changed[key] = fields
+    return added, removed, changed
+
+
+def compute_impact(
+    old_data: dict[str, Any], new_data: dict[str, Any], stack: str
+) -> Impact:
+    """Map the difference between two values files to resource URNs."""
+    if old_data.get(PROFILES_SECTION) != new_data.get(PROFILES_SECTION):
+        # A profile can apply to any number of repositories
+        return Impact(full=True, reasons=[f"{PROFILES_SECTION} changed"])
+    if old_data.get(MEMBER_SOURCES_SECTION) != new_data.get(MEMBER_SOURCES_SECTION):
+        # The members a roster yields are only known by reading it
+        return Impact(full=True, reasons=[f"{MEMBER_SOURCES_SECTION} changed"])
+    impact = Impact()
+
+    added, removed, changed = _diff_entries(
+        old_data.get("github_organization_members"),
+        new_data.get("github_organization_members"),
+    )
+    for name in added + removed:
+        impact.targets.add(urn(stack, MEMBERSHIP_TYPE, membership_resource_name(name)))
+        impact.changes.append(
+            {
+                "kind": "member",
+                "key": name,
+                "change": ADDED if name in added else REMOVED,
+            }
+        )
+    for name, fields in changed.items():
+        member_urn = urn(stack, MEMBERSHIP_TYPE, membership_resource_name(name))
+        if any(f in _MEMBER_REPLACE_FIELDS for f in fields):
+            impact.targets.add(member_urn)
+            impact.replace.add(member_urn)
+        elif any(f in _MEMBER_UPDATE_FIELDS for f in fields):
+            impact.targets.add(member_urn)
+        impact.changes.append(
+            {"kind": "member", "key": name, "change": CHANGED, "fields": fields}
+        )
+
+    added, removed, changed = _diff_entries(
+        old_data.get("github_repositories"), new_data.get("github_repositories")
+    )
+    for name in added + removed:
+        impact.targets.add(urn(stack, REPOSITORY_TYPE, repository_resource_name(name)))
+        impact.targets.add(
+            urn(stack, BRANCH_PROTECTION_TYPE, branch_protection_resource_name(name))
+        )
+        impact.changes.append(
+            {
+                "kind": "repository",
+                "key": name,
+                "change": ADDED if name in added else REMOVED,
+            }
+        )
+    for name, fields in changed.items():
+        profile_changed = _REPOSITORY_PROFILE_FIELD in fields
+        if profile_changed or any(f in _REPOSITORY_UPDATE_FIELDS for f in fields):
+            impact.targets.add(
+                urn(stack, REPOSITORY_TYPE, repository_resource_name(name))
+            )
+        if profile_changed or any(f in _PROTECTION_UPDATE_FIELDS for f in fields):
+            impact.targets.add(
+                urn(
+                    stack,
+                    BRANCH_PROTECTION_TYPE,
+                    branch_protection_resource_name(name),
+                )
+            )
+        impact.changes.append(
+            {"kind": "repository", "key": name, "change": CHANGED, "fields": fields}
+        )
+
+    # Replacing a resource outside the target set would be skipped
+    impact.targets |= impact.replace
+    return impact
+
+
+def _git(*args: str) -> str:
+    result = subprocess.run(  # nosec B603 B607
+        ["git", *args],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def load_values_at(revision: str | None, path: Path = DEFAULT_CONFIG_PATH) -> Any:
+    """Load the values file from a git revision, or the working tree if None."""
+    if revision is None:
+        return load_values(PROJECT_ROOT / path)
+    try:
+        content = _git("show", f"{revision}:{PurePosixPath(path)}")
+    except subprocess.CalledProcessError:
+        # The file did not exist at that revision
+        return {}
+    return yaml.safe_load(content) or {}
+
+
+def program_inputs_changed(
+    base: str, head: str | None, stack: str, config_path: Path = DEFAULT_CONFIG_PATH
+) -> list[str]:
+    """Changed files, other than the values file, that can alter the program."""
+    changed = _git("diff", "--name-only", base, *([head] if head else []))
+    inputs = set(INPUT_FILES) | {f"Pulumi.{stack}.yaml"}
+    return [
+        path
+        for path in changed.splitlines()
+        if path != PurePosixPath(config_path).as_posix()
+        and (path in inputs or path.startswith(("modules/", "config/")))
+    ]
+
+
+def plan_impact(base: str, head: str | None, stack: str) -> Impact:
+    """Plan the impact of moving from base to head (working tree if None)."""
+    other_inputs = program_inputs_changed(base, head, stack)
+    if other_inputs:
+        return Impact(full=True, reasons=[f"{p} changed" for p in other_inputs])
+    return compute_impact(load_values_at(base), load_values_at(head), stack)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Map a config diff to targeted Pulumi resources."
+    )
+    parser.add_argument("--base", required=True, help="Revision to compare against")
+    parser.add_argument("--head", help="Revision to compare (default: working tree)")
+    parser.add_argument("--stack", default="dev")
+    parser.add_argument("--output", help="Write the plan as JSON to this file")
+    parser.add_argument(
+        "--preview", action="store_true", help="Run a preview restricted to the plan"
+    )
+    args = parser.parse_args(argv)
+
+    impact = plan_impact(args.base, args.head, args.stack)
+    report = json.dumps(impact.to_dict(), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+    if not args.preview:
+        return 0
+    if not impact.full and not impact.targets:
+        print("No resources affected, skipping preview", file=sys.stderr)
+        return 0
+    command = ["pulumi", "preview", "--stack", args.stack, *impact.pulumi_args()]
+    result = subprocess.run(command, cwd=PROJECT_ROOT, check=False)  # nosec B603
+    return result.returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Streaming member rosters from CSV and JSON Lines exports.
+
+Large rosters, such as an HR export with tens of thousands of rows, do not
+have to be converted into the values file. They are declared as sources
+instead:
+
+    github_member_sources:
+      - path: config/hr-export.csv
+        columns:                       # member key: column in the export
+          name: Full Name
+          github-username: GitHub Login
+          github-role: GitHub Role
+        where:                         # only rows with these values
+          Status: active
+        default-role: member
+
+Rows are read one at a time, filtered by `where` (compared
+case-insensitively), and normalized into the same `Member` records as
+the values file. Names default to the username, and roles are
+lowercased. Rows without a GitHub username are skipped and counted.
+The format comes from the file suffix (`.csv`, `.jsonl`, `.ndjson`)
+unless `format` is set.
+
+`check_member_sources` streams every source once and collects bad rows
+and duplicates without keeping any rows. Only the username and name keys
+stay in memory, for duplicate detection. The program runs it before
+registering anything, then streams the sources again with `iter_members`.
+Keep sources under config/ so they count towards the deploy inputs
+digest.
+
+Usage:
+    python -m modules.member_sources
+    python -m modules.member_sources --show 5
+"""
+
+import argparse
+import csv
+import json
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from modules import config_snapshot
+from modules.config import DEFAULT_CONFIG_PATH
+from modules.config_model import (
+    ROLES,
+    ConfigError,
+    ConfigIssue,
+    Member,
+    MemberSource,
+    PlatformConfig,
+)
+from modules.org_state import state_key
+
+# Member keys a source can map to columns of its own
+MEMBER_KEYS = ("name", "github-username", "github-role", "email")
+FORMATS_BY_SUFFIX = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+# Bad rows reported at most, so a broken export cannot flood the output
+MAX_ISSUES = 50
+
+
+@dataclass(slots=True)
+class SourceStats:
+    """Row counts for one source."""
+
+    rows: int = 0
+    members: int = 0
+    filtered: int = 0
+    without_username: int = 0
+
+
+def source_format(source: MemberSource) -> str:
+    fmt = source.format or FORMATS_BY_SUFFIX.get(Path(source.path).suffix.lower())
+    if fmt is None:
+        raise ConfigError(
+            [ConfigIssue(source.path, "set format: csv or jsonl for this suffix")],
+            "member sources",
+        )
+    return fmt
+
+
+def read_rows(source: MemberSource) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield (line number, row) pairs without reading the whole file."""
+    fmt = source_format(source)
+    # utf-8-sig drops the byte order mark spreadsheet exports often start with
+    with open(source.path, newline="", encoding="utf-8-sig") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+            return
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as error:
+                row = {"": error.msg}
+            yield number, row if isinstance(row, dict) else {"": "not an object"}
+
+
+class _Skip(Exception):
+    """A row that is filtered out or has no GitHub username."""
+
+
+def normalize(source: MemberSource, row: dict[str, Any]) -> Member:
+    """Map one row to a member record.
+
+    Raises _Skip for rows the source excludes and ValueError for rows
+    that cannot be turned into a member.
+    """
+    if "" in row and len(row) == 1:
+        raise ValueError(f"invalid JSON line: {row['']}")
+    for column, expected in source.where:
+        if str(row.get(column) or "").strip().casefold() != expected.casefold():
+            raise _Skip("filtered")
+
+    columns = dict(source.columns)
+
+    def value(key: str) -> str:
+        raw = row.get(columns.get(key, key))
+        return "" if raw is None else str(raw).strip()
+
+    username = value("github-username")
+    if not username:
+        raise _Skip("without_username")
+    role = value("github-role").lower() or source.default_role
+    if role not in ROLES:
+        raise ValueError(f"'{role}' is not one of {', '.join(sorted(ROLES))}")
+    return Member(value("name") or username, username, role, value("email") or None)
+
+
+def _scan(
+    source: MemberSource, stats: SourceStats
+) -> Iterator[tuple[str, Member | str]]:
+    """Yield (location, member or error message) for every kept row."""
+    for line, row in read_rows(source):
+        stats.rows += 1
+        try:
+            member = normalize(source, row)
+        except _Skip as skipped:
+            field = str(skipped)
+            setattr(stats, field, getattr(stats, field) + 1)
+            continue
+        except ValueError as error:
+            yield f"{source.path}:{line}", str(error)
+            continue
+        stats.members += 1
+        yield f"{source.path}:{line}", member
+
+
+def iter_source_members(
+    source: MemberSource, stats: SourceStats | None = None
+) -> Iterator[Member]:
+    """Stream the members of one source, stopping at the first bad row."""
+    for location, result in _scan(source, stats or SourceStats()):
+        if isinstance(result, str):
+            raise ConfigError([ConfigIssue(location, result)], source.path)
+        yield result
+
+
+def iter_members(config: PlatformConfig) -> Iterator[Member]:
+    """Members from the values file followed by every source, streamed."""
+    yield from config.members
+    for source in config.member_sources:
+        yield from iter_source_members(source)
+
+
+def check_member_sources(config: PlatformConfig) -> dict[str, SourceStats]:
+    """Check every source row and duplicates in one pass, keeping no rows."""
+    usernames = {state_key(m.username): "values file" for m in config.members}
+    names = {m.name: "values file" for m in config.members}
+    issues: list[ConfigIssue] = []
+    stats: dict[str, SourceStats] = {}
+
+    for source in config.member_sources:
+        stats[source.path] = source_stats = SourceStats()
+        for key, _ in source.columns:
+            if key not in MEMBER_KEYS:
+                issues.append(
+                    ConfigIssue(
+                        f"{source.path}: columns.{key}",
+                        f"not one of {', '.join(MEMBER_KEYS)}",
+                    )
+                )
+        try:
+            for location, result in _scan(source, source_stats):
+                if isinstance(result, str):
+                    issues.append(ConfigIssue(location, result))
+                    continue
+                for seen, key, label in (
+                    (usernames, state_key(result.username), "username"),
+                    (names, result.name, "name"),
+                ):
+                    first = seen.setdefault(key, location)
+                    if first != location:
+                        issues.append(
+                            ConfigIssue(
+                                location,
+                                f"duplicate {label} '{key}', first at {first}",
+                            )
+                        )
+        except OSError as error:
+            issues.append(ConfigIssue(source.path, f"cannot read: {error}"))
+
+    if issues:
+        shown = issues[:MAX_ISSUES]
+        if len(issues) > MAX_ISSUES:
+            shown.append(
+                ConfigIssue("...", f"{len(issues) - MAX_ISSUES} more not shown")
+            )
+        raise ConfigError(shown, "member sources")
+    return stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Check the member sources declared in the values file."
+    )
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG_PATH))
+    parser.add_argument(
+        "--show", type=int, default=0, help="Print the first N source members"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        config = config_snapshot.load(args.config)
+        stats = check_member_sources(config)
+    except ConfigError as error:
+        print(error, file=sys.stderr)
+        return 1
+    for path, counts in stats.items():
+        print(
+            f"{path}: {counts.members} members from {counts.rows} rows "
+            f"({counts.filtered} filtered, "
+            f"{counts.without_username} without a GitHub username)"
+        )
+    sources = (m for s in config.member_sources for m in iter_source_members(s))
+    for member in islice(sources, args.show):
+        print(f"  {member.username:<24} {member.role:<7} {member.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
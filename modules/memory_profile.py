@@ -0,0 +1,250 @@
+"""
+Opt-in memory profiling for the Pulumi program.
+
+Set PLATFORM_MEMORY_PROFILE to a file path before running the program to
+find out what holds the language host's memory:
+
+    PLATFORM_MEMORY_PROFILE=build/memory.json pulumi preview --stack dev
+
+tracemalloc is started when this module is imported, and a snapshot is
+taken at each phase of the run:
+
+* `config loaded`: the values file has been loaded and validated;
+* `registered`: `program.run` has constructed every resource;
+* `outputs resolved`: the engine has answered every registration;
+* `exit`: the process is about to exit.
+
+For each phase the report has the traced and peak allocations, the peak
+RSS, and the source lines whose allocations grew the most since the
+previous phase. Each `github.*` constructor the program calls is also
+wrapped, so the memory allocated while constructing a resource is
+attributed to its type. Allocations that the SDK makes later, while
+registering, show up in the per-phase growth instead. With PLATFORM_TRACE
+also set, the constructor is wrapped for memory first, so the span
+bookkeeping of modules.tracing is not counted against the resource. The
+report is written as JSON at exit.
+
+Without the variable, `instrument` returns the callable it was given,
+and `phase` and `when_resolved` do nothing.
+
+Usage:
+    python -m modules.memory_profile build/memory.json
+"""
+
+import argparse
+import atexit
+import json
+import os
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any
+
+PROFILE_ENV = "PLATFORM_MEMORY_PROFILE"
+_STDLIB = Path(sysconfig.get_paths()["stdlib"])
+# Source lines listed per phase
+TOP_LINES = 15
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass(slots=True)
+class TypeStats:
+    """Memory allocated while constructing resources of one type."""
+
+    count: int = 0
+    allocated_bytes: int = 0
+
+    @property
+    def bytes_per_resource(self) -> int:
+        return self.allocated_bytes // self.count if self.count else 0
+
+
+@dataclass(slots=True)
+class Phase:
+    """Memory use at one point of the run."""
+
+    name: str
+    seconds: float
+    traced_mb: float
+    traced_peak_mb: float
+    rss_peak_mb: float
+    # (file:line, growth in KiB, growth in blocks) since the previous phase
+    top_growth: list[tuple[str, float, int]] = field(default_factory=list)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process, in megabytes."""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _where(frame: tracemalloc.Frame) -> str:
+    path = Path(frame.filename)
+    # Shorten to the package path, e.g. pulumi/runtime/rpc.py
+    for marker in ("site-packages", "sdks"):
+        if marker in path.parts:
+            path = Path(*path.parts[path.parts.index(marker) + 1 :])
+            break
+    else:
+        if path.is_relative_to(_STDLIB):
+            path = path.relative_to(_STDLIB)
+    return f"{path.as_posix()}:{frame.lineno}"
+
+
+class MemoryProfiler:
+    """Takes tracemalloc snapshots per phase and per resource type."""
+
+    def __init__(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.started = time.perf_counter()
+        self.phases: list[Phase] = []
+        self.types: dict[str, TypeStats] = {}
+        self._previous = self._snapshot()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    def phase(self, name: str) -> Phase:
+        snapshot = self._snapshot()
+        traced, peak = tracemalloc.get_traced_memory()
+        growth = snapshot.compare_to(self._previous, "lineno")[:TOP_LINES]
+        self._previous = snapshot
+        recorded = Phase(
+            name,
+            round(time.perf_counter() - self.started, 3),
+            round(traced / 2**20, 2),
+            round(peak / 2**20, 2),
+            round(peak_rss_mb(), 1),
+            [
+                (
+                    _where(stat.traceback[0]),
+                    round(stat.size_diff / 1024, 1),
+                    stat.count_diff,
+                )
+                for stat in growth
+                if stat.size_diff > 0
+            ],
+        )
+        with self._lock:
+            self.phases.append(recorded)
+        return recorded
+
+    def record(self, name: str, allocated: int) -> None:
+        with self._lock:
+            stats = self.types.setdefault(name, TypeStats())
+            stats.count += 1
+            stats.allocated_bytes += max(allocated, 0)
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "phases": [asdict(phase) for phase in self.phases],
+            "resource_types": {
+                name: {**asdict(stats), "bytes_per_resource": stats.bytes_per_resource}
+                for name, stats in sorted(
+                    self.types.items(), key=lambda item: -item[1].allocated_bytes
+                )
+            },
+        }
+
+    def write(self, path: str | Path) -> None:
+        """Take the exit snapshot and write the JSON report."""
+        self.phase("exit")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2))
+
+
+def _profiler_from_env() -> MemoryProfiler | None:
+    path = os.environ.get(PROFILE_ENV)
+    if not path:
+        return None
+    profiler = MemoryProfiler()
+    atexit.register(profiler.write, path)
+    return profiler
+
+
+PROFILER = _profiler_from_env()
+
+
+def phase(name: str) -> None:
+    """Snapshot memory now, if profiling is enabled."""
+    if PROFILER is not None:
+        PROFILER.phase(name)
+
+
+def when_resolved(name: str, outputs: Sequence[Any]) -> None:
+    """Snapshot memory once every output in `outputs` has resolved."""
+    profiler = PROFILER
+    if profiler is None or not outputs:
+        return
+    import pulumi
+
+    pulumi.Output.all(*outputs).apply(lambda _: profiler.phase(name))
+
+
+def instrument(fn: Callable[..., Any], name: str) -> Callable[..., Any]:
+    """Attribute the memory each call of `fn` allocates to `name`.
+
+    Returns `fn` itself when profiling is disabled.
+    """
+    profiler = PROFILER
+    if profiler is None:
+        return fn
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn(*args, **kwargs)
+        profiler.record(name, tracemalloc.get_traced_memory()[0] - before)
+        return result
+
+    return wrapper
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Summarize a report written with PLATFORM_MEMORY_PROFILE."
+    )
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--lines", type=int, default=5, help="Growth lines per phase")
+    args = parser.parse_args(argv)
+
+    report = json.loads(args.path.read_text())
+    print(
+        f"{'phase':<18} {'seconds':>8} {'traced MB':>10} {'peak MB':>8} {'RSS MB':>7}"
+    )
+    for recorded in report["phases"]:
+        print(
+            f"{recorded['name']:<18} {recorded['seconds']:>8.2f} "
+            f"{recorded['traced_mb']:>10.1f} {recorded['traced_peak_mb']:>8.1f} "
+            f"{recorded['rss_peak_mb']:>7.0f}"
+        )
+        for where, kib, blocks in recorded["top_growth"][: args.lines]:
+            print(f"    +{kib:>9.1f} KiB {blocks:>8} blocks  {where}")
+    print(f"\n{'resource type':<28} {'count':>7} {'MB':>8} {'bytes each':>11}")
+    for name, stats in report["resource_types"].items():
+        print(
+            f"{name:<28} {stats['count']:>7} "
+            f"{stats['allocated_bytes'] / 2**20:>8.1f} {stats['bytes_per_resource']:>11}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Preview several stacks at once with shared inputs.
+
+Previewing dev and prod one after the other parses the values file, opens
+the vault and starts a Python language host twice. This driver parses the
+values file and fetches the GitHub secrets once, selects every stack in a
+single LocalWorkspace, and runs the previews concurrently as inline
+programs. The merged report shows each stack's change summary next to the
+totals.
+
+Each engine still starts its own provider plugins, so GitHub API reads are
+not shared between the stacks.
+
+Usage:
+    python -m modules.multi_preview --stack dev --stack prod
+    python -m modules.multi_preview --stack dev --stack prod --json
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from modules import config_snapshot
+from modules.config import DEFAULT_CONFIG_PATH
+from modules.config_model import ConfigError, PlatformConfig
+from modules.deploy_plan import PROJECT_ROOT
+from modules.resource_names import PROJECT_NAME
+
+DEFAULT_STACKS = ("dev", "prod")
+
+
+@dataclass
+class StackPreview:
+    """The outcome of one stack's preview."""
+
+    stack: str
+    change_summary: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+    error: str | None = None
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None
+
+
+def merged_summary(previews: list[StackPreview]) -> dict[str, int]:
+    """Total the per-operation counts across every stack."""
+    totals: Counter[str] = Counter()
+    for preview in previews:
+        totals.update(preview.change_summary)
+    return dict(sorted(totals.items()))
+
+
+def run_previews(
+    stacks: list[str],
+    preview_one: Callable[[str], dict[str, int]],
+    max_workers: int | None = None,
+) -> list[StackPreview]:
+    """Run preview_one for every stack concurrently, in stack order."""
+
+    def timed(stack: str) -> StackPreview:
+        started = time.perf_counter()
+        try:
+            summary = preview_one(stack)
+        except Exception as error:
+            # One failing stack must not hide the others' results
+            return StackPreview(
+                stack, seconds=time.perf_counter() - started, error=str(error)
+            )
+        return StackPreview(stack, summary, time.perf_counter() - started)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(stacks) or 1) as pool:
+        return list(pool.map(timed, stacks))
+
+
+def login_secrets(item: dict[str, Any]) -> tuple[str, str]:
+    """The (username, password) pair the program reads from the vault item."""
+    login = item.get("login") or {}
+    return str(login.get("username") or ""), str(login.get("password") or "")
+
+
+def fetch_github_secrets(use_broker: bool) -> tuple[str, str] | None:
+    """Read the GitHub secrets item once for every stack.
+
+    Returns None without the broker, leaving each engine to invoke the
+    Bitwarden provider itself.
+    """
+    if not use_broker:
+        return None
+    from modules import bitwarden_broker
+    from modules.program import GITHUB_SECRETS_ITEM
+
+    bitwarden_broker.ensure_running()
+    return login_secrets(bitwarden_broker.get_item(GITHUB_SECRETS_ITEM))
+
+
+def engine_previewer(
+    stacks: list[str],
+    config: PlatformConfig,
+    github_secrets: tuple[str, str] | None,
+    on_output: Callable[[str], None] | None = None,
+) -> Callable[[str], dict[str, int]]:
+    """Select every stack in one workspace and return a preview function."""
+    from pulumi import automation as auto
+
+    from modules import program
+
+    def inline_program() -> None:
+        program.run(config=config, github_secrets=github_secrets)
+
+    workspace = auto.LocalWorkspace(
+        work_dir=str(PROJECT_ROOT),
+        program=inline_program,
+    )
+    # Selection writes workspace state, so it happens before the threads start
+    handles = {stack: auto.Stack.select(stack, workspace) for stack in stacks}
+
+    def preview_one(stack: str) -> dict[str, int]:
+        def prefixed(line: str) -> None:
+            if on_output is not None:
+                on_output(f"[{stack}] {line}")
+
+        result = handles[stack].preview(on_output=prefixed)
+        # Keys are OpType members; report their plain names
+        return {str(op.value): count for op, count in result.change_summary.items()}
+
+    return preview_one
+
+
+def render_table(previews: list[StackPreview]) -> str:
+    operations = sorted({op for p in previews for op in p.change_summary})
+    header = ["stack", *operations, "seconds", "status"]
+    rows = [
+        [
+            p.stack,
+            *(str(p.change_summary.get(op, 0)) for op in operations),
+            f"{p.seconds:.1f}",
+            "ok" if p.passed else "FAILED",
+        ]
+        for p in previews
+    ]
+    totals = merged_summary(previews)
+    rows.append(["total", *(str(totals.get(op, 0)) for op in operations), "", ""])
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    lines = [
+        "  ".join(cell.ljust(w) for cell, w in zip(row, widths, strict=True))
+        for row in [header, *rows]
+    ]
+    return "\n".join(line.rstrip() for line in lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Preview several stacks concurrently with shared inputs."
+    )
+    parser.add_argument(
+        "--stack",
+        action="append",
+        dest="stacks",
+        help=f"Stack to preview, repeatable (default: {', '.join(DEFAULT_STACKS)})",
+    )
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG_PATH))
+    parser.add_argument(
+        "--no-broker",
+        action="store_true",
+        help="Let each engine read the vault through the Bitwarden provider",
+    )
+    parser.add_argument("--json", action="store_true", help="Print a JSON report")
+    parser.add_argument("--quiet", action="store_true", help="Hide engine output")
+    args = parser.parse_args(argv)
+
+    import dotenv
+
+    dotenv.load_dotenv(PROJECT_ROOT / ".env")
+    stacks = list(dict.fromkeys(args.stacks or DEFAULT_STACKS))
+    try:
+        config = config_snapshot.load(args.config)
+    except ConfigError as error:
+        print(error, file=sys.stderr)
+        return 1
+    secrets = fetch_github_secrets(use_broker=not args.no_broker)
+    echo = None if args.quiet or args.json else print
+    previews = run_previews(stacks, engine_previewer(stacks, config, secrets, echo))
+
+    if args.json:
+        report = {
+            "project": PROJECT_NAME,
+            "stacks": [
+                {
+                    "stack": p.stack,
+                    "change_summary": p.change_summary,
+                    "seconds": round(p.seconds, 3),
+                    "error": p.error,
+                }
+                for p in previews
+            ],
+            "total": merged_summary(previews),
+        }
+        print(json.dumps(report, indent=2))
+    else:
+        print(render_table(previews))
+        for p in previews:
+            if p.error:
+                print(f"{p.stack}: {p.error}", file=sys.stderr)
+    return 0 if all(p.passed for p in previews) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Observed and desired state of the GitHub organization.
+
+Both sides of a drift comparison are expressed with the same record types
+and are keyed by case-folded name, since GitHub logins and repository
+names are case-insensitive.
+"""
+
+from collections.abc import Collection, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from modules.github_client import GitHubAPIError, GitHubClient
+
+DEFAULT_PROTECTED_BRANCH = "main"
+
+
+def state_key(name: str) -> str:
+    """Return the lookup key for a GitHub login or repository name."""
+    return name.casefold()
+
+
+@dataclass(frozen=True, slots=True)
+class BranchProtectionState:
+    """Branch protection settings for a single branch pattern."""
+
+    pattern: str
+    enforce_admins: bool
+    require_signed_commits: bool
+
+
+@dataclass(frozen=True, slots=True)
+class MemberState:
+    """An organization member and their role."""
+
+    username: str
+    role: str
+
+
+@dataclass(frozen=True, slots=True)
+class RepositoryState:
+    """Repository settings tracked for drift."""
+
+    name: str
+    description: str
+    visibility: str
+    protection: BranchProtectionState | None = None
+    default_branch: str = DEFAULT_PROTECTED_BRANCH
+    archived: bool = False
+    has_issues: bool = True
+    has_wiki: bool = True
+    # None when unknown, or for desired state, left at the provider default
+    topics: tuple[str, ...] | None = None
+    allow_merge_commit: bool | None = None
+    allow_squash_merge: bool | None = None
+    allow_rebase_merge: bool | None = None
+    delete_branch_on_merge: bool | None = None
+
+
+@dataclass
+class OrgState:
+    """Members and repositories of an organization, keyed by state_key."""
+
+    members: dict[str, MemberState] = field(default_factory=dict)
+    repositories: dict[str, RepositoryState] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        members: Iterable[MemberState] = (),
+        repositories: Iterable[RepositoryState] = (),
+    ) -> "OrgState":
+        """Index member and repository records by their lookup key."""
+        return cls(
+            members={state_key(m.username): m for m in members},
+            repositories={state_key(r.name): r for r in repositories},
+        )
+
+
+def _fetch_members(client: GitHubClient, owner: str) -> list[MemberState]:
+    # Listing by role returns every role in two paginated scans instead of
+    # one membership request per member.
+    return [
+        MemberState(username=member["login"], role=role)
+        for role in ("admin", "member")
+        for member in client.paginate(f"orgs/{owner}/members", {"role": role})
+    ]
+
+
+def _fetch_protection(
+    client: GitHubClient, owner: str, repo_name: str, branch: str
+) -> BranchProtectionState | None:
+    try:
+        protection = client.get(
+            f"repos/{owner}/{repo_name}/branches/{branch}/protection"
+        )
+    except GitHubAPIError as e:
+        if e.status == 404:
+            # Branch protection not configured or the branch doesn't exist
+            return None
+        raise
+    return BranchProtectionState(
+        pattern=branch,
+        enforce_admins=bool(protection.get("enforce_admins", {}).get("enabled")),
+        require_signed_commits=bool(
+            protection.get("required_signatures", {}).get("enabled")
+        ),
+    )
+
+
+def fetch_org_state(
+    client: GitHubClient,
+    owner: str,
+    include_protection: bool = True,
+    branch: str = DEFAULT_PROTECTED_BRANCH,
+    max_workers: int = 16,
+    protected_repos: Collection[str] | None = None,
+) -> OrgState:
+    """Pull members, repositories and branch protection for an organization.
+
+    Protection costs one request per repository, so callers that only
+    compare managed repositories pass their names as `protected_repos`;
+    the other repositories are listed without protection.
+    """
+    members = _fetch_members(client, owner)
+    repos = list(client.paginate(f"orgs/{owner}/repos", {"type": "all"}))
+
+    protections: list[BranchProtectionState | None] = [None] * len(repos)
+    if include_protection and repos:
+        wanted = (
+            None
+            if protected_repos is None
+            else {state_key(name) for name in protected_repos}
+        )
+
+        def protection(repo: dict[str, Any]) -> BranchProtectionState | None:
+            if wanted is not None and state_key(repo["name"]) not in wanted:
+                return None
+            return _fetch_protection(client, owner, repo["name"], branch)
+
+        # Protection has no bulk endpoint, so fan the per-repo reads out
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            protections = list(pool.map(protection, repos))
+
+    return OrgState.build(
+        members=members,
+        repositories=(
+            RepositoryState(
+                name=repo["name"],
+                description=repo.get("description") or "",
+                visibility=repo.get("visibility", "public"),
+                protection=protection,
+                default_branch=repo.get("default_branch", DEFAULT_PROTECTED_BRANCH),
+                archived=bool(repo.get("archived", False)),
+                has_issues=bool(repo.get("has_issues", True)),
+                has_wiki=bool(repo.get("has_wiki", True)),
+                topics=tuple(sorted(repo["topics"])) if "topics" in repo else None,
+                allow_merge_commit=repo.get("allow_merge_commit"),
+                allow_squash_merge=repo.get("allow_squash_merge"),
+                allow_rebase_merge=repo.get("allow_rebase_merge"),
+                delete_branch_on_merge=repo.get("delete_branch_on_merge"),
+            )
+            for repo, protection in zip(repos, protections, strict=True)
+        ),
+    )
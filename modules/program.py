@@ -0,0 +1,239 @@
+"""
+The Pulumi program that manages the platform team GitHub organization.
+
+`__main__.py` runs it for the CLI, and the Automation API workspace
+server runs it as an inline program. Resource names come from
+modules.resource_names so other tools can predict them.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import replace
+from operator import attrgetter
+from pathlib import Path
+from typing import Any
+
+import pulumi
+import pulumi_bitwarden as bitwarden
+import pulumi_github as github
+
+from modules import config_snapshot, memory_profile, tracing
+from modules.config import DEFAULT_CONFIG_PATH
+from modules.config_model import Member, PlatformConfig
+from modules.deploy_plan import DIGEST_OUTPUT, compute_digest
+from modules.member_sources import check_member_sources, iter_members
+from modules.resource_names import (
+    PROTECTED_BRANCH,
+    branch_protection_resource_name,
+    membership_resource_name,
+    repository_resource_name,
+    shard_of,
+)
+from modules.stack_index import INDEX_OUTPUT, build_index
+
+GITHUB_SECRETS_ITEM = "GitHub Secrets"
+
+# The plain SDK callables unless PLATFORM_TRACE or PLATFORM_MEMORY_PROFILE
+# is set (see modules.tracing and modules.memory_profile)
+_urn = attrgetter("urn")
+
+
+def _instrument(
+    fn: Callable[..., Any], name: str, resolved: Callable[[Any], Any]
+) -> Callable[..., Any]:
+    # Memory first, so span bookkeeping is not counted against the resource
+    return tracing.instrument(memory_profile.instrument(fn, name), name, resolved)
+
+
+_get_item_login = _instrument(
+    bitwarden.get_item_login_output, "bitwarden.get_item_login", lambda item: item
+)
+_Provider = _instrument(github.Provider, "github.Provider", _urn)
+_Membership = _instrument(github.Membership, "github.Membership", _urn)
+_Repository = _instrument(github.Repository, "github.Repository", _urn)
+_BranchProtection = _instrument(
+    github.BranchProtection, "github.BranchProtection", _urn
+)
+
+
+def configure_provider(
+    github_secrets: tuple[str, str] | None = None,
+) -> github.Provider:
+    """Create the GitHub provider from the Bitwarden secrets item.
+
+    Callers running several stacks in one process can pass the item's
+    (username, password) pair to skip the per-stack vault invoke.
+    """
+    if github_secrets is None:
+        item = _get_item_login(search=GITHUB_SECRETS_ITEM)
+        owner, token = item.username, item.password
+    else:
+        owner, token = github_secrets[0], pulumi.Output.secret(github_secrets[1])
+
+    # Explicitly configure the provider with those values
+    provider: github.Provider = _Provider(
+        "custom-github-provider", owner=owner, token=token
+    )
+    return provider
+
+
+def register_members(
+    members: Iterable[Member],
+) -> list[tuple[Member, github.Membership]]:
+    """Ensure platform team membership.
+
+    `members` can be a stream, such as a roster read by
+    modules.member_sources; each member is registered as it is read.
+    """
+    memberships = []
+    for member in members:
+        # Create a GitHub team member
+        membership = _Membership(
+            membership_resource_name(member.name),
+            username=member.username,
+            role=member.role,
+        )
+        memberships.append((member, membership))
+    return memberships
+
+
+def register_repositories(
+    config: PlatformConfig,
+) -> list[tuple[github.Repository, github.BranchProtection]]:
+    """Add repositories and their configuration."""
+    registered = []
+    for repo in config.repositories:
+        # Settings objects are shared by every repository with the same profiles
+        settings = repo.settings
+
+        # Create a GitHub repository
+        repository = _Repository(
+            repository_resource_name(repo.name),
+            name=repo.name,
+            description=repo.description,
+            visibility=settings.visibility,
+            topics=list(settings.topics) if settings.topics is not None else None,
+            allow_merge_commit=settings.allow_merge_commit,
+            allow_squash_merge=settings.allow_squash_merge,
+            allow_rebase_merge=settings.allow_rebase_merge,
+            delete_branch_on_merge=settings.delete_branch_on_merge,
+        )
+
+        # Create a branch protection rule, by default enforcing signed commits
+        branch_protection = _BranchProtection(
+            branch_protection_resource_name(repo.name),
+            repository_id=repo.name,
+            pattern=PROTECTED_BRANCH,
+            enforce_admins=settings.enforce_admins,
+            require_signed_commits=settings.require_signed_commits,
+        )
+        registered.append((repository, branch_protection))
+    return registered
+
+
+def shard_members(
+    members: Iterable[Member], shards: int, index: int
+) -> Iterator[Member]:
+    """Stream the members that belong to one shard stack."""
+    # Keys match the resource names the state analyzer shards by
+    for member in members:
+        if shard_of(membership_resource_name(member.name), shards) == index:
+            yield member
+
+
+def select_shard(config: PlatformConfig, shards: int, index: int) -> PlatformConfig:
+    """Keep the members and repositories that belong to one shard stack."""
+    return replace(
+        config,
+        members=tuple(shard_members(config.members, shards, index)),
+        repositories=tuple(
+            repo
+            for repo in config.repositories
+            if shard_of(repository_resource_name(repo.name), shards) == index
+        ),
+    )
+
+
+def export_index(
+    config: PlatformConfig,
+    memberships: list[tuple[Member, github.Membership]],
+    repositories: list[tuple[github.Repository, github.BranchProtection]],
+) -> None:
+    """Export the managed entity index with the provider IDs."""
+    members = [member for member, _ in memberships]
+
+    def index(ids: list[str]) -> dict[str, Any]:
+        member_ids = ids[: len(members)]
+        repo_ids = ids[len(members) :: 2]
+        protection_ids = ids[len(members) + 1 :: 2]
+        return build_index(
+            [
+                (member.username, member.name, member.role, resource_id)
+                for member, resource_id in zip(members, member_ids, strict=True)
+            ],
+            [
+                (repo.name, resource_id)
+                for repo, resource_id in zip(config.repositories, repo_ids, strict=True)
+            ],
+            [
+                (repo.name, resource_id)
+                for repo, resource_id in zip(
+                    config.repositories, protection_ids, strict=True
+                )
+            ],
+        )
+
+    ids = [membership.id for _, membership in memberships]
+    for repository, protection in repositories:
+        ids += [repository.id, protection.id]
+    pulumi.export(INDEX_OUTPUT, pulumi.Output.all(*ids).apply(index))
+
+
+def run(
+    config_path: str | Path = DEFAULT_CONFIG_PATH,
+    config: PlatformConfig | None = None,
+    github_secrets: tuple[str, str] | None = None,
+) -> None:
+    """Register every resource for the current stack.
+
+    `config` replaces reading the values file, so multi-stack drivers can
+    parse and validate it once.
+    """
+    with tracing.span("program.run"):
+        with tracing.span("configure_provider"):
+            configure_provider(github_secrets)
+
+        # Load the compiled snapshot or validate the values file, failing
+        # before any registration
+        if config is None:
+            with tracing.span("config.load", path=str(config_path)):
+                config = config_snapshot.load(config_path)
+        if config.member_sources:
+            # First pass over the rosters: every row is checked before registering
+            with tracing.span("member_sources.check"):
+                check_member_sources(config)
+        memory_profile.phase("config loaded")
+
+        # Second pass: members are registered as the rosters are read
+        members: Iterable[Member] = iter_members(config)
+        stack_config = pulumi.Config()
+        shards = stack_config.get_int("shardCount")
+        if shards:
+            index = stack_config.get_int("shardIndex") or 0
+            members = shard_members(members, shards, index)
+            config = select_shard(config, shards, index)
+        with tracing.span("register_members"):
+            memberships = register_members(members)
+        with tracing.span("register_repositories"):
+            repositories = register_repositories(config)
+        memory_profile.phase("registered")
+        memory_profile.when_resolved(
+            "outputs resolved",
+            [membership.urn for _, membership in memberships]
+            + [resource.urn for pair in repositories for resource in pair],
+        )
+        with tracing.span("export_index"):
+            export_index(config, memberships, repositories)
+
+        # Record what was deployed so unchanged pipelines can skip the engine
+        with tracing.span("deploy_inputs_digest"):
+            pulumi.export(DIGEST_OUTPUT, compute_digest(stack=pulumi.get_stack()))
@@ -0,0 +1,161 @@
+"""
+Shared repository settings declared once as named profiles.
+
+The values file can declare profiles under `github_repository_profiles`
+and select them per repository with `profile`. A profile may extend
+another, and the repository entry itself can override any setting:
+
+    github_repository_profiles:
+      default:
+        delete-branch-on-merge: true
+      service:
+        topics: [platform, service]
+        allow-merge-commit: false
+      internal-service:
+        extends: service
+        visibility: private
+
+    github_repositories:
+      - name: platform-core
+        profile: internal-service
+        topics: [platform, core]
+
+Settings are applied in this order: the built-in defaults (public, signed
+commits and admin enforcement on main), the `default` profile if one is
+declared, the selected profiles in order, then the entry's own keys.
+
+`ProfileResolver` memoizes every profile and override combination, and
+combinations that resolve to equal settings share one immutable
+`RepositorySettings` object, so memory grows with the number of distinct
+combinations rather than with the number of repositories.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+PROFILES_SECTION = "github_repository_profiles"
+DEFAULT_PROFILE = "default"
+EXTENDS_KEY = "extends"
+PROFILE_KEY = "profile"
+VISIBILITIES = ("public", "private", "internal")
+
+# Keys a profile or repository entry may set, with their value types
+SETTING_TYPES: dict[str, type] = {
+    "visibility": str,
+    "topics": list,
+    "allow-merge-commit": bool,
+    "allow-squash-merge": bool,
+    "allow-rebase-merge": bool,
+    "delete-branch-on-merge": bool,
+    "enforce-admins": bool,
+    "require-signed-commits": bool,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class RepositorySettings:
+    """Resolved settings for a repository and its branch protection.
+
+    None means the program leaves the provider default in place.
+    """
+
+    visibility: str = "public"
+    topics: tuple[str, ...] | None = None
+    allow_merge_commit: bool | None = None
+    allow_squash_merge: bool | None = None
+    allow_rebase_merge: bool | None = None
+    delete_branch_on_merge: bool | None = None
+    enforce_admins: bool = True
+    require_signed_commits: bool = True
+
+    @classmethod
+    def from_settings(cls, settings: Mapping[str, Any]) -> "RepositorySettings":
+        """Build from values file keys such as `allow-merge-commit`."""
+        fields: dict[str, Any] = {
+            key.replace("-", "_"): tuple(value) if isinstance(value, list) else value
+            for key, value in settings.items()
+        }
+        return cls(**fields)
+
+
+DEFAULT_SETTINGS = RepositorySettings()
+
+
+class ProfileError(ValueError):
+    """Raised for unknown profiles and `extends` cycles."""
+
+
+def _freeze(settings: Mapping[str, Any]) -> tuple[tuple[str, Any], ...]:
+    return tuple(
+        sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in settings.items()
+        )
+    )
+
+
+class ProfileResolver:
+    """Expands profile selections into shared RepositorySettings."""
+
+    def __init__(self, profiles: Mapping[str, Mapping[str, Any]] | None = None):
+        self._profiles = dict(profiles or {})
+        self._flattened: dict[str, dict[str, Any]] = {}
+        self._resolved: dict[Any, RepositorySettings] = {}
+        self._interned: dict[RepositorySettings, RepositorySettings] = {
+            DEFAULT_SETTINGS: DEFAULT_SETTINGS
+        }
+
+    @property
+    def profiles(self) -> list[str]:
+        return list(self._profiles)
+
+    def flatten(self, name: str, chain: tuple[str, ...] = ()) -> dict[str, Any]:
+        """A profile's settings with everything it extends applied first."""
+        flattened = self._flattened.get(name)
+        if flattened is not None:
+            return flattened
+        if name in chain:
+            cycle = " -> ".join((*chain, name))
+            raise ProfileError(f"profile '{name}' extends itself: {cycle}")
+        if name not in self._profiles:
+            raise ProfileError(f"unknown profile '{name}'")
+        profile = self._profiles[name]
+        parent = profile.get(EXTENDS_KEY)
+        flattened = dict(self.flatten(parent, (*chain, name))) if parent else {}
+        flattened.update(
+            (key, value) for key, value in profile.items() if key != EXTENDS_KEY
+        )
+        self._flattened[name] = flattened
+        return flattened
+
+    def resolve(
+        self,
+        profiles: tuple[str, ...] = (),
+        overrides: Mapping[str, Any] | None = None,
+    ) -> RepositorySettings:
+        """Settings for a repository selecting `profiles` with `overrides`."""
+        overrides = overrides or {}
+        key = (profiles, _freeze(overrides))
+        settings = self._resolved.get(key)
+        if settings is not None:
+            return settings
+
+        merged: dict[str, Any] = {}
+        if DEFAULT_PROFILE in self._profiles:
+            merged.update(self.flatten(DEFAULT_PROFILE))
+        for name in profiles:
+            merged.update(self.flatten(name))
+        merged.update(overrides)
+        resolved = RepositorySettings.from_settings(merged)
+        # Different combinations that come out equal share one object
+        settings = self._interned.setdefault(resolved, resolved)
+        self._resolved[key] = settings
+        return settings
+
+    def stats(self) -> dict[str, int]:
+        """Distinct combinations resolved and distinct settings objects."""
+        return {
+            "combinations": len(self._resolved),
+            "settings": len(self._interned),
+        }
@@ -0,0 +1,37 @@
+"""
+Resource names and types registered by the Pulumi program.
+
+Kept free of Pulumi imports so planning tools can predict URNs without
+loading the SDKs.
+"""
+
+import zlib
+
+PROJECT_NAME = "platform-team-admin"
+PROTECTED_BRANCH = "main"
+
+MEMBERSHIP_TYPE = "github:index/membership:Membership"
+REPOSITORY_TYPE = "github:index/repository:Repository"
+BRANCH_PROTECTION_TYPE = "github:index/branchProtection:BranchProtection"
+
+
+def membership_resource_name(member_name: str) -> str:
+    return f"github_membership_for_{member_name}"
+
+
+def repository_resource_name(repo_name: str) -> str:
+    return f"{repo_name}"
+
+
+def branch_protection_resource_name(repo_name: str) -> str:
+    return f"{repo_name}-{PROTECTED_BRANCH}-branch-protection"
+
+
+def urn(stack: str, resource_type: str, name: str, project: str = PROJECT_NAME) -> str:
+    """URN of a top-level resource registered without a parent."""
+    return f"urn:pulumi:{stack}::{project}::{resource_type}::{name}"
+
+
+def shard_of(key: str, shards: int) -> int:
+    """Stable shard index for a member or repository name."""
+    return zlib.crc32(key.encode()) % shards
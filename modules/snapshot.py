@@ -0,0 +1,330 @@
+"""
+Compact snapshots of observed organization state, with streaming diffs.
+
+A snapshot holds one table per entity kind. Rows are sorted by key and
+stored in zlib-compressed column blocks, and a block index at the end of
+the file records the key range and location of every block. Diffing two
+snapshots merge-joins them block by block, so memory stays bounded by the
+block size rather than the organization size.
+
+Usage:
+    python -m modules.snapshot capture --output snapshots/org.snap
+    python -m modules.snapshot diff old.snap new.snap --output changes.jsonl
+"""
+
+import argparse
+import bisect
+import json
+import os
+import struct
+import sys
+import zlib
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from modules.github_client import GitHubClient
+from modules.org_state import (
+    BranchProtectionState,
+    MemberState,
+    OrgState,
+    RepositoryState,
+    fetch_org_state,
+)
+
+# The last byte is the format version, bumped whenever the columns change
+MAGIC = b"ORGSNAP2"
+BLOCK_ROWS = 1024
+_FOOTER = struct.Struct("<QI8s")
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+Row = tuple[Any, ...]
+
+
+class SnapshotFormatError(ValueError):
+    """A snapshot written with another format version."""
+
+
+@dataclass(frozen=True)
+class Table:
+    """Column layout of one entity kind in a snapshot."""
+
+    name: str
+    columns: tuple[str, ...]
+    to_row: Callable[[Any], Row]
+
+
+def _repository_row(repo: RepositoryState) -> Row:
+    protection = repo.protection
+    return (
+        repo.name,
+        repo.description,
+        repo.visibility,
+        repo.default_branch,
+        repo.archived,
+        repo.has_issues,
+        repo.has_wiki,
+        list(repo.topics) if repo.topics is not None else None,
+        repo.allow_merge_commit,
+        repo.allow_squash_merge,
+        repo.allow_rebase_merge,
+        repo.delete_branch_on_merge,
+        protection.pattern if protection else None,
+        protection.enforce_admins if protection else None,
+        protection.require_signed_commits if protection else None,
+    )
+
+
+def _member_row(member: MemberState) -> Row:
+    return (member.username, member.role)
+
+
+TABLES = (
+    Table("members", ("username", "role"), _member_row),
+    Table(
+        "repositories",
+        (
+            "name",
+            "description",
+            "visibility",
+            "default_branch",
+            "archived",
+            "has_issues",
+            "has_wiki",
+            "topics",
+            "allow_merge_commit",
+            "allow_squash_merge",
+            "allow_rebase_merge",
+            "delete_branch_on_merge",
+            "protection.pattern",
+            "protection.enforce_admins",
+            "protection.require_signed_commits",
+        ),
+        _repository_row,
+    ),
+)
+
+
+def write_snapshot(
+    state: OrgState, path: str | Path, metadata: dict[str, Any] | None = None
+) -> None:
+    """Serialize organization state into a snapshot file."""
+    sources: dict[str, dict[str, Any]] = {
+        "members": state.members,
+        "repositories": state.repositories,
+    }
+    index: dict[str, Any] = {"metadata": metadata or {}, "tables": {}}
+    tmp_path = Path(f"{path}.tmp")
+
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        for table in TABLES:
+            records = sources[table.name]
+            keys = sorted(records)
+            blocks = []
+            for start in range(0, len(keys), BLOCK_ROWS):
+                block_keys = keys[start : start + BLOCK_ROWS]
+                rows = [table.to_row(records[key]) for key in block_keys]
+                # Store the block column-wise so similar values compress together
+                columns = [block_keys, *(list(col) for col in zip(*rows, strict=True))]
+                blob = zlib.compress(json.dumps(columns).encode())
+                blocks.append(
+                    [block_keys[0], block_keys[-1], f.tell(), len(blob), len(rows)]
+                )
+                f.write(blob)
+            index["tables"][table.name] = {
+                "columns": list(table.columns),
+                "rows": len(keys),
+                "blocks": blocks,
+            }
+        encoded = json.dumps(index).encode()
+        index_offset = f.tell()
+        f.write(encoded)
+        f.write(_FOOTER.pack(index_offset, len(encoded), MAGIC))
+
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """Read access to a snapshot file, decoding one block at a time."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file: IO[bytes] = open(self.path, "rb")
+        self._file.seek(-_FOOTER.size, os.SEEK_END)
+        index_offset, index_length, magic = _FOOTER.unpack(
+            self._file.read(_FOOTER.size)
+        )
+        if magic[:-1] == MAGIC[:-1] and magic != MAGIC:
+            raise SnapshotFormatError(
+                f"{self.path} has snapshot format {magic[-1:].decode()}, "
+                f"expected {MAGIC[-1:].decode()}"
+            )
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not an org snapshot")
+        self._file.seek(index_offset)
+        index = json.loads(self._file.read(index_length))
+        self.metadata: dict[str, Any] = index["metadata"]
+        self.tables: dict[str, dict[str, Any]] = index["tables"]
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def columns(self, table: str) -> list[str]:
+        return list(self.tables[table]["columns"])
+
+    def _read_block(self, block: list[Any]) -> list[tuple[str, Row]]:
+        _first, _last, offset, length, _rows = block
+        self._file.seek(offset)
+        keys, *columns = json.loads(zlib.decompress(self._file.read(length)))
+        return list(zip(keys, zip(*columns, strict=True), strict=True))
+
+    def rows(self, table: str) -> Iterator[tuple[str, Row]]:
+        """Yield (key, row) pairs in key order."""
+        for block in self.tables[table]["blocks"]:
+            yield from self._read_block(block)
+
+    def lookup(self, table: str, key: str) -> Row | None:
+        """Find a single row through the block index."""
+        blocks = self.tables[table]["blocks"]
+        position = bisect.bisect_right([b[0] for b in blocks], key) - 1
+        if position < 0 or key > blocks[position][1]:
+            return None
+        for row_key, row in self._read_block(blocks[position]):
+            if row_key == key:
+                return row
+        return None
+
+
+def read_state(path: str | Path) -> OrgState:
+    """Load a whole snapshot back into an OrgState."""
+    with Snapshot(path) as snap:
+        members = [MemberState(*row) for _key, row in snap.rows("members")]
+        repositories = []
+        for _key, row in snap.rows("repositories"):
+            *settings, pattern, enforce_admins, signed = row
+            protection = None
+            if pattern is not None:
+                protection = BranchProtectionState(pattern, enforce_admins, signed)
+            (
+                name,
+                description,
+                visibility,
+                default_branch,
+                archived,
+                has_issues,
+                has_wiki,
+                topics,
+                *merge_settings,
+            ) = settings
+            repositories.append(
+                RepositoryState(
+                    name,
+                    description,
+                    visibility,
+                    protection,
+                    default_branch,
+                    archived,
+                    has_issues,
+                    has_wiki,
+                    tuple(topics) if topics is not None else None,
+                    # allow_*_merge and delete_branch_on_merge, in column order
+                    *merge_settings,
+                )
+            )
+    return OrgState.build(members, repositories)
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> Iterator[dict[str, Any]]:
+    """Stream the differences between two snapshots as change records."""
+    for table in TABLES:
+        columns = new.columns(table.name)
+        if old.columns(table.name) != columns:
+            raise ValueError(f"Snapshot column layout differs for {table.name}")
+        old_rows, new_rows = old.rows(table.name), new.rows(table.name)
+        old_item, new_item = next(old_rows, None), next(new_rows, None)
+        while old_item is not None or new_item is not None:
+            if new_item is None or (old_item is not None and old_item[0] < new_item[0]):
+                assert old_item is not None
+                yield {"table": table.name, "key": old_item[0], "change": REMOVED}
+                old_item = next(old_rows, None)
+            elif old_item is None or new_item[0] < old_item[0]:
+                yield {"table": table.name, "key": new_item[0], "change": ADDED}
+                new_item = next(new_rows, None)
+            else:
+                key, before = old_item
+                after = new_item[1]
+                if before != after:
+                    yield {
+                        "table": table.name,
+                        "key": key,
+                        "change": CHANGED,
+                        "fields": {
+                            column: {"old": was, "new": now}
+                            for column, was, now in zip(
+                                columns, before, after, strict=True
+                            )
+                            if was != now
+                        },
+                    }
+                old_item, new_item = next(old_rows, None), next(new_rows, None)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Capture and diff org snapshots.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    capture = commands.add_parser("capture", help="Snapshot live org state")
+    capture.add_argument("--owner", default=os.getenv("GITHUB_OWNER"))
+    capture.add_argument("--output", required=True)
+
+    diff = commands.add_parser("diff", help="Stream changes between snapshots")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--output", help="Write JSON Lines changes to this file")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "capture":
+        if not args.owner:
+            parser.error("--owner or GITHUB_OWNER is required")
+        state = fetch_org_state(GitHubClient.from_env(), args.owner)
+        write_snapshot(state, args.output, metadata={"owner": args.owner})
+        print(
+            f"Captured {len(state.members)} members and "
+            f"{len(state.repositories)} repositories to {args.output}"
+        )
+        return 0
+
+    try:
+        Snapshot(args.old).close()
+    except SnapshotFormatError as error:
+        # Nothing to compare against until a snapshot in this format exists
+        print(f"Skipping diff: {error}", file=sys.stderr)
+        return 0
+    counts: dict[str, int] = {ADDED: 0, REMOVED: 0, CHANGED: 0}
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        with Snapshot(args.old) as old, Snapshot(args.new) as new:
+            for change in diff_snapshots(old, new):
+                counts[change["change"]] += 1
+                out.write(json.dumps(change) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Snapshot changes: {json.dumps(counts)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Versioned index of the entities a stack manages.
+
+The program exports `managed_index`, a compact document listing every
+membership, repository and branch protection it registered together with
+the provider IDs:
+
+    {
+      "version": 1,
+      "members": {"octocat": ["Mona", "admin", "my-org:octocat"]},
+      "repositories": {"platform-team-admin": ["platform-team-admin", "..."]},
+      "protections": {"platform-team-admin": "BPR_kwDO..."}
+    }
+
+Member entries are [name, role, id] keyed by GitHub username, repository
+entries [name, id] keyed by repository name, and protections are keyed
+like their repository. Keys are stored lowercased, as GitHub compares
+them. `StackIndex` parses the document on first use and answers lookups
+with dict access, so tools can find out what is managed without listing
+the organization.
+
+Usage:
+    pulumi stack output --json > stack-outputs.json
+    python -m modules.stack_index stack-outputs.json --require-entities
+    python -m modules.stack_index --stack dev
+"""
+
+import argparse
+import json
+import subprocess  # nosec B404
+import sys
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+from modules.deploy_plan import PROJECT_ROOT
+from modules.org_state import state_key
+from modules.resource_names import (
+    BRANCH_PROTECTION_TYPE,
+    MEMBERSHIP_TYPE,
+    REPOSITORY_TYPE,
+    branch_protection_resource_name,
+    membership_resource_name,
+    repository_resource_name,
+    urn,
+)
+
+INDEX_OUTPUT = "managed_index"
+INDEX_VERSION = 1
+
+
+class StackIndexError(ValueError):
+    """Raised when the index is missing or has an unsupported version."""
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedMember:
+    """A managed organization membership."""
+
+    username: str
+    name: str
+    role: str
+    id: str
+
+
+def build_index(
+    members: list[tuple[str, str, str, str]],
+    repositories: list[tuple[str, str]],
+    protections: list[tuple[str, str]],
+) -> dict[str, Any]:
+    """Build the index document.
+
+    Members are (username, name, role, id) tuples; repositories and
+    protections are (repository name, id) pairs.
+    """
+    return {
+        "version": INDEX_VERSION,
+        "members": {
+            state_key(username): [name, role, resource_id]
+            for username, name, role, resource_id in members
+        },
+        "repositories": {
+            state_key(name): [name, resource_id] for name, resource_id in repositories
+        },
+        "protections": {
+            state_key(name): resource_id for name, resource_id in protections
+        },
+    }
+
+
+class StackIndex:
+    """Lazy reader for the managed index of one stack."""
+
+    def __init__(self, raw: str | dict[str, Any]) -> None:
+        self._raw = raw
+
+    @classmethod
+    def from_outputs(cls, outputs: dict[str, Any]) -> "StackIndex":
+        """Read the index from `pulumi stack output --json` output."""
+        if INDEX_OUTPUT not in outputs:
+            raise StackIndexError(f"Stack outputs have no '{INDEX_OUTPUT}'")
+        return cls(outputs[INDEX_OUTPUT])
+
+    @classmethod
+    def load(cls, path: str | Path) -> "StackIndex":
+        """Read the index from a saved stack outputs file."""
+        with open(path) as f:
+            return cls.from_outputs(json.load(f))
+
+    @classmethod
+    def from_stack(cls, stack: str) -> "StackIndex":
+        """Read the index of a deployed stack."""
+        try:
+            result = subprocess.run(  # nosec B603 B607
+                ["pulumi", "stack", "output", INDEX_OUTPUT, "--json", "--stack", stack],
+                cwd=PROJECT_ROOT,
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+        except OSError as error:
+            raise StackIndexError(f"Could not run pulumi: {error}") from error
+        if result.returncode != 0:
+            raise StackIndexError(
+                f"Could not read '{INDEX_OUTPUT}' from stack {stack}: "
+                f"{result.stderr.strip()}"
+            )
+        return cls(result.stdout)
+
+    @cached_property
+    def _document(self) -> dict[str, Any]:
+        document = json.loads(self._raw) if isinstance(self._raw, str) else self._raw
+        version = document.get("version") if isinstance(document, dict) else None
+        if version != INDEX_VERSION:
+            raise StackIndexError(
+                f"Unsupported {INDEX_OUTPUT} version {version!r}, "
+                f"expected {INDEX_VERSION}"
+            )
+        return document
+
+    @property
+    def version(self) -> int:
+        return int(self._document["version"])
+
+    @property
+    def _members(self) -> dict[str, list[str]]:
+        members: dict[str, list[str]] = self._document.get("members", {})
+        return members
+
+    @property
+    def _repositories(self) -> dict[str, list[str]]:
+        repositories: dict[str, list[str]] = self._document.get("repositories", {})
+        return repositories
+
+    @property
+    def _protections(self) -> dict[str, str]:
+        protections: dict[str, str] = self._document.get("protections", {})
+        return protections
+
+    def has_member(self, username: str) -> bool:
+        return state_key(username) in self._members
+
+    def member(self, username: str) -> IndexedMember | None:
+        entry = self._members.get(state_key(username))
+        if entry is None:
+            return None
+        name, role, resource_id = entry
+        return IndexedMember(state_key(username), name, role, resource_id)
+
+    def has_repository(self, name: str) -> bool:
+        return state_key(name) in self._repositories
+
+    def repository_id(self, name: str) -> str | None:
+        entry = self._repositories.get(state_key(name))
+        return None if entry is None else entry[1]
+
+    def protection_id(self, repository: str) -> str | None:
+        return self._protections.get(state_key(repository))
+
+    def counts(self) -> dict[str, int]:
+        return {
+            "members": len(self._members),
+            "repositories": len(self._repositories),
+            "protections": len(self._protections),
+        }
+
+    def urns(self, stack: str) -> set[str]:
+        """URNs of every indexed resource."""
+        urns = {
+            urn(stack, MEMBERSHIP_TYPE, membership_resource_name(name))
+            for name, _, _ in self._members.values()
+        }
+        urns.update(
+            urn(stack, REPOSITORY_TYPE, repository_resource_name(name))
+            for name, _ in self._repositories.values()
+        )
+        urns.update(
+            urn(
+                stack,
+                BRANCH_PROTECTION_TYPE,
+                branch_protection_resource_name(self._repositories[key][0]),
+            )
+            for key in self._protections
+            if key in self._repositories
+        )
+        return urns
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Summarize the managed entity index of a stack."
+    )
+    parser.add_argument("outputs", nargs="?", help="Saved stack outputs JSON file")
+    parser.add_argument("--stack", default="dev", help="Stack to read if no file")
+    parser.add_argument(
+        "--require-entities",
+        action="store_true",
+        help="Fail if the index lists no members or repositories",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        index = (
+            StackIndex.load(args.outputs)
+            if args.outputs
+            else StackIndex.from_stack(args.stack)
+        )
+        counts = index.counts()
+    except StackIndexError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    print(f"{INDEX_OUTPUT} v{index.version}")
+    for kind, count in counts.items():
+        print(f"  {kind:<13} {count}")
+    if args.require_entities and not counts["members"] and not counts["repositories"]:
+        print("No members or repositories are managed", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,462 @@
+"""
+Size analysis, compaction and sharding of exported stack checkpoints.
+
+Works on the output of `pulumi stack export`. The checkpoint is parsed
+incrementally, one resource at a time, so a stack with tens of thousands
+of resources never has to be held in memory as a single document.
+
+* analyze: bytes and counts per resource type, and the properties that
+  account for most of those bytes.
+* compact: drop pending operations, resources pending deletion and
+  resources whose parent or provider no longer exists.
+* shard: split the resources into N shard stacks, keeping a repository
+  and its branch protection together and copying providers into each
+  shard. The program registers the matching subset when the stack sets
+  `shardCount` and `shardIndex` config values.
+
+Usage:
+    pulumi stack export --stack dev > state.json
+    python -m modules.state_analyzer analyze state.json
+    python -m modules.state_analyzer compact state.json --output compacted.json
+    python -m modules.state_analyzer shard state.json --shards 4 --output-dir shards/
+
+Compacted and sharded checkpoints are loaded with `pulumi stack import`.
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+from modules.resource_names import (
+    BRANCH_PROTECTION_TYPE,
+    MEMBERSHIP_TYPE,
+    PROTECTED_BRANCH,
+    REPOSITORY_TYPE,
+    shard_of,
+)
+
+CHUNK_SIZE = 1 << 20
+STACK_TYPE = "pulumi:pulumi:Stack"
+
+
+class _StreamParser:
+    """Pull-style reader for one JSON document, decoding a value at a time."""
+
+    def __init__(self, stream: IO[str], chunk_size: int = CHUNK_SIZE) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # Drop what has been consumed before growing the buffer
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of checkpoint")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self._pos}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Most likely the value continues past the buffered text
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may be cut short
+            if end == len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def items(self) -> Iterator[str]:
+        """Yield object keys, leaving the parser positioned at each value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def elements(self) -> Iterator[Any]:
+        """Yield the decoded elements of an array one by one."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+@dataclass
+class Checkpoint:
+    """The non-resource parts of an exported checkpoint.
+
+    Fields that follow the resources (or the deployment) are kept apart, so
+    a rewritten checkpoint has them in their original order.
+    """
+
+    version: Any = 3
+    header: dict[str, Any] = field(default_factory=dict)
+    deployment: dict[str, Any] = field(default_factory=dict)
+    pending_operations: list[Any] = field(default_factory=list)
+    deployment_tail: dict[str, Any] = field(default_factory=dict)
+    header_tail: dict[str, Any] = field(default_factory=dict)
+
+
+def iter_checkpoint(
+    stream: IO[str], checkpoint: Checkpoint, chunk_size: int = CHUNK_SIZE
+) -> Iterator[dict[str, Any]]:
+    """Yield resources from an exported checkpoint while filling `checkpoint`.
+
+    Top-level fields and deployment fields other than the resources are
+    stored on `checkpoint` as they are passed; fields after the resources
+    are only complete once the iterator is exhausted.
+    """
+    parser = _StreamParser(stream, chunk_size)
+    header = checkpoint.header
+    for key in parser.items():
+        if key != "deployment":
+            value = parser.value()
+            if key == "version":
+                checkpoint.version = value
+            else:
+                header[key] = value
+            continue
+        deployment = checkpoint.deployment
+        for section in parser.items():
+            if section == "resources":
+                yield from parser.elements()
+                deployment = checkpoint.deployment_tail
+            elif section == "pending_operations":
+                checkpoint.pending_operations.extend(parser.elements())
+            else:
+                deployment[section] = parser.value()
+        header = checkpoint.header_tail
+
+
+def read_checkpoint(source: Path) -> Checkpoint:
+    """Read every non-resource field of a checkpoint file."""
+    checkpoint = Checkpoint()
+    with open(source) as f:
+        for _resource in iter_checkpoint(f, checkpoint):
+            pass
+    return checkpoint
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":")))
+
+
+def _provider_urn(reference: str) -> str:
+    # Provider references are "<urn>::<id>"
+    return reference.rsplit("::", 1)[0]
+
+
+@dataclass
+class TypeStats:
+    count: int = 0
+    bytes: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+
+
+@dataclass
+class StateReport:
+    """Size breakdown of a checkpoint."""
+
+    resources: int = 0
+    bytes: int = 0
+    types: dict[str, TypeStats] = field(default_factory=lambda: defaultdict(TypeStats))
+    properties: Counter[tuple[str, str]] = field(default_factory=Counter)
+    pending_operations: int = 0
+    pending_delete: list[str] = field(default_factory=list)
+    orphaned: list[str] = field(default_factory=list)
+
+    def to_dict(self, top: int = 20) -> dict[str, Any]:
+        types = sorted(self.types.items(), key=lambda item: -item[1].bytes)
+        return {
+            "resources": self.resources,
+            "bytes": self.bytes,
+            "types": {
+                name: {
+                    "count": stats.count,
+                    "bytes": stats.bytes,
+                    "avg_bytes": stats.bytes // max(stats.count, 1),
+                    "input_bytes": stats.input_bytes,
+                    "output_bytes": stats.output_bytes,
+                }
+                for name, stats in types
+            },
+            "hot_properties": [
+                {"type": type_, "property": prop, "bytes": size}
+                for (type_, prop), size in self.properties.most_common(top)
+            ],
+            "pending_operations": self.pending_operations,
+            "pending_delete": self.pending_delete,
+            "orphaned": self.orphaned,
+        }
+
+
+def _orphan_reason(resource: dict[str, Any], seen: set[str]) -> str | None:
+    parent = resource.get("parent")
+    if parent and parent not in seen:
+        return f"parent {parent} is missing"
+    provider = resource.get("provider")
+    if provider and _provider_urn(provider) not in seen:
+        return f"provider {provider} is missing"
+    return None
+
+
+def analyze(stream: IO[str]) -> StateReport:
+    """Stream a checkpoint and account for its size."""
+    report = StateReport()
+    checkpoint = Checkpoint()
+    # Parents and providers are written before their children, so a single
+    # pass can tell whether a reference points at a known resource
+    seen: set[str] = set()
+    for resource in iter_checkpoint(stream, checkpoint):
+        resource_type = resource.get("type", "")
+        urn = resource.get("urn", "")
+        stats = report.types[resource_type]
+        stats.count += 1
+        stats.bytes += _size(resource)
+        for section in ("inputs", "outputs"):
+            for prop, value in (resource.get(section) or {}).items():
+                size = _size(value)
+                report.properties[(resource_type, prop)] += size
+                if section == "inputs":
+                    stats.input_bytes += size
+                else:
+                    stats.output_bytes += size
+        if resource.get("delete"):
+            report.pending_delete.append(urn)
+        if _orphan_reason(resource, seen):
+            report.orphaned.append(urn)
+        seen.add(urn)
+        report.resources += 1
+    report.bytes = sum(stats.bytes for stats in report.types.values())
+    report.pending_operations = len(checkpoint.pending_operations)
+    return report
+
+
+def _write_header(out: IO[str], checkpoint: Checkpoint) -> None:
+    header = json.dumps({"version": checkpoint.version, **checkpoint.header})
+    deployment = json.dumps(checkpoint.deployment)[:-1]
+    separator = ", " if checkpoint.deployment else ""
+    out.write(f'{header[:-1]}, "deployment": {deployment}{separator}"resources": [')
+
+
+def _write_resource(out: IO[str], resource: dict[str, Any], first: bool) -> None:
+    out.write("\n" if first else ",\n")
+    out.write(json.dumps(resource, separators=(",", ":")))
+
+
+def _write_footer(out: IO[str], checkpoint: Checkpoint) -> None:
+    out.write("\n]")
+    for key, value in checkpoint.deployment_tail.items():
+        out.write(f", {json.dumps(key)}: {json.dumps(value)}")
+    out.write("}")
+    for key, value in checkpoint.header_tail.items():
+        out.write(f", {json.dumps(key)}: {json.dumps(value)}")
+    out.write("}\n")
+
+
+def _known_dependencies(resource: dict[str, Any], known: set[str]) -> dict[str, Any]:
+    """Drop references to resources that are not in the written checkpoint."""
+    pruned = dict(resource)
+    if "dependencies" in resource:
+        pruned["dependencies"] = [u for u in resource["dependencies"] if u in known]
+    if "propertyDependencies" in resource:
+        pruned["propertyDependencies"] = {
+            prop: [u for u in urns if u in known]
+            for prop, urns in resource["propertyDependencies"].items()
+        }
+    if resource.get("deletedWith") and resource["deletedWith"] not in known:
+        del pruned["deletedWith"]
+    return pruned
+
+
+def compact(source: Path, out: IO[str]) -> dict[str, int]:
+    """Write a checkpoint without pending and orphaned leftovers."""
+    counts = {"kept": 0, "pending_delete": 0, "orphaned": 0, "pending_operations": 0}
+    # Fields after the resources are needed to finish the output, so the
+    # non-resource fields are read in a first pass
+    checkpoint = read_checkpoint(source)
+    kept: set[str] = set()
+
+    _write_header(out, checkpoint)
+    with open(source) as f:
+        for resource in iter_checkpoint(f, Checkpoint()):
+            if resource.get("delete"):
+                counts["pending_delete"] += 1
+                continue
+            # Children of dropped resources become orphans in turn
+            if _orphan_reason(resource, kept):
+                counts["orphaned"] += 1
+                continue
+            _write_resource(
+                out, _known_dependencies(resource, kept), first=not counts["kept"]
+            )
+            kept.add(resource["urn"])
+            counts["kept"] += 1
+    _write_footer(out, checkpoint)
+    counts["pending_operations"] = len(checkpoint.pending_operations)
+    return counts
+
+
+def shard_key(resource: dict[str, Any]) -> str | None:
+    """Key that decides which shard a resource belongs to, None for all."""
+    resource_type = resource.get("type", "")
+    name = str(resource.get("urn", "")).rsplit("::", 1)[-1]
+    if resource_type == REPOSITORY_TYPE:
+        return name
+    if resource_type == BRANCH_PROTECTION_TYPE:
+        return name.removesuffix(f"-{PROTECTED_BRANCH}-branch-protection")
+    if resource_type == MEMBERSHIP_TYPE:
+        return name
+    # The stack itself, providers and anything else are needed by every shard
+    return None
+
+
+def _rename_urn(value: str, stack: str, new: str) -> str:
+    value = value.replace(f"urn:pulumi:{stack}::", f"urn:pulumi:{new}::")
+    # The root stack resource is named "<project>-<stack>"
+    head, sep, tail = value.partition(f"::{STACK_TYPE}::")
+    if sep and tail.endswith(f"-{stack}"):
+        value = f"{head}{sep}{tail.removesuffix(stack)}{new}"
+    return value
+
+
+def _rename_stack(resource: dict[str, Any], stack: str, new: str) -> dict[str, Any]:
+    """Move a resource's URN references from one stack to another."""
+    renamed = dict(resource)
+    for name in ("urn", "parent", "provider", "deletedWith"):
+        value = resource.get(name)
+        if value:
+            renamed[name] = _rename_urn(value, stack, new)
+    if "dependencies" in resource:
+        renamed["dependencies"] = [
+            _rename_urn(urn, stack, new) for urn in resource["dependencies"]
+        ]
+    if "propertyDependencies" in resource:
+        renamed["propertyDependencies"] = {
+            prop: [_rename_urn(urn, stack, new) for urn in urns]
+            for prop, urns in resource["propertyDependencies"].items()
+        }
+    return renamed
+
+
+def shard(source: Path, shards: int, output_dir: Path, stack: str) -> list[int]:
+    """Split a checkpoint into per-shard checkpoints. Returns resource counts."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    names = [f"{stack}-shard-{index}" for index in range(shards)]
+    checkpoint = read_checkpoint(source)
+    counts = [0] * shards
+    # URNs written to each shard; dependencies on other shards are dropped
+    written: list[set[str]] = [set() for _ in range(shards)]
+    with open(source) as f, ExitStack() as files:
+        outputs = [
+            files.enter_context(open(output_dir / f"{name}.json", "w"))
+            for name in names
+        ]
+        for out in outputs:
+            _write_header(out, checkpoint)
+        for resource in iter_checkpoint(f, Checkpoint()):
+            key = shard_key(resource)
+            targets = range(shards) if key is None else [shard_of(key, shards)]
+            for index in targets:
+                renamed = _known_dependencies(
+                    _rename_stack(resource, stack, names[index]), written[index]
+                )
+                _write_resource(outputs[index], renamed, first=not counts[index])
+                written[index].add(renamed["urn"])
+                counts[index] += 1
+        for out in outputs:
+            _write_footer(out, checkpoint)
+    return counts
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Analyze, compact and shard exported stack checkpoints."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyze_parser = commands.add_parser("analyze", help="Report size per type")
+    analyze_parser.add_argument("checkpoint", type=Path)
+    analyze_parser.add_argument("--top", type=int, default=20)
+    analyze_parser.add_argument("--output", help="Write the report to this file")
+
+    compact_parser = commands.add_parser("compact", help="Drop stale leftovers")
+    compact_parser.add_argument("checkpoint", type=Path)
+    compact_parser.add_argument("--output", type=Path, required=True)
+
+    shard_parser = commands.add_parser("shard", help="Split into shard stacks")
+    shard_parser.add_argument("checkpoint", type=Path)
+    shard_parser.add_argument("--shards", type=int, required=True)
+    shard_parser.add_argument("--stack", default="dev")
+    shard_parser.add_argument("--output-dir", type=Path, required=True)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "analyze":
+        with open(args.checkpoint) as f:
+            report = json.dumps(analyze(f).to_dict(args.top), indent=2)
+        if args.output:
+            Path(args.output).write_text(report + "\n")
+        else:
+            print(report)
+    elif args.command == "compact":
+        with open(args.output, "w") as out:
+            counts = compact(args.checkpoint, out)
+        print(f"Compacted checkpoint: {json.dumps(counts)}", file=sys.stderr)
+    else:
+        sizes = shard(args.checkpoint, args.shards, args.output_dir, args.stack)
+        print(f"Resources per shard: {sizes}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Deterministic synthetic GitHub organizations for offline testing.
+
+The generated data uses the same record types as the drift engine so a
+synthetic org can seed the fake GitHub server and also be compared against
+directly.
+"""
+
+import random
+from dataclasses import dataclass, field
+
+from modules.org_state import (
+    DEFAULT_PROTECTED_BRANCH,
+    BranchProtectionState,
+    MemberState,
+    OrgState,
+    RepositoryState,
+)
+
+
+@dataclass
+class SyntheticOrg:
+    """A generated organization with branch names per repository."""
+
+    owner: str
+    members: list[MemberState] = field(default_factory=list)
+    repositories: list[RepositoryState] = field(default_factory=list)
+    branches: dict[str, list[str]] = field(default_factory=dict)
+
+    def to_state(self) -> OrgState:
+        return OrgState.build(self.members, self.repositories)
+
+
+def generate_org(
+    owner: str = "synthetic-org",
+    repos: int = 100,
+    members: int = 50,
+    branches_per_repo: int = 3,
+    protected_ratio: float = 0.9,
+    admin_ratio: float = 0.05,
+    private_ratio: float = 0.2,
+    seed: int = 0,
+) -> SyntheticOrg:
+    """Generate an organization of the requested size.
+
+    Every repository has a main branch plus `branches_per_repo - 1` feature
+    branches. The same seed always yields the same organization.
+    """
+    rng = random.Random(seed)  # nosec B311 - not used for security
+    org = SyntheticOrg(owner=owner)
+
+    for i in range(members):
+        role = "admin" if rng.random() < admin_ratio else "member"
+        org.members.append(MemberState(username=f"user-{i:06d}", role=role))
+
+    for i in range(repos):
+        name = f"repo-{i:06d}"
+        protection = None
+        if rng.random() < protected_ratio:
+            protection = BranchProtectionState(
+                pattern=DEFAULT_PROTECTED_BRANCH,
+                enforce_admins=True,
+                require_signed_commits=rng.random() < 0.95,
+            )
+        org.repositories.append(
+            RepositoryState(
+                name=name,
+                description=f"Synthetic repository {i}",
+                visibility="private" if rng.random() < private_ratio else "public",
+                protection=protection,
+            )
+        )
+        org.branches[name] = [DEFAULT_PROTECTED_BRANCH] + [
+            f"feature-{b}" for b in range(1, max(branches_per_repo, 1))
+        ]
+
+    return org
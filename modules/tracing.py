@@ -0,0 +1,265 @@
+"""
+Opt-in timing spans for the Pulumi program.
+
+Set PLATFORM_TRACE to a file path before running the program (or
+`pulumi preview`, which runs it) to record where the time goes:
+
+    PLATFORM_TRACE=build/trace.json pulumi preview --stack dev
+
+The program records spans for loading the config, the Bitwarden invoke,
+each `github.*` resource construction and registration phase, and the
+time until the engine resolves each resource's URN or the invoke's result
+(`resolve <name>`). When the process exits, the spans are written as
+OTLP/JSON, which OpenTelemetry collectors and viewers such as Jaeger
+import. They are also written as folded stacks beside it
+(`build/trace.folded`) for flamegraph.pl, speedscope or inferno.
+
+When PLATFORM_TRACE is unset, `instrument` returns the callable it was
+given, so the module-level aliases the program uses are the plain SDK
+classes, and `span` returns a shared no-op context manager.
+
+Usage:
+    python -m modules.tracing build/trace.json
+    python -m modules.tracing build/trace.json --top 10
+"""
+
+import argparse
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any
+
+TRACE_ENV = "PLATFORM_TRACE"
+SCOPE_NAME = "platform-team-admin"
+RESOLVE_PREFIX = "resolve "
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed operation; end_ns is 0 until it ends."""
+
+    name: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Collects spans for one process."""
+
+    def __init__(self) -> None:
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def start(
+        self, name: str, attributes: dict[str, Any], parent: Span | None = None
+    ) -> Span:
+        new = Span(
+            name,
+            os.urandom(8).hex(),
+            parent.span_id if parent else None,
+            time.time_ns(),
+            attributes=attributes,
+        )
+        with self._lock:
+            self.spans.append(new)
+        return new
+
+    @staticmethod
+    def end(span: Span) -> None:
+        span.end_ns = time.time_ns()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        current = self.start(name, attributes, _current.get())
+        token = _current.set(current)
+        try:
+            yield current
+        finally:
+            _current.reset(token)
+            self.end(current)
+
+    def finished(self) -> list[Span]:
+        # Outputs that never resolved (e.g. a failed preview) are left out
+        with self._lock:
+            return [span for span in self.spans if span.end_ns]
+
+    def to_otlp(self) -> dict[str, Any]:
+        """The spans as an OTLP/JSON trace export."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _attributes({"service.name": SCOPE_NAME})
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": SCOPE_NAME},
+                            "spans": [
+                                {
+                                    "traceId": self.trace_id,
+                                    "spanId": span.span_id,
+                                    **(
+                                        {"parentSpanId": span.parent_id}
+                                        if span.parent_id
+                                        else {}
+                                    ),
+                                    "name": span.name,
+                                    "kind": 1,
+                                    "startTimeUnixNano": str(span.start_ns),
+                                    "endTimeUnixNano": str(span.end_ns),
+                                    "attributes": _attributes(span.attributes),
+                                }
+                                for span in self.finished()
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def write(self, path: str | Path) -> None:
+        """Write the OTLP/JSON file and the folded stacks beside it."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        document = self.to_otlp()
+        path.write_text(json.dumps(document))
+        spans = document["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        path.with_suffix(".folded").write_text(
+            "".join(f"{stack} {value}\n" for stack, value in folded(spans).items())
+        )
+
+
+def _attributes(values: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {
+            "key": key,
+            "value": (
+                {"intValue": str(value)}
+                if isinstance(value, int) and not isinstance(value, bool)
+                else {"stringValue": str(value)}
+            ),
+        }
+        for key, value in values.items()
+    ]
+
+
+def folded(spans: list[dict[str, Any]]) -> dict[str, int]:
+    """Self time in microseconds per stack of span names, for flamegraphs."""
+    by_id = {span["spanId"]: span for span in spans}
+    children: Counter[str] = Counter()
+    for span in spans:
+        if span.get("parentSpanId") in by_id:
+            children[span["parentSpanId"]] += _duration(span)
+
+    stacks: Counter[str] = Counter()
+    for span in spans:
+        names, parent = [span["name"]], span.get("parentSpanId")
+        while parent in by_id:
+            names.append(by_id[parent]["name"])
+            parent = by_id[parent].get("parentSpanId")
+        self_ns = max(_duration(span) - children[span["spanId"]], 0)
+        stacks[";".join(reversed(names))] += self_ns // 1000
+    return dict(sorted(stacks.items()))
+
+
+def _duration(span: dict[str, Any]) -> int:
+    return int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])
+
+
+def _tracer_from_env() -> Tracer | None:
+    path = os.environ.get(TRACE_ENV)
+    if not path:
+        return None
+    tracer = Tracer()
+    atexit.register(tracer.write, path)
+    return tracer
+
+
+TRACER = _tracer_from_env()
+_DISABLED = nullcontext()
+
+
+def enabled() -> bool:
+    return TRACER is not None
+
+
+def span(name: str, **attributes: Any) -> AbstractContextManager[Any]:
+    """Time a block as a child of the current span."""
+    if TRACER is None:
+        return _DISABLED
+    return TRACER.span(name, **attributes)
+
+
+def instrument(
+    fn: Callable[..., Any], name: str, resolved: Callable[[Any], Any] | None = None
+) -> Callable[..., Any]:
+    """Time each call of `fn`, and optionally until an output resolves.
+
+    `resolved` picks the Output to wait for from the call's result, such
+    as a resource's URN. Returns `fn` itself when tracing is disabled.
+    """
+    tracer = TRACER
+    if tracer is None:
+        return fn
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        attributes = {"resource": args[0]} if args and isinstance(args[0], str) else {}
+        with tracer.span(name, **attributes):
+            result = fn(*args, **kwargs)
+        if resolved is not None:
+            pending = tracer.start(RESOLVE_PREFIX + name, attributes)
+            resolved(result).apply(lambda _: tracer.end(pending))
+        return result
+
+    return wrapper
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Summarize a trace written with PLATFORM_TRACE."
+    )
+    parser.add_argument("path", type=Path, help="OTLP/JSON trace file")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    document = json.loads(args.path.read_text())
+    spans = [
+        span
+        for resource in document["resourceSpans"]
+        for scope in resource["scopeSpans"]
+        for span in scope["spans"]
+    ]
+    totals: Counter[str] = Counter()
+    counts: Counter[str] = Counter()
+    for span in spans:
+        totals[span["name"]] += _duration(span)
+        counts[span["name"]] += 1
+    print(f"{'span':<40} {'count':>7} {'total ms':>10} {'mean ms':>9}")
+    for name, total in totals.most_common(args.top):
+        print(
+            f"{name:<40} {counts[name]:>7} {total / 1e6:>10.1f} "
+            f"{total / counts[name] / 1e6:>9.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Long-lived Automation API workspace for fast repeated previews.
+
+`pulumi preview` normally starts a language host and a fresh Python
+interpreter, imports pulumi_github and pulumi_bitwarden and reads the
+stack on every run. This server keeps one LocalWorkspace and stack handle
+resident and runs the program inline, so repeated previews and updates
+only pay for the engine itself. The values file is re-read on every
+request, so edits show up in the next preview.
+
+Requests are served one at a time over a Unix socket, and engine output is
+streamed back to the client as it is produced.
+
+Usage:
+    python -m modules.workspace_server serve --stack dev &
+    python -m modules.workspace_server preview
+    python -m modules.workspace_server preview --target 'urn:pulumi:...'
+    python -m modules.workspace_server up
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from modules.deploy_plan import PROJECT_ROOT
+from modules.resource_names import PROJECT_NAME
+
+
+def default_socket_path() -> Path:
+    """Socket location, overridable with PULUMI_WORKSPACE_SOCKET."""
+    override = os.getenv("PULUMI_WORKSPACE_SOCKET")
+    if override:
+        return Path(override)
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(runtime_dir) / f"platform-admin-pulumi-{os.getuid()}.sock"
+
+
+class WorkspaceError(RuntimeError):
+    """Raised when the server or an engine operation fails."""
+
+
+class WorkspaceSession:
+    """A resident stack handle running the program inline."""
+
+    def __init__(self, stack_name: str, program: Callable[[], None]) -> None:
+        from pulumi import automation as auto
+
+        self.stack_name = stack_name
+        self.stack = auto.create_or_select_stack(
+            stack_name=stack_name,
+            project_name=PROJECT_NAME,
+            program=program,
+            opts=auto.LocalWorkspaceOptions(work_dir=str(PROJECT_ROOT)),
+        )
+        # Serialize engine operations; the stack allows only one at a time
+        self._lock = threading.Lock()
+
+    def preview(
+        self,
+        on_output: Callable[[str], None],
+        target: list[str] | None = None,
+        replace: list[str] | None = None,
+    ) -> dict[str, Any]:
+        with self._lock:
+            result = self.stack.preview(
+                target=target or None,
+                replace=replace or None,
+                on_output=on_output,
+            )
+        return {"change_summary": dict(result.change_summary)}
+
+    def up(
+        self,
+        on_output: Callable[[str], None],
+        target: list[str] | None = None,
+        replace: list[str] | None = None,
+    ) -> dict[str, Any]:
+        with self._lock:
+            result = self.stack.up(
+                target=target or None,
+                replace=replace or None,
+                on_output=on_output,
+            )
+        return {
+            "change_summary": dict(result.summary.resource_changes or {}),
+            "result": result.summary.result,
+        }
+
+    def handle(
+        self, request: dict[str, Any], on_output: Callable[[str], None]
+    ) -> dict[str, Any]:
+        """Answer one protocol request."""
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "stack": self.stack_name}
+        if op in ("preview", "up"):
+            operation = self.preview if op == "preview" else self.up
+            started = time.perf_counter()
+            response = operation(
+                on_output, request.get("target"), request.get("replace")
+            )
+            return {
+                "ok": True,
+                "seconds": round(time.perf_counter() - started, 3),
+                **response,
+            }
+        raise WorkspaceError(f"Unknown operation: {op}")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "WorkspaceServer"
+
+    def _send(self, message: dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(message).encode() + b"\n")
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request.get("op") == "shutdown":
+                    response: dict[str, Any] = {"ok": True}
+                    threading.Thread(target=self.server.shutdown).start()
+                else:
+                    response = self.server.session.handle(
+                        request, lambda text: self._send({"output": text})
+                    )
+            except Exception as e:
+                # Engine failures are reported to the client, not fatal
+                response = {"ok": False, "error": str(e)}
+            self._send(response)
+
+
+class WorkspaceServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server exposing a WorkspaceSession."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, session: WorkspaceSession) -> None:
+        self.session = session
+        if path.exists():
+            path.unlink()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Updates run with the owner's credentials, so only the owner may connect
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(str(path), _Handler)
+        finally:
+            os.umask(old_umask)
+
+
+def serve(path: Path, session: WorkspaceSession) -> None:
+    server = WorkspaceServer(path, session)
+    try:
+        server.serve_forever(poll_interval=0.1)
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+
+
+def request(
+    op: str,
+    path: Path | None = None,
+    on_output: Callable[[str], None] | None = None,
+    **params: Any,
+) -> dict[str, Any]:
+    """Send one request to a running server, streaming engine output."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path or default_socket_path()))
+        sock.sendall(json.dumps({"op": op, **params}).encode() + b"\n")
+        with sock.makefile("rb") as reader:
+            for line in reader:
+                message: dict[str, Any] = json.loads(line)
+                if "output" not in message:
+                    break
+                if on_output is not None:
+                    on_output(message["output"])
+            else:
+                raise WorkspaceError("Server closed the connection")
+    if not message.get("ok"):
+        raise WorkspaceError(message.get("error", "workspace request failed"))
+    return message
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Resident Pulumi workspace server.")
+    parser.add_argument("--socket", type=Path, default=None)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the server in foreground")
+    serve_parser.add_argument("--stack", default="dev")
+    for name in ("preview", "up"):
+        operation = commands.add_parser(name, help=f"Run {name} on the server")
+        operation.add_argument("--target", action="append", default=[])
+        operation.add_argument("--replace", action="append", default=[])
+    commands.add_parser("stop", help="Stop the server")
+
+    args = parser.parse_args(argv)
+    path = args.socket or default_socket_path()
+
+    if args.command == "serve":
+        import dotenv
+
+        from modules import program
+        from modules.deploy_cli import prewarm_plugins, required_plugins
+
+        os.chdir(PROJECT_ROOT)
+        dotenv.load_dotenv()
+        prewarm_plugins(required_plugins())
+        session = WorkspaceSession(args.stack, program.run)
+        print(f"Serving stack {args.stack} on {path}", flush=True)
+        serve(path, session)
+        return 0
+
+    try:
+        if args.command == "stop":
+            request("shutdown", path)
+            return 0
+        response = request(
+            args.command,
+            path,
+            on_output=lambda text: print(text, end="", flush=True),
+            target=args.target,
+            replace=args.replace,
+        )
+    except (OSError, WorkspaceError) as e:
+        print(f"workspace-server: {e}", file=sys.stderr)
+        return 1
+    print(
+        f"\n{args.command} finished in {response['seconds']}s: "
+        f"{json.dumps(response['change_summary'])}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
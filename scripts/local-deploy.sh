@@ -8,6 +8,10 @@ ACTION="up"
 PULUMI_STACK="dev"
 # Default: run quality checks
 SKIP_QUALITY_CHECKS=false
+# Default: reuse the Bitwarden session broker
+USE_BROKER=true
+# Default: skip preview/up when deploy inputs match the last update
+FORCE=false
 
 #parse optional flags
 while [[ $# -gt 0 ]]; do
@@ -28,14 +32,24 @@ while [[ $# -gt 0 ]]; do
       SKIP_QUALITY_CHECKS=true
       shift
       ;;
+    --no-broker)
+      USE_BROKER=false
+      shift
+      ;;
+    --force)
+      FORCE=true
+      shift
+      ;;
     --help|-h)
-      echo "Usage: $0 [--action up|destroy|preview] [--stack dev|prod] [--verbose] [--skip-quality-checks]"
+      echo "Usage: $0 [--action up|destroy|preview] [--stack dev|prod] [--verbose] [--skip-quality-checks] [--no-broker] [--force]"
       echo ""
       echo "Options:"
       echo "  --action              Pulumi action: up, destroy, or preview (default: up)"
       echo "  --stack               Pulumi stack: dev or prod (default: dev)"
       echo "  --verbose             Enable verbose output"
       echo "  --skip-quality-checks Skip static analysis, tests, and quality checks"
+      echo "  --no-broker           Log in to Bitwarden from scratch instead of using the session broker"
+      echo "  --force               Run even when deploy inputs match the last successful update"
       echo ""
       echo "This script mimics the CircleCI pipeline locally with environment variables from .env"
       echo ""
@@ -64,18 +78,6 @@ done
 
 echo "🚀 Starting local deployment pipeline (mimicking CircleCI)..."
 
-# Setup Python environment (matching CircleCI pattern)
-echo "📦 Setting up Python environment..."
-if [[ -d ".venv" ]]; then
-  echo "Clearing existing virtual environment..."
-  rm -rf .venv
-fi
-
-echo "Creating fresh virtual environment..."
-uv venv --clear
-uv add -r requirements.txt
-uv sync --group lint --group test
-
 # Load .env before accessing any env vars
 ENV_FILE=".env"
 if [[ ! -f "$ENV_FILE" ]]; then
@@ -88,33 +90,67 @@ set -o allexport
 source "$ENV_FILE"
 set +o allexport
 
+# Skip everything, including the environment rebuild, when nothing that
+# affects the program changed since the last successful update
+if [[ "$FORCE" == false && ( "$ACTION" == "up" || "$ACTION" == "preview" ) ]]; then
+  echo "🔎 Checking deploy inputs against stack $PULUMI_STACK..."
+  if python3 -m modules.deploy_plan check --stack "$PULUMI_STACK"; then
+    echo "✅ Nothing to deploy. Use --force to run anyway."
+    exit 0
+  fi
+fi
+
+# Setup Python environment (matching CircleCI pattern)
+echo "📦 Setting up Python environment..."
+if [[ -d ".venv" ]]; then
+  echo "Clearing existing virtual environment..."
+  rm -rf .venv
+fi
+
+echo "Creating fresh virtual environment..."
+uv venv --clear
+uv add -r requirements.txt
+uv sync --group lint --group test
+
 # Ensure Bitwarden credentials are set
 : "${BW_CLIENTID:?BW_CLIENTID must be set}"
 : "${BW_CLIENTSECRET:?BW_CLIENTSECRET must be set}"
 : "${BW_PASSWORD:?BW_PASSWORD must be set}"
 
-echo "Cleaning up old Bitwarden CLI session"
-bw lock || echo "Vault already locked"
-bw logout || echo "No active session"
-rm -rf ~/Library/Application\ Support/Bitwarden\ CLI/
-export BW_SESSION=""
+# Name of the Bitwarden item containing the secrets
+ITEM_NAME="GitHub Secrets"
 
-echo "Logging into Bitwarden..."
-bw login --apikey
+if [[ "$USE_BROKER" == true ]]; then
+  echo "Using Bitwarden session broker (skips login and full sync when warm)..."
+  python3 -m modules.bitwarden_broker start
+  BW_SESSION=$(python3 -m modules.bitwarden_broker session)
+  export BW_SESSION
 
-echo "Unlocking vault..."
-BW_SESSION=$(bw unlock --passwordenv BW_PASSWORD --raw)
-export BW_SESSION
+  echo "Retrieving secrets from Bitwarden item: $ITEM_NAME"
+  GITHUB_EXPORTS=$(python3 -m modules.bitwarden_broker exports "$ITEM_NAME" \
+    pulumi-github-token=GITHUB_TOKEN pulumi-github-owner=GITHUB_OWNER)
+  eval "$GITHUB_EXPORTS"
+else
+  echo "Cleaning up old Bitwarden CLI session"
+  bw lock || echo "Vault already locked"
+  bw logout || echo "No active session"
+  rm -rf ~/Library/Application\ Support/Bitwarden\ CLI/
+  export BW_SESSION=""
 
-# Name of the Bitwarden item containing the secrets
-ITEM_NAME="GitHub Secrets"
+  echo "Logging into Bitwarden..."
+  bw login --apikey
 
-echo "Retrieving secrets from Bitwarden item: $ITEM_NAME"
-ITEM_JSON=$(bw get item "$ITEM_NAME" --session "$BW_SESSION")
+  echo "Unlocking vault..."
+  BW_SESSION=$(bw unlock --passwordenv BW_PASSWORD --raw)
+  export BW_SESSION
 
-# Load environment variables
-export GITHUB_TOKEN=$(echo "$ITEM_JSON" | jq -r '.fields[] | select(.name=="pulumi-github-token") | .value')
-export GITHUB_OWNER=$(echo "$ITEM_JSON" | jq -r '.fields[] | select(.name=="pulumi-github-owner") | .value')
+  echo "Retrieving secrets from Bitwarden item: $ITEM_NAME"
+  ITEM_JSON=$(bw get item "$ITEM_NAME" --session "$BW_SESSION")
+
+  # Load environment variables
+  export GITHUB_TOKEN=$(echo "$ITEM_JSON" | jq -r '.fields[] | select(.name=="pulumi-github-token") | .value')
+  export GITHUB_OWNER=$(echo "$ITEM_JSON" | jq -r '.fields[] | select(.name=="pulumi-github-owner") | .value')
+fi
 
 echo "GitHub secrets loaded into environment variables"
 
@@ -7,17 +7,24 @@ set -euo pipefail
 
 # Parse command line arguments
 DRY_RUN=false
+# Default: one pytest worker per CPU core
+WORKERS="auto"
 while [[ $# -gt 0 ]]; do
   case "$1" in
     --dry-run)
       DRY_RUN=true
       shift
       ;;
+    --workers)
+      WORKERS="$2"
+      shift 2
+      ;;
     --help|-h)
-      echo "Usage: $0 [--dry-run] [--help]"
+      echo "Usage: $0 [--dry-run] [--workers N|auto] [--help]"
       echo ""
       echo "Options:"
       echo "  --dry-run    Show what would be done without actually running tests"
+      echo "  --workers    Number of pytest-xdist worker processes (default: auto, 0 disables)"
       echo "  --help       Show this help message"
       echo ""
       echo "Environment Variable Sources:"
@@ -53,7 +60,7 @@ load_secrets_from_bitwarden() {
     if [[ "$DRY_RUN" == true ]]; then
         echo -e "${BLUE}   [DRY RUN] Would check for Bitwarden CLI and jq${NC}"
         echo -e "${BLUE}   [DRY RUN] Would load .env file for Bitwarden credentials${NC}"
-        echo -e "${BLUE}   [DRY RUN] Would login to Bitwarden and retrieve GitHub Secrets${NC}"
+        echo -e "${BLUE}   [DRY RUN] Would use the Bitwarden session broker (or login) to retrieve GitHub Secrets${NC}"
         echo -e "${BLUE}   [DRY RUN] Would export GITHUB_TOKEN and GITHUB_OWNER${NC}"
         export GITHUB_TOKEN="dry-run-token"
         export GITHUB_OWNER="dry-run-owner"
@@ -90,6 +97,18 @@ load_secrets_from_bitwarden() {
         exit 1
     fi
     
+    # Prefer the long-lived session broker, which skips login and full sync
+    if [[ "${USE_BROKER:-true}" == true ]] && python3 -m modules.bitwarden_broker start &>/dev/null; then
+        echo -e "${BLUE}🔑 Using Bitwarden session broker...${NC}"
+        if GITHUB_EXPORTS=$(python3 -m modules.bitwarden_broker exports "GitHub Secrets" \
+            pulumi-github-token=GITHUB_TOKEN pulumi-github-owner=GITHUB_OWNER 2>/dev/null); then
+            eval "$GITHUB_EXPORTS"
+            echo -e "${GREEN}✓ GitHub secrets loaded from Bitwarden session broker${NC}"
+            return 0
+        fi
+        echo -e "${YELLOW}⚠️  Session broker lookup failed, falling back to a fresh login${NC}"
+    fi
+
     # Clean up any existing Bitwarden session
     echo -e "${BLUE}🧹 Cleaning up old Bitwarden CLI session${NC}"
     bw lock &>/dev/null || echo "Vault already locked"
@@ -163,7 +182,7 @@ fi
 if [[ "$DRY_RUN" == true ]]; then
     echo -e "${BLUE}🧪 DRY RUN COMPLETE - would run these steps:${NC}"
     echo -e "${BLUE}   1. Install test dependencies with 'uv sync --group test'${NC}"
-    echo -e "${BLUE}   2. Run integration tests with pytest${NC}"
+    echo -e "${BLUE}   2. Run integration tests with pytest ($WORKERS workers)${NC}"
     echo -e "${BLUE}   3. Validate GitHub organization state via API${NC}"
     echo -e "${BLUE}   4. Check Pulumi stack outputs if available${NC}"
     echo -e "${GREEN}✅ Dry run completed successfully!${NC}"
@@ -178,8 +197,9 @@ uv sync --group test
 echo -e "${YELLOW}🧪 Running integration tests...${NC}"
 
 # Use pytest with specific configuration for CI/CD
-uv run pytest test/integration/ \
+uv run pytest tests/integration/ \
     -m integration \
+    -n "$WORKERS" \
     --verbose \
     --tb=short \
     --color=yes \
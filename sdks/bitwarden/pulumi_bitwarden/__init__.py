@@ -4,7 +4,7 @@
 import builtins as _builtins
 import typing
 
-from . import _utilities, outputs
+from . import _metrics, _utilities, outputs
 from ._inputs import *
 
 # Export this package's modules as members:
@@ -29,6 +29,9 @@ from .project import *
 from .provider import *
 from .secret import *
 
+# Opt-in invoke metrics, see _metrics.py (keep when regenerating)
+_metrics.install_from_env()
+
 # Make subpackages available:
 if typing.TYPE_CHECKING:
     import pulumi_bitwarden.config as __config
@@ -0,0 +1,179 @@
+"""
+Optional call metrics for the Bitwarden data source invokes.
+
+Every `get_*` function in this package goes through
+`pulumi.runtime.invoke` or `pulumi.runtime.invoke_output`. When
+PULUMI_BITWARDEN_METRICS is set to a file path, `install_from_env` wraps
+both functions and records, per `bitwarden:` token:
+
+* the call count, split by invoke and invoke_output;
+* a latency histogram in milliseconds (for invoke_output, the time until
+  the result resolves; results that stay unknown are counted but not timed);
+* the number of distinct argument sets and the duplicate calls a cache
+  would have answered (the SDK has no cache, so duplicates are the
+  potential hit rate);
+* the number of distinct values seen for each argument.
+
+Tokens of other packages pass through untouched. The metrics are written
+as JSON when the program exits. Unset, nothing is wrapped.
+
+This module is maintained by hand; keep the `install_from_env()` call in
+`__init__.py` when regenerating the SDK.
+"""
+
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+import typing
+
+import pulumi
+import pulumi.runtime
+
+METRICS_ENV = "PULUMI_BITWARDEN_METRICS"
+TOKEN_PREFIX = "bitwarden:"
+# Upper bounds of the latency buckets in milliseconds; the last is open
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def _fingerprint(value: typing.Any) -> str:
+    if isinstance(value, pulumi.Output):
+        # Not known when the call is made
+        return "<output>"
+    return repr(value)
+
+
+class TokenMetrics:
+    """Counters for one invoke token."""
+
+    def __init__(self) -> None:
+        self.calls: typing.Dict[str, int] = {}
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.timed = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.argument_sets: typing.Set[typing.Tuple[typing.Tuple[str, str], ...]] = set()
+        self.argument_values: typing.Dict[str, typing.Set[str]] = {}
+
+    def record_call(self, kind: str, args: typing.Mapping[str, typing.Any]) -> None:
+        self.calls[kind] = self.calls.get(kind, 0) + 1
+        fingerprints = tuple(sorted((key, _fingerprint(value)) for key, value in args.items()))
+        self.argument_sets.add(fingerprints)
+        for key, value in fingerprints:
+            self.argument_values.setdefault(key, set()).add(value)
+
+    def record_latency(self, seconds: float) -> None:
+        milliseconds = seconds * 1000
+        self.buckets[bisect.bisect_left(BUCKETS_MS, milliseconds)] += 1
+        self.timed += 1
+        self.total_ms += milliseconds
+        self.max_ms = max(self.max_ms, milliseconds)
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        calls = sum(self.calls.values())
+        duplicates = calls - len(self.argument_sets)
+        return {
+            "calls": calls,
+            "calls_by_kind": dict(sorted(self.calls.items())),
+            "latency_ms": {
+                "count": self.timed,
+                "mean": round(self.total_ms / self.timed, 3) if self.timed else None,
+                "max": round(self.max_ms, 3),
+                "buckets": {
+                    **{f"le_{bound}": count for bound, count in zip(BUCKETS_MS, self.buckets)},
+                    "inf": self.buckets[-1],
+                },
+            },
+            "distinct_argument_sets": len(self.argument_sets),
+            "duplicate_calls": duplicates,
+            "potential_cache_hit_rate": round(duplicates / calls, 3) if calls else 0.0,
+            "argument_cardinality": {
+                key: len(values) for key, values in sorted(self.argument_values.items())
+            },
+        }
+
+
+class InvokeMetrics:
+    """Wraps the runtime invoke functions and collects TokenMetrics."""
+
+    def __init__(self, clock: typing.Callable[[], float] = time.perf_counter) -> None:
+        self.tokens: typing.Dict[str, TokenMetrics] = {}
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def _metrics(self, token: str) -> TokenMetrics:
+        metrics = self.tokens.get(token)
+        if metrics is None:
+            metrics = self.tokens.setdefault(token, TokenMetrics())
+        return metrics
+
+    def wrap_invoke(self, invoke: typing.Callable[..., typing.Any]) -> typing.Callable[..., typing.Any]:
+        def wrapper(tok: str, props: typing.Mapping[str, typing.Any], *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            if not tok.startswith(TOKEN_PREFIX):
+                return invoke(tok, props, *args, **kwargs)
+            started = self._clock()
+            result = invoke(tok, props, *args, **kwargs)
+            with self._lock:
+                metrics = self._metrics(tok)
+                metrics.record_call("invoke", props)
+                metrics.record_latency(self._clock() - started)
+            return result
+
+        wrapper.__wrapped__ = invoke  # type: ignore[attr-defined]
+        return wrapper
+
+    def wrap_invoke_output(self, invoke_output: typing.Callable[..., typing.Any]) -> typing.Callable[..., typing.Any]:
+        def wrapper(tok: str, props: typing.Mapping[str, typing.Any], *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            if not tok.startswith(TOKEN_PREFIX):
+                return invoke_output(tok, props, *args, **kwargs)
+            started = self._clock()
+            with self._lock:
+                self._metrics(tok).record_call("invoke_output", props)
+            result = invoke_output(tok, props, *args, **kwargs)
+
+            def resolved(value: typing.Any) -> typing.Any:
+                with self._lock:
+                    self._metrics(tok).record_latency(self._clock() - started)
+                return value
+
+            # Timed through a derived output so the caller's result is untouched
+            result.apply(resolved)
+            return result
+
+        wrapper.__wrapped__ = invoke_output  # type: ignore[attr-defined]
+        return wrapper
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        with self._lock:
+            return {
+                "tokens": {token: metrics.to_dict() for token, metrics in sorted(self.tokens.items())},
+            }
+
+    def write(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+_installed: typing.Optional[InvokeMetrics] = None
+
+
+def install(path: typing.Optional[str] = None) -> InvokeMetrics:
+    """Wrap the runtime invoke functions once; write JSON to `path` at exit."""
+    global _installed
+    if _installed is None:
+        _installed = InvokeMetrics()
+        pulumi.runtime.invoke = _installed.wrap_invoke(pulumi.runtime.invoke)
+        pulumi.runtime.invoke_output = _installed.wrap_invoke_output(pulumi.runtime.invoke_output)
+        if path:
+            atexit.register(_installed.write, path)
+    return _installed
+
+
+def install_from_env() -> typing.Optional[InvokeMetrics]:
+    path = os.environ.get(METRICS_ENV)
+    return install(path) if path else None
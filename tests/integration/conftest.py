@@ -0,0 +1,164 @@
+"""
+Shared fixtures for the post-deployment integration tests.
+
+Organization state is fetched once per session and, when running under
+pytest-xdist, once per run: the first worker writes a snapshot that the
+other workers load. Per-repository tests are parametrized from the values
+file so every worker collects the same test IDs without calling GitHub.
+
+A recorded cassette lists the repositories that were configured when it
+was recorded. When replaying, repositories added since then are skipped,
+since the cassette holds no responses for them. Recording needs a single
+process, since xdist workers would overwrite each other's cassette.
+"""
+
+import fcntl
+import os
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from modules import config_snapshot
+from modules.cassette import (
+    RECORD,
+    REPLAY,
+    CassettePlayer,
+    CassetteRecorder,
+    transport_from_env,
+)
+from modules.config_model import Repository
+from modules.github_client import DEFAULT_API_URL, GitHubClient
+from modules.org_state import OrgState, fetch_org_state, state_key
+from modules.snapshot import read_state, write_snapshot
+
+
+class GitHubAPI:
+    """Helper class for GitHub API interactions."""
+
+    def __init__(self, transport: CassetteRecorder | CassettePlayer | None = None):
+        self.token = os.getenv("GITHUB_TOKEN")
+        self.owner = os.getenv("GITHUB_OWNER")
+
+        if isinstance(transport, CassettePlayer):
+            # Replayed responses need neither credentials nor network
+            self.owner = self.owner or transport.metadata.get("owner")
+            self.token = self.token or "replay"
+
+        if not self.token or not self.owner:
+            pytest.skip("GitHub credentials not available")
+
+        self.client = GitHubClient(
+            self.token,
+            base_url=os.getenv("GITHUB_API_URL", DEFAULT_API_URL),
+            transport=transport,
+        )
+
+    def get(self, endpoint: str) -> Any:
+        """Make a GET request to the GitHub API."""
+        return self.client.get(endpoint)
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Refuse to record a cassette from several xdist workers."""
+    recording = (
+        os.getenv("GITHUB_CASSETTE")
+        and os.getenv("GITHUB_CASSETTE_MODE", REPLAY) == RECORD
+    )
+    workers = getattr(config.option, "numprocesses", None)
+    if recording and (workers or os.getenv("PYTEST_XDIST_WORKER")):
+        raise pytest.UsageError(
+            "GITHUB_CASSETTE_MODE=record needs a single process; run without -n"
+        )
+
+
+def _configured_repositories() -> list[str]:
+    return [repo.name for repo in config_snapshot.load().repositories]
+
+
+def _recorded_repositories() -> set[str] | None:
+    """Repositories in the cassette being replayed, or None if not replaying."""
+    path = os.getenv("GITHUB_CASSETTE")
+    mode = os.getenv("GITHUB_CASSETTE_MODE", REPLAY)
+    if not path or mode != REPLAY or not os.path.exists(path):
+        return None
+    player = CassettePlayer(path)
+    try:
+        recorded = player.metadata.get("repositories")
+    finally:
+        player.close()
+    # Cassettes recorded before the list was kept replay every repository
+    return None if recorded is None else set(recorded)
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Create one test case per configured repository."""
+    if "configured_repo" in metafunc.fixturenames:
+        recorded = _recorded_repositories()
+        not_recorded = pytest.mark.skip(reason="not in the replayed cassette")
+        metafunc.parametrize(
+            "configured_repo",
+            [
+                pytest.param(
+                    name,
+                    marks=() if recorded is None or name in recorded else not_recorded,
+                )
+                for name in _configured_repositories()
+            ],
+        )
+
+
+@pytest.fixture(scope="session")
+def configured_repositories() -> dict[str, Repository]:
+    """Configured repositories and their resolved settings, by lookup key."""
+    return {state_key(repo.name): repo for repo in config_snapshot.load().repositories}
+
+
+@pytest.fixture(scope="session")
+def github_transport() -> Iterator[CassetteRecorder | CassettePlayer | None]:
+    """Cassette transport shared by the session when GITHUB_CASSETTE is set."""
+    transport = transport_from_env(
+        metadata={
+            "owner": os.getenv("GITHUB_OWNER"),
+            "repositories": _configured_repositories(),
+        }
+    )
+    yield transport
+    if transport is not None:
+        transport.close()
+
+
+@pytest.fixture(scope="session")
+def github_api(github_transport):
+    """Fixture providing GitHub API client."""
+    return GitHubAPI(github_transport)
+
+
+def _fetch_org_state(github_api: GitHubAPI) -> OrgState:
+    # Protection is only checked for configured repositories, and a replayed
+    # cassette only holds it for those configured when it was recorded
+    protected = _configured_repositories()
+    recorded = _recorded_repositories()
+    if recorded is not None:
+        protected = [name for name in protected if name in recorded]
+    return fetch_org_state(
+        github_api.client, github_api.owner, protected_repos=protected
+    )
+
+
+@pytest.fixture(scope="session")
+def org_state(github_api, tmp_path_factory) -> OrgState:
+    """Members, repositories and protection, fetched once for the run."""
+    if not os.getenv("PYTEST_XDIST_WORKER"):
+        return _fetch_org_state(github_api)
+
+    # Workers share the parent of their per-worker base temp directory
+    shared = tmp_path_factory.getbasetemp().parent
+    cache = shared / "org-state.snap"
+    with open(shared / "org-state.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if cache.exists():
+            return read_state(cache)
+        state = _fetch_org_state(github_api)
+        write_snapshot(state, cache)
+        return state
@@ -0,0 +1,76 @@
+"""
+Unit tests for the synthetic config benchmarks.
+"""
+
+import pytest
+
+from modules.benchmark import compare, main, read_history, synthetic_values
+from modules.config_model import validate
+from modules.conflicts import find_conflicts
+
+
+@pytest.mark.unit
+class TestBenchmark:
+    """Test config generation, trend comparison and a small end-to-end run."""
+
+    def test_synthetic_values_are_valid(self):
+        values = synthetic_values(300)
+
+        config = validate(values)
+
+        assert len(config.members) == len(config.repositories) == 300
+        assert not find_conflicts([("synthetic", values)])
+        assert len({repo.settings for repo in config.repositories}) == 3
+
+    def test_compare_reports_regressions_as_positive(self):
+        history = [
+            {"size": 10, "status": "ok", "settle_seconds": 2.0},
+            {"size": 10, "status": "timeout"},
+            {"size": 20, "status": "ok", "settle_seconds": 9.0},
+        ]
+        record = {
+            "size": 10,
+            "status": "ok",
+            "settle_seconds": 3.0,
+            "resources_per_second": 50.0,
+        }
+
+        assert compare(record, history) == {"settle_seconds": 50.0}
+        history[0]["resources_per_second"] = 100.0
+        assert compare(record, history)["resources_per_second"] == 50.0
+        assert compare({"size": 30, "status": "ok"}, history) == {}
+
+    def test_compare_uses_the_median_above_noise_floors(self):
+        settles = [10.0, 30.0, 11.0, 9.0, 12.0, 10.0]
+        history = [
+            {
+                "size": 10,
+                "status": "ok",
+                "settle_seconds": settle,
+                "config_seconds": 0.2,
+            }
+            for settle in settles
+        ]
+        record = {
+            "size": 10,
+            "status": "ok",
+            "settle_seconds": 12.0,
+            "config_seconds": 0.4,
+        }
+
+        # Median of the last five runs is 11s; 0.2s to 0.4s is under the floor
+        assert compare(record, history) == {"settle_seconds": 9.1}
+        assert compare(record, history, runs=1) == {"settle_seconds": 20.0}
+
+    @pytest.mark.slow
+    def test_runs_under_mocks_and_records_history(self, tmp_path, capsys):
+        history = tmp_path / "history.jsonl"
+
+        assert main(["--sizes", "5", "--history", str(history)]) == 0
+
+        (record,) = read_history(history)
+        assert record["status"] == "ok"
+        # Provider, memberships, repositories and protections
+        assert record["resources"] == 1 + 5 + 2 * 5
+        assert record["peak_rss_mb"] > 0
+        assert "16 resources" in capsys.readouterr().out
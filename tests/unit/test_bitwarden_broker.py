@@ -0,0 +1,151 @@
+"""
+Unit tests for the Bitwarden session broker.
+"""
+
+import json
+import socket
+import sys
+import threading
+
+import pytest
+
+from modules import bitwarden_broker
+from modules.bitwarden_broker import BitwardenBroker, item_field, serve
+
+FAKE_BW = """#!{python}
+import json, pathlib, sys
+state = pathlib.Path(__file__).with_name("state")
+log = pathlib.Path(__file__).with_name("calls")
+args = sys.argv[1:]
+with log.open("a") as f:
+    f.write(" ".join(args) + "\\n")
+status = state.read_text() if state.exists() else "unauthenticated"
+if args[0] == "status":
+    print(json.dumps({{"status": status}}))
+elif args[0] == "login":
+    state.write_text("locked")
+elif args[0] == "unlock":
+    state.write_text("unlocked")
+    print("session-key")
+elif args[0] == "lock":
+    state.write_text("locked")
+elif args == ["get", "item", "GitHub Secrets"]:
+    print(json.dumps({{"name": "GitHub Secrets", "fields": [
+        {{"name": "pulumi-github-token", "value": "ghp_token"}},
+        {{"name": "pulumi-github-owner", "value": "acme"}},
+    ]}}))
+elif args[0] == "sync":
+    pass
+else:
+    sys.exit(1)
+"""
+
+
+@pytest.fixture
+def fake_bw(tmp_path, monkeypatch):
+    script = tmp_path / "bw"
+    script.write_text(FAKE_BW.format(python=sys.executable))
+    script.chmod(0o755)
+    monkeypatch.delenv("BW_SESSION", raising=False)
+    return script
+
+
+def calls(fake_bw):
+    return fake_bw.with_name("calls").read_text().splitlines()
+
+
+@pytest.mark.unit
+class TestBitwardenBroker:
+    """Test that the broker logs in once and serves cached lookups."""
+
+    def test_repeated_lookups_reuse_session(self, fake_bw):
+        broker = BitwardenBroker(str(fake_bw))
+
+        first = broker.get_item("GitHub Secrets")
+        second = broker.get_item("GitHub Secrets")
+
+        assert first is second
+        assert broker.get_session() == "session-key"
+        assert item_field(first, "pulumi-github-owner") == "acme"
+        assert calls(fake_bw) == [
+            "status",
+            "login --apikey",
+            "unlock --passwordenv BW_PASSWORD --raw",
+            "sync --last",
+            "sync",
+            "get item GitHub Secrets",
+        ]
+
+    def test_serves_items_over_socket(self, fake_bw, tmp_path, capsys):
+        socket_path = tmp_path / "bw.sock"
+        broker = BitwardenBroker(str(fake_bw))
+        thread = threading.Thread(target=serve, args=(socket_path, broker))
+        thread.start()
+        try:
+            while not bitwarden_broker.is_running(socket_path):
+                pass
+            argv = ["--socket", str(socket_path), "exports", "GitHub Secrets"]
+            bitwarden_broker.main(
+                argv
+                + [
+                    "pulumi-github-token=GITHUB_TOKEN",
+                    "pulumi-github-owner=GITHUB_OWNER",
+                ]
+            )
+            item = bitwarden_broker.get_item("GitHub Secrets", socket_path)
+        finally:
+            bitwarden_broker.request("shutdown", socket_path)
+            thread.join()
+
+        assert capsys.readouterr().out.splitlines() == [
+            "export GITHUB_TOKEN=ghp_token",
+            "export GITHUB_OWNER=acme",
+        ]
+        assert json.dumps(item)
+        assert calls(fake_bw).count("get item GitHub Secrets") == 1
+        # Shutting down locks the vault
+        assert calls(fake_bw)[-1] == "lock"
+        assert not socket_path.exists()
+
+    def test_rejects_requests_that_are_not_objects(self, fake_bw, tmp_path):
+        socket_path = tmp_path / "bw.sock"
+        broker = BitwardenBroker(str(fake_bw))
+        thread = threading.Thread(target=serve, args=(socket_path, broker))
+        thread.start()
+        try:
+            while not bitwarden_broker.is_running(socket_path):
+                pass
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(str(socket_path))
+                sock.sendall(b'[]\n"x"\n{"op": "ping"}\n')
+                with sock.makefile("rb") as reader:
+                    responses = [json.loads(reader.readline()) for _ in range(3)]
+        finally:
+            bitwarden_broker.request("shutdown", socket_path)
+            thread.join()
+
+        error = {"ok": False, "error": "Request must be a JSON object"}
+        # The connection stays usable after a bad request
+        assert responses == [error, error, {"ok": True}]
+
+    def test_accepts_connections_before_unlocking(self, fake_bw, tmp_path):
+        socket_path = tmp_path / "bw.sock"
+        broker = BitwardenBroker(str(fake_bw))
+        # Stands in for a slow login and unlock holding the broker
+        broker._lock.acquire()
+        thread = threading.Thread(target=serve, args=(socket_path, broker))
+        thread.start()
+        try:
+            while not bitwarden_broker.is_running(socket_path):
+                pass
+            assert not fake_bw.with_name("calls").exists()
+        finally:
+            broker._lock.release()
+            bitwarden_broker.request("shutdown", socket_path)
+            thread.join()
+
+        assert calls(fake_bw)[:3] == [
+            "status",
+            "login --apikey",
+            "unlock --passwordenv BW_PASSWORD --raw",
+        ]
@@ -0,0 +1,64 @@
+"""
+Unit tests for the Bitwarden SDK invoke metrics.
+"""
+
+import json
+
+import pytest
+from pulumi_bitwarden._metrics import InvokeMetrics
+
+LOGIN = "bitwarden:index/getItemLogin:getItemLogin"
+
+
+class _Clock:
+    """Advances 3 ms per reading."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 0.003
+        return self.now
+
+
+class _Output:
+    """Stands in for an Output that resolves when apply is called."""
+
+    def apply(self, fn):
+        return fn("item")
+
+
+@pytest.mark.unit
+class TestBitwardenMetrics:
+    """Test counts, latency buckets, duplicates and pass-through tokens."""
+
+    def test_counts_duplicates_and_latency(self, tmp_path):
+        metrics = InvokeMetrics(clock=_Clock())
+        invoke = metrics.wrap_invoke(lambda tok, props, **_: "result")
+        invoke_output = metrics.wrap_invoke_output(lambda tok, props, **_: _Output())
+
+        assert invoke(LOGIN, {"search": "GitHub Secrets", "id": None}) == "result"
+        invoke_output(LOGIN, {"search": "GitHub Secrets", "id": None}, opts=None)
+        invoke_output(LOGIN, {"search": "Docker Hub", "id": None})
+
+        login = metrics.to_dict()["tokens"][LOGIN]
+        assert login["calls"] == 3
+        assert login["calls_by_kind"] == {"invoke": 1, "invoke_output": 2}
+        assert login["duplicate_calls"] == 1
+        assert login["potential_cache_hit_rate"] == 0.333
+        assert login["argument_cardinality"] == {"id": 1, "search": 2}
+        assert login["latency_ms"]["count"] == 3
+        assert login["latency_ms"]["buckets"]["le_5"] == 3
+
+        metrics.write(str(tmp_path / "out" / "metrics.json"))
+        written = json.loads((tmp_path / "out" / "metrics.json").read_text())
+        assert written["tokens"][LOGIN]["calls"] == 3
+
+    def test_other_packages_pass_through(self):
+        metrics = InvokeMetrics()
+        invoke = metrics.wrap_invoke(lambda tok, props: tok)
+
+        assert invoke("github:index/getUser:getUser", {}) == (
+            "github:index/getUser:getUser"
+        )
+        assert metrics.to_dict() == {"tokens": {}}
@@ -0,0 +1,97 @@
+"""
+Unit tests for adopting an existing organization.
+"""
+
+import pytest
+import yaml
+
+from modules.bulk_import import (
+    MEMBERS_SECTION,
+    REPOSITORIES_SECTION,
+    append_entries,
+    build_import_plan,
+)
+from modules.config_model import validate
+from modules.fake_github import FakeGitHubServer
+from modules.github_client import GitHubClient
+from modules.org_state import fetch_org_state
+from modules.synthetic_org import generate_org
+
+VALUES = """\
+github_organization_members:
+  # Platform Team Members
+  - name: Ada Admin
+    github-role: admin
+    github-username: User-000000
+
+github_repositories:
+  # Chapter 1 Repos
+  - name: repo-000000
+    description: Already managed
+"""
+
+
+@pytest.mark.unit
+class TestBulkImport:
+    """Test import planning against a fake org and config appends."""
+
+    def test_plan_covers_unmanaged_entities(self):
+        org = generate_org(owner="acme", repos=240, members=130, seed=11)
+        with FakeGitHubServer(org) as server:
+            state = fetch_org_state(GitHubClient("fake-token", server.url), "acme")
+        plan = build_import_plan(state, validate(yaml.safe_load(VALUES)), "acme")
+
+        public = [r for r in org.repositories if r.visibility == "public"]
+        protected = [r for r in public[1:] if r.protection]
+        by_type = {}
+        for resource in plan.resources:
+            by_type.setdefault(resource["type"].rsplit(":", 1)[1], []).append(resource)
+
+        assert len(plan.members) == len(org.members) - 1
+        assert len(by_type["Repository"]) == len(public) - 1
+        assert len(by_type["BranchProtection"]) == len(protected)
+        assert len(plan.skipped) == len(org.repositories) - len(public)
+        assert by_type["Membership"][0] == {
+            "type": "github:index/membership:Membership",
+            "name": "github_membership_for_user-000001",
+            "id": "acme:user-000001",
+        }
+        assert by_type["BranchProtection"][0]["id"].endswith(":main")
+
+    def test_roster_members_are_managed(self, tmp_path):
+        org = generate_org(owner="acme", repos=0, members=5, seed=11)
+        roster = tmp_path / "roster.csv"
+        roster.write_text("login\nUSER-000001\nuser-000002\n")
+        values = yaml.safe_load(VALUES)
+        values["github_member_sources"] = [
+            {"path": str(roster), "columns": {"github-username": "login"}}
+        ]
+
+        plan = build_import_plan(org.to_state(), validate(values), "acme")
+
+        assert [m["github-username"] for m in plan.members] == [
+            "user-000003",
+            "user-000004",
+        ]
+
+    def test_append_entries_keeps_comments_and_order(self, tmp_path):
+        path = tmp_path / "values.yaml"
+        path.write_text(VALUES)
+
+        append_entries(
+            path,
+            MEMBERS_SECTION,
+            [{"name": "bob", "github-role": "member", "github-username": "bob"}],
+        )
+        append_entries(path, REPOSITORIES_SECTION, [{"name": "new-repo"}])
+        append_entries(path, "extra_section", [{"name": "x"}])
+
+        text = path.read_text()
+        data = yaml.safe_load(text)
+        assert "# Chapter 1 Repos" in text
+        assert [m["name"] for m in data[MEMBERS_SECTION]] == ["Ada Admin", "bob"]
+        assert [r["name"] for r in data[REPOSITORIES_SECTION]] == [
+            "repo-000000",
+            "new-repo",
+        ]
+        assert data["extra_section"] == [{"name": "x"}]
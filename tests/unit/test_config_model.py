@@ -0,0 +1,93 @@
+"""
+Unit tests for the typed values file model and its validator.
+"""
+
+import time
+
+import pytest
+
+from modules.config_model import (
+    ConfigError,
+    Member,
+    Repository,
+    load_config,
+    validate,
+)
+
+
+def _values(members, repositories=()):
+    return {
+        "github_organization_members": list(members),
+        "github_repositories": list(repositories),
+    }
+
+
+@pytest.mark.unit
+class TestConfigModel:
+    """Test record building, error locations and validation speed."""
+
+    def test_builds_records_with_defaults(self):
+        config = validate(
+            _values(
+                [{"name": "Ada", "github-username": "ada", "email": "ada@example.com"}],
+                [{"name": "platform-core"}],
+            )
+        )
+
+        assert config.members == (Member("Ada", "ada", "member", "ada@example.com"),)
+        assert config.repositories == (Repository("platform-core", ""),)
+        assert not hasattr(config.members[0], "__dict__")
+
+    def test_reports_every_problem_with_its_location(self):
+        data = _values(
+            [
+                {"name": "Ada", "github-username": "ada", "github-role": "owner"},
+                {"name": "Bob", "github-usrname": "bob"},
+                {"name": "Ada Again", "github-username": "ADA"},
+            ],
+            [{"name": "platform-core", "description": 42}, {"name": "Platform-Core"}],
+        )
+        data["github_teams"] = []
+
+        with pytest.raises(ConfigError) as raised:
+            validate(data, "values.yaml")
+
+        assert [str(issue) for issue in raised.value.issues] == [
+            "github_teams: unknown top-level key",
+            "github_organization_members[0].github-role: "
+            "'owner' is not one of admin, member",
+            "github_organization_members[1].github-usrname: unknown key",
+            "github_organization_members[1].github-username: is required",
+            "github_organization_members[2].github-username: "
+            "'ADA' duplicates github_organization_members[0]",
+            "github_repositories[0].description: expected a string, got int",
+            "github_repositories[1].name: "
+            "'Platform-Core' duplicates github_repositories[0]",
+        ]
+        assert "7 problem(s) in values.yaml" in str(raised.value)
+
+    def test_empty_sections_and_wrong_shapes(self):
+        assert validate({"github_repositories": None}).repositories == ()
+        assert validate(None).members == ()
+        with pytest.raises(ConfigError, match="github_repositories: expected a list"):
+            validate({"github_repositories": {"name": "x"}})
+
+    def test_repository_values_file_is_valid(self):
+        config = load_config()
+
+        assert config.members and config.repositories
+
+    def test_validates_50000_entries_quickly(self):
+        data = _values(
+            (
+                {"name": f"Member {i}", "github-username": f"user-{i}"}
+                for i in range(25_000)
+            ),
+            ({"name": f"repo-{i}", "description": "x"} for i in range(25_000)),
+        )
+
+        started = time.perf_counter()
+        config = validate(data)
+
+        assert len(config.members) + len(config.repositories) == 50_000
+        assert time.perf_counter() - started < 1.0
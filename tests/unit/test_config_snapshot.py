@@ -0,0 +1,96 @@
+"""
+Unit tests for the compiled values file snapshot.
+"""
+
+import pytest
+import yaml
+
+from modules import config_snapshot
+from modules.config_model import ConfigError, load_config
+from modules.config_snapshot import (
+    HEADER,
+    compile_config,
+    decode,
+    encode,
+    load,
+    main,
+    read_snapshot,
+)
+
+VALUES = {
+    "github_repository_profiles": {"service": {"topics": ["svc"]}},
+    "github_organization_members": [
+        {"name": "Ada", "github-username": "ada", "github-role": "admin"}
+    ],
+    "github_repositories": [
+        {"name": "api", "profile": "service"},
+        {"name": "web", "profile": "service"},
+        {"name": "docs", "visibility": "private"},
+    ],
+    "github_member_sources": [
+        {"path": "hr.csv", "columns": {"name": "Full Name"}, "where": {"A": "b"}}
+    ],
+}
+
+
+@pytest.fixture
+def values(tmp_path):
+    path = tmp_path / "values.yaml"
+    path.write_text(yaml.safe_dump(VALUES))
+    return path
+
+
+@pytest.mark.unit
+class TestConfigSnapshot:
+    """Test round trips, freshness and the fallback to the values file."""
+
+    def test_round_trip_keeps_records_and_shared_settings(self, values):
+        config = load_config(values)
+
+        decoded = decode(encode(config))
+
+        assert decoded == config
+        api, web, _ = decoded.repositories
+        assert api.settings is web.settings
+
+    def test_fresh_snapshot_is_loaded_without_parsing(
+        self, values, tmp_path, monkeypatch
+    ):
+        snapshot = tmp_path / "build" / "config.snapshot"
+        digest = compile_config(values, snapshot)
+
+        assert snapshot.read_bytes()[6 : HEADER.size - 8].hex() == digest
+        monkeypatch.setattr(config_snapshot, "load_values", None)
+        assert load(values, snapshot) == load_config(values)
+
+    def test_stale_or_broken_snapshot_falls_back(self, values, tmp_path):
+        snapshot = tmp_path / "config.snapshot"
+        compile_config(values, snapshot)
+        values.write_text(yaml.safe_dump({**VALUES, "github_repositories": []}))
+
+        assert read_snapshot(values, snapshot) is None
+        assert load(values, snapshot).repositories == ()
+
+        snapshot.write_bytes(b"PTCS")
+        assert read_snapshot(values, snapshot) is None
+        assert read_snapshot(values, tmp_path / "missing") is None
+
+    def test_invalid_values_file_is_not_compiled(self, tmp_path, capsys):
+        path = tmp_path / "values.yaml"
+        path.write_text(
+            yaml.safe_dump({"github_repositories": [{"name": "a"}, {"name": "A"}]})
+        )
+        snapshot = tmp_path / "config.snapshot"
+
+        with pytest.raises(ConfigError):
+            compile_config(path, snapshot)
+        assert main(["--config", str(path), "--output", str(snapshot)]) == 1
+        assert not snapshot.exists()
+
+    def test_check_reports_freshness(self, values, tmp_path, capsys):
+        args = ["--config", str(values), "--output", str(tmp_path / "s")]
+
+        assert main([*args, "--check"]) == 1
+        assert main(args) == 0
+        assert main([*args, "--check"]) == 0
+        assert "fresh" in capsys.readouterr().out
@@ -0,0 +1,83 @@
+"""
+Unit tests for the cross-file conflict index.
+"""
+
+import time
+
+import pytest
+import yaml
+
+from modules.config_model import ConfigError, validate
+from modules.conflicts import find_conflicts, main
+
+
+@pytest.mark.unit
+class TestConflicts:
+    """Test duplicate, case and resource-name collisions across files."""
+
+    def test_conflicts_across_files(self):
+        first = {
+            "github_organization_members": [{"name": "Ada", "github-username": "ada"}],
+            "github_repositories": [{"name": "Platform-Core"}],
+        }
+        second = {
+            "github_organization_members": [
+                {"name": "Ada", "github-username": "ada-l"},
+                {"name": "Ada L", "github-username": "ADA"},
+            ],
+            "github_repositories": [{"name": "platform-core"}, {"name": "docs"}],
+        }
+
+        conflicts = find_conflicts([("a.yaml", first), ("b.yaml", second)])
+
+        assert [str(c) for c in conflicts] == [
+            "b.yaml: github_organization_members[0].name: resource name "
+            "'github_membership_for_Ada' is already used, first at "
+            "a.yaml: github_organization_members[0].name",
+            "b.yaml: github_organization_members[1].github-username: "
+            "'ADA' collides case-insensitively with 'ada' at "
+            "a.yaml: github_organization_members[0].github-username",
+            "b.yaml: github_repositories[0].name: 'platform-core' collides "
+            "case-insensitively with 'Platform-Core' at "
+            "a.yaml: github_repositories[0].name",
+        ]
+
+    def test_duplicates_within_a_file_are_left_to_validation(self):
+        first = {"github_repositories": [{"name": "docs"}, {"name": "Docs"}]}
+        second = {
+            "github_repositories": [{"name": "docs"}, "docs", {}, {"name": "api"}],
+            "github_member_sources": [{"path": "people.csv"}, {"path": "people.csv"}],
+        }
+
+        (conflict,) = find_conflicts([("a.yaml", first), ("b.yaml", second)])
+
+        assert not conflict.case_only
+        assert str(conflict) == (
+            "b.yaml: github_repositories[0].name: duplicate 'docs', "
+            "first at a.yaml: github_repositories[0].name"
+        )
+        with pytest.raises(ConfigError, match="duplicates github_repositories"):
+            validate(first)
+
+    def test_cli_checks_every_file(self, tmp_path, capsys):
+        for name, repo in (("a.yaml", "Core"), ("b.yaml", "core")):
+            (tmp_path / name).write_text(
+                yaml.safe_dump({"github_repositories": [{"name": repo}]})
+            )
+
+        assert main([str(tmp_path / "a.yaml"), str(tmp_path / "b.yaml")]) == 1
+        assert "collides case-insensitively" in capsys.readouterr().err
+        assert main([str(tmp_path / "a.yaml")]) == 0
+
+    def test_indexes_100000_entries_in_linear_time(self):
+        data = {
+            "github_organization_members": [
+                {"name": f"Member {i}", "github-username": f"user-{i}"}
+                for i in range(50_000)
+            ],
+            "github_repositories": [{"name": f"repo-{i}"} for i in range(50_000)],
+        }
+
+        started = time.perf_counter()
+        assert find_conflicts([("a.yaml", data), ("b.yaml", {})]) == []
+        assert time.perf_counter() - started < 1.0
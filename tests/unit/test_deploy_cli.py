@@ -0,0 +1,51 @@
+"""
+Unit tests for the platform-admin deploy CLI helpers.
+"""
+
+import pytest
+
+from modules import deploy_cli
+
+
+@pytest.mark.unit
+class TestDeployCli:
+    """Test environment reuse and parallel quality checks."""
+
+    def test_environment_is_reused_until_the_lock_changes(self, tmp_path, monkeypatch):
+        venv = tmp_path / ".venv"
+        (venv / "bin").mkdir(parents=True)
+        (venv / "bin" / "python").touch()
+        (tmp_path / "uv.lock").write_text("version = 1\n")
+        syncs = []
+        monkeypatch.setattr(deploy_cli, "PROJECT_ROOT", tmp_path)
+        monkeypatch.setattr(deploy_cli, "VENV_DIR", venv)
+        monkeypatch.setattr(deploy_cli, "ENV_STAMP", venv / "stamp")
+        monkeypatch.setattr(
+            deploy_cli.subprocess, "run", lambda cmd, **kwargs: syncs.append(cmd)
+        )
+
+        assert deploy_cli.ensure_environment() is True
+        assert deploy_cli.ensure_environment() is False
+        (tmp_path / "uv.lock").write_text("version = 2\n")
+        assert deploy_cli.ensure_environment() is True
+        assert deploy_cli.ensure_environment(rebuild=True) is True
+        assert len(syncs) == 3
+
+    def test_quality_checks_run_concurrently(self, capsys):
+        sleep = ["timeit", "-n", "1", "-r", "1", "import time; time.sleep(0.5)"]
+        checks = {f"check-{i}": sleep for i in range(4)}
+        checks["failing"] = ["json.tool", "--no-such-flag"]
+
+        results = deploy_cli.run_quality_checks(checks)
+
+        assert [r.name for r in results] == list(checks)
+        assert [r.passed for r in results] == [True] * 4 + [False]
+        assert max(r.seconds for r in results[:4]) < 4 * 0.5
+        assert "FAILED" in capsys.readouterr().out
+
+    def test_plugin_cache_dir_honours_pulumi_home(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PULUMI_HOME", str(tmp_path))
+        plugin = deploy_cli.Plugin("github", "6.7.0")
+
+        assert plugin.cache_dir() == tmp_path / "plugins" / "resource-github-v6.7.0"
+        assert deploy_cli.prewarm_plugins([]) == []
@@ -0,0 +1,59 @@
+"""
+Unit tests for the content-hash deploy gate.
+"""
+
+import pytest
+
+from modules.deploy_plan import CHANGED, UNCHANGED, UNKNOWN, compute_digest, plan
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "__main__.py").write_text("print('program')\n")
+    (tmp_path / "Pulumi.yaml").write_text("name: platform-team-admin\n")
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "platform_team_values.yaml").write_text("a: 1\n")
+    (tmp_path / "modules").mkdir()
+    (tmp_path / "modules" / "helpers.py").write_text("X = 1\n")
+    return tmp_path
+
+
+@pytest.mark.unit
+class TestDeployPlan:
+    """Test which files change the deploy digest and the resulting plan."""
+
+    def test_ignores_files_outside_the_inputs(self, project):
+        before = compute_digest(project, "dev")
+        (project / "README.md").write_text("docs\n")
+        (project / "scripts").mkdir()
+        (project / "scripts" / "local-deploy.sh").write_text("echo\n")
+        (project / "modules" / "__pycache__").mkdir()
+        (project / "modules" / "__pycache__" / "helpers.cpython-313.pyc").write_bytes(
+            b"\0"
+        )
+
+        assert compute_digest(project, "dev") == before
+
+    @pytest.mark.parametrize(
+        "path",
+        ["config/platform_team_values.yaml", "modules/helpers.py", "__main__.py"],
+    )
+    def test_input_changes_change_the_digest(self, project, path):
+        before = compute_digest(project, "dev")
+        (project / path).write_text("changed\n")
+
+        assert compute_digest(project, "dev") != before
+
+    def test_stack_config_is_per_stack(self, project):
+        dev, prod = compute_digest(project, "dev"), compute_digest(project, "prod")
+        (project / "Pulumi.dev.yaml").write_text("config: {}\n")
+
+        assert compute_digest(project, "dev") != dev
+        assert compute_digest(project, "prod") == prod
+
+    def test_plan_status(self, project):
+        digest = compute_digest(project, "dev")
+
+        assert plan("dev", digest, project).status == UNCHANGED
+        assert plan("dev", "0" * 64, project).status == CHANGED
+        assert plan("dev", None, project).status == UNKNOWN
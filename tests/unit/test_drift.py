@@ -0,0 +1,235 @@
+"""
+Unit tests for the desired-vs-actual drift engine.
+"""
+
+import json
+import time
+
+import pytest
+
+from modules.config_model import validate
+from modules.drift import EXTRA, MISMATCH, MISSING, compute_drift, desired_state
+from modules.github_client import GitHubClient, Request, Response
+from modules.org_state import (
+    BranchProtectionState,
+    MemberState,
+    OrgState,
+    RepositoryState,
+    fetch_org_state,
+)
+
+PROTECTED = BranchProtectionState("main", True, True)
+
+VALUES = validate(
+    {
+        "github_organization_members": [
+            {"name": "Ada", "github-username": "Ada", "github-role": "admin"},
+            {"name": "Bob", "github-username": "bob"},
+        ],
+        "github_repositories": [
+            {"name": "platform-core", "description": "Core platform runtime"},
+            {"name": "platform-docs"},
+        ],
+    }
+)
+
+
+@pytest.mark.unit
+class TestComputeDrift:
+    """Test keyed diffing of organization state."""
+
+    def test_matching_state_has_no_drift(self):
+        desired = desired_state(VALUES)
+        actual = OrgState.build(
+            members=[MemberState("ada", "admin"), MemberState("bob", "member")],
+            repositories=[
+                RepositoryState(
+                    "platform-core", "Core platform runtime", "public", PROTECTED
+                ),
+                RepositoryState("Platform-Docs", "", "public", PROTECTED),
+            ],
+        )
+
+        report = compute_drift(desired, actual)
+
+        assert not report.has_drift
+
+    def test_reports_missing_extra_and_mismatched(self):
+        desired = desired_state(VALUES)
+        actual = OrgState.build(
+            members=[MemberState("ada", "member"), MemberState("mallory", "admin")],
+            repositories=[
+                RepositoryState(
+                    "platform-core",
+                    "Old description",
+                    "private",
+                    BranchProtectionState("main", False, True),
+                ),
+            ],
+        )
+
+        report = compute_drift(desired, actual)
+        found = {(i.kind, i.key, i.change, i.field) for i in report.items}
+
+        assert found == {
+            ("member", "bob", MISSING, None),
+            ("member", "mallory", EXTRA, None),
+            ("member", "ada", MISMATCH, "role"),
+            ("repository", "platform-docs", MISSING, None),
+            ("repository", "platform-core", MISMATCH, "description"),
+            ("repository", "platform-core", MISMATCH, "visibility"),
+            ("repository", "platform-core", MISMATCH, "protection.enforce_admins"),
+        }
+        assert report.summary()["member"] == {MISSING: 1, EXTRA: 1, MISMATCH: 1}
+        json.dumps(report.to_dict())
+
+    def test_missing_protection_and_opt_outs(self):
+        desired = desired_state(VALUES)
+        actual = OrgState.build(
+            members=[MemberState("ada", "admin"), MemberState("bob", "member")],
+            repositories=[
+                RepositoryState("platform-core", "Core platform runtime", "public"),
+                RepositoryState("platform-docs", "", "public", PROTECTED),
+                RepositoryState("unmanaged", "", "private"),
+            ],
+        )
+
+        report = compute_drift(desired, actual)
+        assert [(i.key, i.change, i.field) for i in report.items] == [
+            ("unmanaged", EXTRA, None),
+            ("platform-core", MISMATCH, "protection"),
+        ]
+
+        report = compute_drift(
+            desired, actual, include_extra=False, include_protection=False
+        )
+        assert not report.has_drift
+
+    def test_compares_profile_settings_known_on_both_sides(self):
+        config = validate(
+            {
+                "github_repository_profiles": {
+                    "service": {
+                        "visibility": "internal",
+                        "topics": ["service", "platform"],
+                        "allow-merge-commit": False,
+                        "allow-squash-merge": True,
+                        "enforce-admins": False,
+                    }
+                },
+                "github_repositories": [{"name": "billing", "profile": "service"}],
+            }
+        )
+        relaxed = BranchProtectionState("main", False, True)
+        actual = OrgState.build(
+            repositories=[
+                RepositoryState(
+                    "billing",
+                    "",
+                    "internal",
+                    relaxed,
+                    topics=("platform",),
+                    allow_merge_commit=True,
+                    allow_rebase_merge=True,
+                )
+            ]
+        )
+
+        report = compute_drift(desired_state(config), actual)
+
+        # allow_squash_merge is unknown and allow_rebase_merge is unmanaged
+        assert [(i.field, i.expected, i.actual) for i in report.items] == [
+            ("topics", ("platform", "service"), ("platform",)),
+            ("allow_merge_commit", False, True),
+        ]
+
+    def test_large_org_diff_is_fast(self):
+        count = 20_000
+        desired = OrgState.build(
+            members=(MemberState(f"user-{i}", "member") for i in range(count)),
+            repositories=(
+                RepositoryState(f"repo-{i}", "", "public", PROTECTED)
+                for i in range(count)
+            ),
+        )
+        actual = OrgState.build(
+            members=(MemberState(f"user-{i}", "member") for i in range(1, count + 1)),
+            repositories=(
+                RepositoryState(f"repo-{i}", "", "public", PROTECTED)
+                for i in range(count)
+            ),
+        )
+
+        start = time.perf_counter()
+        report = compute_drift(desired, actual)
+        elapsed = time.perf_counter() - start
+
+        assert len(report.items) == 2
+        assert elapsed < 2.0
+
+
+@pytest.mark.unit
+def test_fetch_org_state_follows_pagination():
+    """Verify org state is pulled in bulk across paginated responses."""
+    pages = {
+        "https://api.test/orgs/acme/members?per_page=100&role=admin": (
+            [{"login": "Ada"}],
+            "",
+        ),
+        "https://api.test/orgs/acme/members?per_page=100&role=member": (
+            [{"login": "bob"}],
+            '<https://api.test/page2>; rel="next"',
+        ),
+        "https://api.test/page2": ([{"login": "carol"}], ""),
+        "https://api.test/orgs/acme/repos?per_page=100&type=all": (
+            [{"name": "core", "description": None, "visibility": "public"}],
+            "",
+        ),
+    }
+    protection = {
+        "enforce_admins": {"enabled": True},
+        "required_signatures": {"enabled": False},
+    }
+
+    def transport(request: Request) -> Response:
+        if request.url.endswith("/branches/main/protection"):
+            return Response(200, {}, json.dumps(protection).encode())
+        body, link = pages[request.url]
+        return Response(200, {"link": link}, json.dumps(body).encode())
+
+    state = fetch_org_state(
+        GitHubClient("token", "https://api.test", transport), "acme"
+    )
+
+    assert state.members["ada"] == MemberState("Ada", "admin")
+    assert set(state.members) == {"ada", "bob", "carol"}
+    assert state.repositories["core"] == RepositoryState(
+        "core", "", "public", BranchProtectionState("main", True, False)
+    )
+
+
+@pytest.mark.unit
+def test_fetch_org_state_reads_protection_for_managed_repos_only():
+    """Verify unmanaged repositories cost no protection requests."""
+    repos = [{"name": name, "visibility": "public"} for name in ("Core", "other")]
+    requested = []
+
+    def transport(request: Request) -> Response:
+        requested.append(request.url)
+        if request.url.endswith("/branches/main/protection"):
+            body = {"enforce_admins": {"enabled": True}}
+            return Response(200, {}, json.dumps(body).encode())
+        body = repos if "/repos?" in request.url else []
+        return Response(200, {"link": ""}, json.dumps(body).encode())
+
+    state = fetch_org_state(
+        GitHubClient("token", "https://api.test", transport),
+        "acme",
+        protected_repos=["core"],
+    )
+
+    assert [url for url in requested if "protection" in url] == [
+        "https://api.test/repos/acme/Core/branches/main/protection"
+    ]
+    assert state.repositories["core"].protection is not None
+    assert state.repositories["other"].protection is None
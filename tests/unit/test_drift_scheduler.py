@@ -0,0 +1,145 @@
+"""
+Unit tests for the rotating drift refresh scheduler.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from modules import drift_scheduler
+from modules.config_model import validate
+from modules.drift_scheduler import drifted_urns, managed_resources, select_targets
+
+HOUR = 3600.0
+# pulumi refresh --preview-only --json for part of the CONFIG stack
+REFRESH_PREVIEW = Path(__file__).parent / "data" / "refresh-preview.json"
+
+
+CONFIG = validate(
+    {
+        "github_organization_members": [
+            {"name": "Ada", "github-username": "ada", "github-role": "admin"},
+            {"name": "Bob", "github-username": "bob"},
+        ],
+        "github_repositories": [{"name": f"repo-{i:02d}"} for i in range(23)],
+    }
+)
+
+
+@pytest.fixture
+def resources():
+    return managed_resources(CONFIG, "dev")
+
+
+@pytest.mark.unit
+class TestDriftScheduler:
+    """Test slice selection, priorities and full coverage."""
+
+    def test_high_risk_resources(self, resources):
+        high_risk = {r.urn.rsplit("::", 1)[1] for r in resources if r.high_risk}
+
+        assert len(resources) == 2 + 2 * 23
+        assert "github_membership_for_Ada" in high_risk
+        assert "github_membership_for_Bob" not in high_risk
+        assert "repo-00-main-branch-protection" in high_risk
+        assert "repo-00" not in high_risk
+
+    def test_rotation_covers_everything_within_the_slice_count(self, resources):
+        refreshed = {}
+        seen = set()
+
+        for run in range(1, 25):
+            now = run * HOUR
+            # 48 resources over 24 runs, plus two priority slots per run
+            targets = select_targets(resources, refreshed, now, 2, 2)
+            refreshed.update(dict.fromkeys(targets, now))
+            seen.update(targets)
+            assert len(targets) == 4
+
+        assert seen == {r.urn for r in resources}
+
+    def test_priorities(self, resources):
+        by_name = {r.urn.rsplit("::", 1)[1]: r.urn for r in resources}
+        now = 10 * HOUR
+        refreshed = {r.urn: now - HOUR for r in resources}
+        refreshed[by_name["repo-05"]] = now - 5 * HOUR
+        refreshed[by_name["repo-06-main-branch-protection"]] = now - 2 * HOUR
+        refreshed[by_name["repo-07"]] = now - 30 * HOUR
+        del refreshed[by_name["repo-08"]]
+
+        targets = select_targets(
+            resources,
+            refreshed,
+            now,
+            budget=2,
+            priority_budget=2,
+            changed={by_name["repo-09"]},
+        )
+
+        assert targets == [
+            by_name["repo-08"],  # never refreshed
+            by_name["repo-07"],  # oldest
+            by_name["repo-09"],  # config changed
+            # 2h at high-risk weight beats 5h for a normal resource
+            by_name["repo-06-main-branch-protection"],
+        ]
+
+    def test_budget_is_respected(self, resources):
+        assert select_targets(resources, {}, 0.0, budget=3) == [
+            r.urn for r in resources[:3]
+        ]
+
+    def test_drifted_resources_come_first(self, resources):
+        by_name = {r.urn.rsplit("::", 1)[1]: r.urn for r in resources}
+        refreshed = dict.fromkeys((r.urn for r in resources), 0.0)
+
+        targets = select_targets(
+            resources,
+            refreshed,
+            HOUR,
+            budget=1,
+            priority_budget=2,
+            changed={by_name["repo-09"]},
+            drifted={by_name["repo-10"]},
+        )
+
+        assert targets[1:] == [by_name["repo-10"], by_name["repo-09"]]
+
+    def test_drift_keeps_the_rotation_moving(
+        self, resources, tmp_path, monkeypatch, capsys
+    ):
+        deployed = {r.urn for r in resources}
+        by_name = {r.urn.rsplit("::", 1)[1]: r.urn for r in resources}
+        drifted_urn = by_name["github_membership_for_Ada"]
+        monkeypatch.setattr(drift_scheduler.config_snapshot, "load", lambda _: CONFIG)
+        monkeypatch.setattr(drift_scheduler, "deployed_urns", lambda _: deployed)
+        monkeypatch.setattr(drift_scheduler, "_head_commit", lambda: "abc")
+        monkeypatch.setattr(
+            drift_scheduler,
+            "refresh",
+            lambda _, targets: {drifted_urn} & set(targets),
+        )
+        state = tmp_path / "schedule.json"
+        argv = ["--state", str(state), "--priority-budget", "0"]
+
+        assert drift_scheduler.main(argv) == 1
+        first = drift_scheduler.load_schedule(state)
+        assert drift_scheduler.main(argv) == 0
+        second = drift_scheduler.load_schedule(state)
+
+        assert first["drifted"] == [drifted_urn]
+        assert set(second["refreshed"]) > set(first["refreshed"])
+        assert second["drifted"] == [drifted_urn]
+
+    def test_drifted_urns_from_preview_json(self, resources):
+        by_name = {r.urn.rsplit("::", 1)[1]: r.urn for r in resources}
+        preview = json.loads(REFRESH_PREVIEW.read_text())
+
+        # Unchanged refresh steps are not drift
+        assert drifted_urns(preview) == {
+            by_name["github_membership_for_Ada"],
+            by_name["repo-00"],
+            by_name["repo-00-main-branch-protection"],
+        }
+        assert drifted_urns({}) == set()
@@ -0,0 +1,90 @@
+"""
+Unit tests for the local fake GitHub API.
+"""
+
+import pytest
+
+from modules.drift import compute_drift
+from modules.fake_github import FakeGitHubServer
+from modules.github_client import GitHubAPIError, GitHubClient
+from modules.org_state import fetch_org_state
+from modules.synthetic_org import generate_org
+
+
+@pytest.fixture
+def org():
+    return generate_org(owner="acme", repos=250, members=120, seed=7)
+
+
+@pytest.mark.unit
+class TestFakeGitHubServer:
+    """Test the fake server against the real client code paths."""
+
+    def test_org_state_round_trips(self, org):
+        with FakeGitHubServer(org) as server:
+            client = GitHubClient("fake-token", server.url)
+            actual = fetch_org_state(client, "acme")
+
+        assert not compute_drift(org.to_state(), actual).has_drift
+        # 3 member pages + 3 repo pages + one protection read per repo
+        assert server.request_count == 3 + 3 + len(org.repositories)
+
+    def test_pagination_headers(self, org):
+        with FakeGitHubServer(org, default_per_page=30) as server:
+            response = GitHubClient("fake-token", server.url).request(
+                "GET", "orgs/acme/repos", {"per_page": 100, "page": 2}
+            )
+
+        assert len(response.json()) == 100
+        assert 'rel="next"' in response.headers["link"]
+        assert 'rel="prev"' in response.headers["link"]
+
+    def test_rate_limit_is_enforced(self, org):
+        with FakeGitHubServer(org, rate_limit=2) as server:
+            client = GitHubClient("fake-token", server.url)
+            first = client.request("GET", "orgs/acme")
+            client.get("orgs/acme")
+            with pytest.raises(GitHubAPIError) as exc_info:
+                client.get("orgs/acme")
+
+        assert first.headers["x-ratelimit-remaining"] == "1"
+        assert exc_info.value.status == 403
+
+    def test_repository_crud(self, org):
+        with FakeGitHubServer(org) as server:
+            client = GitHubClient("fake-token", f"{server.url}/api/v3")
+            created = client.request(
+                "POST", "orgs/acme/repos", json_body={"name": "new-repo"}
+            )
+            client.request(
+                "PATCH",
+                "repos/acme/new-repo",
+                json_body={"description": "updated", "visibility": "private"},
+            )
+            repo = client.get("repos/acme/new-repo")
+            client.request("DELETE", "repos/acme/new-repo")
+            with pytest.raises(GitHubAPIError):
+                client.get("repos/acme/new-repo")
+
+        assert created.status == 201
+        assert (repo["description"], repo["visibility"]) == ("updated", "private")
+
+    def test_invalid_page_parameters_are_rejected(self, org):
+        with FakeGitHubServer(org) as server:
+            client = GitHubClient("fake-token", server.url)
+            statuses = [
+                client.request("GET", "orgs/acme/members", query).status
+                for query in ({"per_page": "many"}, {"page": "x"}, {"page": 0})
+            ]
+
+        assert statuses == [422, 422, 422]
+
+    def test_listings_follow_repository_changes(self, org):
+        with FakeGitHubServer(org) as server:
+            client = GitHubClient("fake-token", server.url)
+            before = list(client.paginate("orgs/acme/repos"))
+            client.request("POST", "orgs/acme/repos", json_body={"name": "new-repo"})
+            after = list(client.paginate("orgs/acme/repos"))
+
+        assert len(after) == len(before) + 1
+        assert "new-repo" in {repo["name"] for repo in after}
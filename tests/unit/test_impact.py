@@ -0,0 +1,185 @@
+"""
+Unit tests for config change-impact planning.
+"""
+
+import subprocess
+
+import pytest
+import yaml
+
+from modules import impact
+from modules.impact import ADDED, CHANGED, REMOVED, compute_impact
+
+BASE = {
+    "github_organization_members": [
+        {"name": "Ada", "github-username": "ada", "github-role": "admin"},
+        {"name": "Bob", "github-username": "bob", "github-role": "member"},
+        {"name": "Cy", "github-username": "cy", "email": "cy@example.com"},
+    ],
+    "github_repositories": [
+        {"name": "platform-core", "description": "Core"},
+        {"name": "platform-docs", "description": "Docs"},
+    ],
+}
+
+
+def urn(resource_type, name):
+    return f"urn:pulumi:dev::platform-team-admin::github:index/{resource_type}::{name}"
+
+
+def edited(**changes):
+    data = yaml.safe_load(yaml.safe_dump(BASE))
+    for section, entries in changes.items():
+        data[section] = entries
+    return data
+
+
+@pytest.mark.unit
+class TestComputeImpact:
+    """Test mapping config entries to targeted URNs."""
+
+    def test_unchanged_config_targets_nothing(self):
+        result = compute_impact(BASE, edited(), "dev")
+
+        assert not result.full
+        assert result.targets == set()
+        assert result.pulumi_args() == []
+
+    def test_member_changes(self):
+        members = edited()["github_organization_members"]
+        members[0]["github-role"] = "member"
+        members[1]["github-username"] = "bobby"
+        members[2]["email"] = "cy@example.org"
+        members.append({"name": "Dee", "github-username": "dee"})
+
+        result = compute_impact(
+            BASE, edited(github_organization_members=members), "dev"
+        )
+
+        assert result.targets == {
+            urn("membership:Membership", "github_membership_for_Ada"),
+            urn("membership:Membership", "github_membership_for_Bob"),
+            urn("membership:Membership", "github_membership_for_Dee"),
+        }
+        assert result.replace == {
+            urn("membership:Membership", "github_membership_for_Bob")
+        }
+        assert {(c["key"], c["change"]) for c in result.changes} == {
+            ("Ada", CHANGED),
+            ("Bob", CHANGED),
+            ("Cy", CHANGED),
+            ("Dee", ADDED),
+        }
+
+    def test_repository_changes(self):
+        repos = [
+            {"name": "platform-core", "description": "Core runtime"},
+            {"name": "platform-apps"},
+        ]
+
+        result = compute_impact(BASE, edited(github_repositories=repos), "dev")
+
+        assert result.targets == {
+            urn("repository:Repository", "platform-core"),
+            urn("repository:Repository", "platform-apps"),
+            urn(
+                "branchProtection:BranchProtection",
+                "platform-apps-main-branch-protection",
+            ),
+            urn("repository:Repository", "platform-docs"),
+            urn(
+                "branchProtection:BranchProtection",
+                "platform-docs-main-branch-protection",
+            ),
+        }
+        assert ("platform-docs", REMOVED) in {
+            (c["key"], c["change"]) for c in result.changes
+        }
+        assert result.pulumi_args()[:2] == [
+            "--target",
+            urn(
+                "branchProtection:BranchProtection",
+                "platform-apps-main-branch-protection",
+            ),
+        ]
+
+    def test_repository_setting_changes(self):
+        repos = [
+            {"name": "platform-core", "description": "Core", "profile": "service"},
+            {"name": "platform-docs", "description": "Docs", "enforce-admins": False},
+        ]
+
+        result = compute_impact(BASE, edited(github_repositories=repos), "dev")
+
+        assert result.targets == {
+            urn("repository:Repository", "platform-core"),
+            urn(
+                "branchProtection:BranchProtection",
+                "platform-core-main-branch-protection",
+            ),
+            urn(
+                "branchProtection:BranchProtection",
+                "platform-docs-main-branch-protection",
+            ),
+        }
+
+    def test_profile_changes_need_full_preview(self):
+        new = edited(github_repository_profiles={"service": {"topics": ["x"]}})
+
+        result = compute_impact(BASE, new, "dev")
+
+        assert result.full
+        assert result.reasons == ["github_repository_profiles changed"]
+
+    def test_member_source_changes_need_full_preview(self):
+        source = {"path": "config/hr.csv", "columns": {"github-username": "Login"}}
+        old = edited(github_member_sources=[source])
+        new = edited(github_member_sources=[{**source, "where": {"Status": "active"}}])
+
+        result = compute_impact(old, new, "dev")
+
+        assert result.full
+        assert result.reasons == ["github_member_sources changed"]
+
+
+@pytest.mark.unit
+class TestPlanImpact:
+    """Test planning between git revisions."""
+
+    @pytest.fixture
+    def repo(self, tmp_path, monkeypatch):
+        def git(*args):
+            subprocess.run(
+                ["git", *args], cwd=tmp_path, check=True, capture_output=True
+            )
+
+        (tmp_path / "config").mkdir()
+        (tmp_path / "modules").mkdir()
+        (tmp_path / "config" / "platform_team_values.yaml").write_text(
+            yaml.safe_dump(BASE)
+        )
+        (tmp_path / "modules" / "program.py").write_text("")
+        git("init", "-q")
+        git("add", ".")
+        git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "base")
+        monkeypatch.setattr(impact, "PROJECT_ROOT", tmp_path)
+        return tmp_path
+
+    def test_config_only_edit_is_targeted(self, repo):
+        repos = BASE["github_repositories"] + [{"name": "platform-new"}]
+        (repo / "config" / "platform_team_values.yaml").write_text(
+            yaml.safe_dump(edited(github_repositories=repos))
+        )
+
+        result = impact.plan_impact("HEAD", None, "dev")
+
+        assert not result.full
+        assert urn("repository:Repository", "platform-new") in result.targets
+
+    def test_program_edit_needs_full_preview(self, repo):
+        (repo / "modules" / "program.py").write_text("# changed\n")
+
+        result = impact.plan_impact("HEAD", None, "dev")
+
+        assert result.full
+        assert result.reasons == ["modules/program.py changed"]
@@ -0,0 +1,131 @@
+"""
+Unit tests for streaming member rosters from CSV and JSON Lines files.
+"""
+
+import json
+import tracemalloc
+
+import pytest
+
+from modules.config_model import ConfigError, Member, validate
+from modules.member_sources import (
+    SourceStats,
+    check_member_sources,
+    iter_members,
+    iter_source_members,
+)
+
+
+def _config(tmp_path, sources, members=()):
+    return validate(
+        {
+            "github_organization_members": list(members),
+            "github_member_sources": [
+                {**source, "path": str(tmp_path / source["path"])} for source in sources
+            ],
+        }
+    )
+
+
+@pytest.mark.unit
+class TestMemberSources:
+    """Test parsing, filtering, normalization and streaming of rosters."""
+
+    def test_csv_with_columns_filter_and_defaults(self, tmp_path):
+        (tmp_path / "hr.csv").write_text(
+            "Full Name,Login,Role,Status\n"
+            "Ada Lovelace, ada ,ADMIN,Active\n"
+            ",bob,,active\n"
+            "Carol,carol,member,left\n"
+            "Dan,,member,active\n",
+            encoding="utf-8-sig",
+        )
+        config = _config(
+            tmp_path,
+            [
+                {
+                    "path": "hr.csv",
+                    "columns": {
+                        "name": "Full Name",
+                        "github-username": "Login",
+                        "github-role": "Role",
+                    },
+                    "where": {"Status": "active"},
+                }
+            ],
+        )
+        stats = SourceStats()
+
+        members = list(iter_source_members(config.member_sources[0], stats))
+
+        assert members == [
+            Member("Ada Lovelace", "ada", "admin"),
+            Member("bob", "bob", "member"),
+        ]
+        assert stats == SourceStats(rows=4, members=2, filtered=1, without_username=1)
+
+    def test_jsonl_source_follows_values_file_members(self, tmp_path):
+        rows = [{"github-username": "ada", "email": "ada@example.com"}, {}]
+        (tmp_path / "roster.jsonl").write_text(
+            "\n".join(json.dumps(row) for row in rows) + "\n\n"
+        )
+        config = _config(
+            tmp_path,
+            [{"path": "roster.jsonl", "default-role": "admin"}],
+            [{"name": "Bob", "github-username": "bob"}],
+        )
+
+        assert list(iter_members(config)) == [
+            Member("Bob", "bob"),
+            Member("ada", "ada", "admin", "ada@example.com"),
+        ]
+
+    def test_check_reports_rows_duplicates_and_columns(self, tmp_path):
+        (tmp_path / "a.jsonl").write_text(
+            '{"github-username": "ada", "github-role": "owner"}\n'
+            "not json\n"
+            '{"github-username": "BOB"}\n'
+        )
+        (tmp_path / "b.csv").write_text("github-username,name\nada,Ada\n")
+        config = _config(
+            tmp_path,
+            [{"path": "a.jsonl"}, {"path": "b.csv", "columns": {"login": "x"}}],
+            [{"name": "Bob", "github-username": "bob"}],
+        )
+        a, b = (source.path for source in config.member_sources)
+
+        with pytest.raises(ConfigError) as raised:
+            check_member_sources(config)
+
+        assert [str(issue) for issue in raised.value.issues] == [
+            f"{a}:1: 'owner' is not one of admin, member",
+            f"{a}:2: invalid JSON line: Expecting value",
+            f"{a}:3: duplicate username 'bob', first at values file",
+            f"{b}: columns.login: not one of name, github-username, "
+            "github-role, email",
+        ]
+
+    def test_missing_source_is_reported(self, tmp_path):
+        config = _config(tmp_path, [{"path": "missing.csv"}])
+
+        with pytest.raises(ConfigError, match="cannot read"):
+            check_member_sources(config)
+
+    def test_large_roster_is_streamed(self, tmp_path):
+        path = tmp_path / "large.csv"
+        with path.open("w") as f:
+            f.write("name,github-username\n")
+            f.writelines(f"Member {i},user-{i}\n" for i in range(50_000))
+        config = _config(tmp_path, [{"path": "large.csv"}])
+
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in iter_members(config))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert count == 50_000
+        # Reading every row at once would take several megabytes
+        assert peak < 512 * 1024
+        assert check_member_sources(config)[str(path)].members == 50_000
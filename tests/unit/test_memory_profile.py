@@ -0,0 +1,95 @@
+"""
+Unit tests for the opt-in memory profiling.
+"""
+
+import json
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+
+from modules import memory_profile, program, tracing
+from modules.memory_profile import MemoryProfiler, instrument, main
+from modules.tracing import Tracer
+
+_retained: list[bytearray] = []
+
+
+def _resource(name, **kwargs):
+    _retained.append(bytearray(64 * 1024))
+    return name
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    profiler = MemoryProfiler()
+    monkeypatch.setattr(memory_profile, "PROFILER", profiler)
+    yield profiler
+    tracemalloc.stop()
+    _retained.clear()
+
+
+@pytest.mark.unit
+class TestMemoryProfile:
+    """Test the disabled fast path, per-type attribution and the report."""
+
+    def test_disabled_returns_the_original_callables(self, monkeypatch):
+        monkeypatch.setattr(memory_profile, "PROFILER", None)
+
+        assert instrument(_resource, "github.Membership") is _resource
+        memory_profile.phase("registered")
+        memory_profile.when_resolved("outputs resolved", [object()])
+
+    def test_attributes_construction_to_resource_types(self, profiler, tmp_path):
+        membership = instrument(_resource, "github.Membership")
+        memory_profile.phase("config loaded")
+
+        assert membership("github_membership_for_Ada") == "github_membership_for_Ada"
+        membership("github_membership_for_Grace")
+        memory_profile.phase("registered")
+
+        stats = profiler.types["github.Membership"]
+        assert stats.count == 2
+        assert stats.bytes_per_resource >= 64 * 1024
+        loaded, registered = profiler.phases
+        assert registered.traced_mb > loaded.traced_mb
+        assert registered.rss_peak_mb > 0
+        where, kib, blocks = registered.top_growth[0]
+        assert where.endswith(
+            f"test_memory_profile.py:{_resource.__code__.co_firstlineno + 1}"
+        )
+        assert kib >= 128
+
+        profiler.write(tmp_path / "out" / "memory.json")
+        report = json.loads((tmp_path / "out" / "memory.json").read_text())
+        assert [p["name"] for p in report["phases"]] == [
+            "config loaded",
+            "registered",
+            "exit",
+        ]
+        assert report["resource_types"]["github.Membership"]["count"] == 2
+
+    def test_summary_lists_phases_and_types(self, profiler, tmp_path, capsys):
+        instrument(_resource, "github.Repository")("repo")
+        profiler.write(tmp_path / "memory.json")
+
+        assert main([str(tmp_path / "memory.json")]) == 0
+        out = capsys.readouterr().out
+        assert "exit" in out
+        assert "github.Repository" in out
+
+    def test_span_bookkeeping_is_not_attributed(self, profiler, monkeypatch):
+        tracer = Tracer()
+        monkeypatch.setattr(tracing, "TRACER", tracer)
+
+        unresolved = SimpleNamespace(apply=lambda callback: None)
+        wrapped = program._instrument(_resource, "github.Team", lambda _: unresolved)
+        wrapped("team")
+
+        # The tracing wrapper is outermost, the memory wrapper calls the SDK
+        assert wrapped.__wrapped__.__wrapped__ is _resource
+        assert [span.name for span in tracer.spans] == [
+            "github.Team",
+            "resolve github.Team",
+        ]
+        assert profiler.types["github.Team"].count == 1
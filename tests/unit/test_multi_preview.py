@@ -0,0 +1,70 @@
+"""
+Unit tests for the concurrent multi-stack preview driver.
+"""
+
+import threading
+
+import pytest
+
+from modules.multi_preview import (
+    StackPreview,
+    login_secrets,
+    merged_summary,
+    render_table,
+    run_previews,
+)
+
+
+@pytest.mark.unit
+class TestMultiPreview:
+    """Test concurrency, error isolation and the merged report."""
+
+    def test_previews_run_concurrently_in_stack_order(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def preview_one(stack):
+            # Deadlocks (and times out) unless both previews run at once
+            barrier.wait()
+            return {"same": 3} if stack == "dev" else {"same": 3, "update": 1}
+
+        previews = run_previews(["dev", "prod"], preview_one)
+
+        assert [p.stack for p in previews] == ["dev", "prod"]
+        assert all(p.passed for p in previews)
+        assert previews[1].change_summary == {"same": 3, "update": 1}
+
+    def test_failing_stack_does_not_hide_others(self):
+        def preview_one(stack):
+            if stack == "prod":
+                raise RuntimeError("stack 'prod' not found")
+            return {"same": 1}
+
+        dev, prod = run_previews(["dev", "prod"], preview_one)
+
+        assert dev.passed and dev.change_summary == {"same": 1}
+        assert not prod.passed
+        assert "not found" in (prod.error or "")
+
+    def test_merged_summary_and_table(self):
+        previews = [
+            StackPreview("dev", {"same": 3, "create": 1}),
+            StackPreview("prod", {"same": 3, "update": 2}),
+        ]
+
+        assert merged_summary(previews) == {"create": 1, "same": 6, "update": 2}
+        table = render_table(previews).splitlines()
+        assert table[0].split() == [
+            "stack",
+            "create",
+            "same",
+            "update",
+            "seconds",
+            "status",
+        ]
+        assert table[-1].split() == ["total", "1", "6", "2"]
+
+    def test_login_secrets(self):
+        item = {"login": {"username": "my-org", "password": "ghp_token"}}
+
+        assert login_secrets(item) == ("my-org", "ghp_token")
+        assert login_secrets({}) == ("", "")
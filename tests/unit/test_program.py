@@ -0,0 +1,158 @@
+"""
+Unit tests for the Pulumi program under the mock runtime.
+
+The mocks record every registered resource and answer the Bitwarden
+invoke with a fake vault item, so the whole program runs without the
+engine, GitHub or Bitwarden. Construction time and allocations are
+budgeted per 1,000 resources to catch regressions before a deploy.
+"""
+
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any
+
+import pulumi
+import pytest
+from pulumi.runtime import mocks, settings
+
+from modules import program
+from modules.config_model import PlatformConfig, validate
+from modules.resource_names import PROJECT_NAME
+from modules.stack_index import INDEX_OUTPUT
+
+# Generous enough for slow CI machines; today's cost is about a third
+SECONDS_PER_1000_RESOURCES = 3.0
+ALLOCATED_MB_PER_1000_RESOURCES = 100.0
+VAULT_ITEM = {"username": "octo-org", "password": "vault-token"}
+
+
+@dataclass
+class ProgramRun:
+    """What one program run registered, invoked and exported."""
+
+    resources: list[pulumi.runtime.MockResourceArgs] = field(default_factory=list)
+    invokes: list[pulumi.runtime.MockCallArgs] = field(default_factory=list)
+    outputs: dict[str, Any] = field(default_factory=dict)
+    construct_seconds: float = 0.0
+    peak_allocated_mb: float = 0.0
+
+    def named(self, kind: str) -> dict[str, dict[str, Any]]:
+        return {r.name: r.inputs for r in self.resources if r.typ == kind}
+
+
+class _RecordingMocks(pulumi.runtime.Mocks):
+    def __init__(self, run: ProgramRun):
+        self.run = run
+
+    def new_resource(self, args):
+        self.run.resources.append(args)
+        return f"{args.name}-id", args.inputs
+
+    def call(self, args):
+        self.run.invokes.append(args)
+        return VAULT_ITEM
+
+
+@pytest.fixture
+def run_program(monkeypatch):
+    """Run the program under mocks and wait for every registration."""
+    # The mock monitor answers RegisterPackage, but the SDK only registers
+    # the parameterized Bitwarden provider, and so can only invoke it, when
+    # the monitor claims parameterization support (as the benchmark does)
+    monkeypatch.setattr(
+        settings, "_sync_monitor_supports_parameterization", lambda: True
+    )
+
+    def run(config: PlatformConfig, trace_allocations: bool = False) -> ProgramRun:
+        result = ProgramRun()
+        pulumi.runtime.set_mocks(
+            _RecordingMocks(result), project=PROJECT_NAME, stack="test"
+        )
+        monkeypatch.setattr(program.pulumi, "export", result.outputs.__setitem__)
+
+        def construct() -> None:
+            if trace_allocations:
+                tracemalloc.start()
+            started = time.perf_counter()
+            try:
+                program.run(config=config)
+            finally:
+                result.construct_seconds = time.perf_counter() - started
+                if trace_allocations:
+                    result.peak_allocated_mb = (
+                        tracemalloc.get_traced_memory()[1] / 2**20
+                    )
+                    tracemalloc.stop()
+
+        mocks.test(construct)()
+        return result
+
+    return run
+
+
+def _org(size: int) -> PlatformConfig:
+    return validate(
+        {
+            "github_organization_members": [
+                {"name": f"Member {i}", "github-username": f"user-{i}"}
+                for i in range(size)
+            ],
+            "github_repositories": [{"name": f"repo-{i}"} for i in range(size)],
+        }
+    )
+
+
+@pytest.mark.unit
+class TestProgram:
+    """Test resource counts, names, properties and construction budgets."""
+
+    def test_registers_expected_resources(self, run_program):
+        config = validate(
+            {
+                "github_repository_profiles": {"internal": {"visibility": "private"}},
+                "github_organization_members": [
+                    {"name": "Ada", "github-username": "ada", "github-role": "admin"}
+                ],
+                "github_repositories": [
+                    {"name": "platform-core", "profile": "internal"},
+                    {"name": "docs", "description": "Docs"},
+                ],
+            }
+        )
+
+        run = run_program(config)
+
+        assert len(run.resources) == 1 + 1 + 2 * 2
+        (provider,) = run.named("pulumi:providers:github").values()
+        assert provider["owner"] == "octo-org"
+        (invoke,) = run.invokes
+        assert invoke.token == "bitwarden:index/getItemLogin:getItemLogin"
+        assert invoke.args["search"] == program.GITHUB_SECRETS_ITEM
+        assert run.named("github:index/membership:Membership") == {
+            "github_membership_for_Ada": {"username": "ada", "role": "admin"}
+        }
+        repositories = run.named("github:index/repository:Repository")
+        assert repositories["platform-core"]["visibility"] == "private"
+        assert repositories["docs"]["description"] == "Docs"
+        protection = run.named("github:index/branchProtection:BranchProtection")
+        assert protection["docs-main-branch-protection"] == {
+            "repositoryId": "docs",
+            "pattern": "main",
+            "enforceAdmins": True,
+            "requireSignedCommits": True,
+        }
+        assert INDEX_OUTPUT in run.outputs
+
+    def test_construction_time_budget(self, run_program):
+        run = run_program(_org(100))
+
+        assert len(run.resources) == 301
+        per_1000 = run.construct_seconds / len(run.resources) * 1000
+        assert per_1000 < SECONDS_PER_1000_RESOURCES
+
+    def test_construction_allocation_budget(self, run_program):
+        run = run_program(_org(100), trace_allocations=True)
+
+        per_1000 = run.peak_allocated_mb / len(run.resources) * 1000
+        assert per_1000 < ALLOCATED_MB_PER_1000_RESOURCES
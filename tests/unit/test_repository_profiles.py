@@ -0,0 +1,93 @@
+"""
+Unit tests for repository profiles and their memoized resolution.
+"""
+
+import pytest
+
+from modules.config_model import ConfigError, validate
+from modules.repository_profiles import (
+    DEFAULT_SETTINGS,
+    ProfileError,
+    ProfileResolver,
+    RepositorySettings,
+)
+
+PROFILES = {
+    "default": {"delete-branch-on-merge": True},
+    "service": {"topics": ["platform", "service"], "allow-merge-commit": False},
+    "internal-service": {"extends": "service", "visibility": "private"},
+}
+
+
+@pytest.mark.unit
+class TestRepositoryProfiles:
+    """Test layering, sharing and reference errors."""
+
+    def test_layers_defaults_profiles_and_overrides(self):
+        resolver = ProfileResolver(PROFILES)
+
+        settings = resolver.resolve(("internal-service",), {"topics": ["core"]})
+
+        assert settings == RepositorySettings(
+            visibility="private",
+            topics=("core",),
+            allow_merge_commit=False,
+            delete_branch_on_merge=True,
+        )
+        assert resolver.resolve() == RepositorySettings(delete_branch_on_merge=True)
+        assert ProfileResolver().resolve() is DEFAULT_SETTINGS
+
+    def test_settings_are_shared_per_distinct_combination(self):
+        repositories = [
+            {"name": f"svc-{i}", "profile": "internal-service"} for i in range(500)
+        ]
+        repositories += [{"name": f"lib-{i}"} for i in range(500)]
+        # A different combination that resolves to the same settings
+        repositories.append(
+            {"name": "lib-x", "profile": "default", "delete-branch-on-merge": True}
+        )
+
+        config = validate(
+            {
+                "github_repository_profiles": PROFILES,
+                "github_repositories": repositories,
+            }
+        )
+
+        distinct = {id(repo.settings) for repo in config.repositories}
+        assert len(distinct) == 2
+        assert config.repositories[0].settings.visibility == "private"
+        assert config.repositories[-1].settings is config.repositories[500].settings
+
+    def test_reference_errors(self):
+        resolver = ProfileResolver({"a": {"extends": "b"}, "b": {"extends": "a"}})
+
+        with pytest.raises(ProfileError, match="a -> b -> a"):
+            resolver.flatten("a")
+        with pytest.raises(ProfileError, match="unknown profile 'c'"):
+            resolver.resolve(("c",))
+
+    def test_config_errors_have_locations(self):
+        data = {
+            "github_repository_profiles": {
+                "loop": {"extends": "loop"},
+                "bad": {"visibility": "secret", "topics": [1]},
+            },
+            "github_repositories": [
+                {"name": "x", "profile": "missing"},
+                {"name": "y", "allow-merge-commit": "no"},
+            ],
+        }
+
+        with pytest.raises(ConfigError) as raised:
+            validate(data)
+
+        assert [str(issue) for issue in raised.value.issues] == [
+            "github_repository_profiles.bad.topics: expected a list of strings",
+            "github_repository_profiles.bad.visibility: "
+            "'secret' is not one of internal, private, public",
+            "github_repository_profiles.loop.extends: "
+            "profile 'loop' extends itself: loop -> loop",
+            "github_repositories[0].profile: unknown profile 'missing'",
+            "github_repositories[1].allow-merge-commit: " "expected a boolean, got str",
+        ]
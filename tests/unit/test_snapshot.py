@@ -0,0 +1,111 @@
+"""
+Unit tests for org state snapshots and streaming diffs.
+"""
+
+import dataclasses
+
+import pytest
+
+from modules.org_state import BranchProtectionState, MemberState, OrgState
+from modules.snapshot import (
+    ADDED,
+    BLOCK_ROWS,
+    CHANGED,
+    MAGIC,
+    REMOVED,
+    Snapshot,
+    SnapshotFormatError,
+    diff_snapshots,
+    main,
+    read_state,
+    write_snapshot,
+)
+from modules.synthetic_org import generate_org
+
+
+@pytest.fixture
+def state():
+    return generate_org(repos=3 * BLOCK_ROWS + 7, members=500, seed=3).to_state()
+
+
+@pytest.mark.unit
+class TestSnapshot:
+    """Test snapshot round trips, lookups and diffs."""
+
+    def test_round_trip_and_lookup(self, tmp_path, state):
+        path = tmp_path / "org.snap"
+        write_snapshot(state, path, metadata={"owner": "synthetic-org"})
+
+        with Snapshot(path) as snap:
+            rows = dict(snap.rows("repositories"))
+            repo = state.repositories["repo-001500"]
+
+            assert snap.metadata == {"owner": "synthetic-org"}
+            assert len(rows) == len(state.repositories)
+            assert list(rows) == sorted(rows)
+            assert snap.lookup("repositories", "repo-001500")[:3] == (
+                repo.name,
+                repo.description,
+                repo.visibility,
+            )
+            assert snap.lookup("members", "user-000042") == ("user-000042", "member")
+            assert snap.lookup("members", "nobody") is None
+
+    def test_identical_snapshots_have_no_diff(self, tmp_path, state):
+        write_snapshot(state, tmp_path / "a.snap")
+        write_snapshot(state, tmp_path / "b.snap")
+
+        with Snapshot(tmp_path / "a.snap") as a, Snapshot(tmp_path / "b.snap") as b:
+            assert list(diff_snapshots(a, b)) == []
+
+    def test_diff_reports_added_removed_and_changed(self, tmp_path, state):
+        write_snapshot(state, tmp_path / "old.snap")
+
+        members = dict(state.members)
+        del members["user-000001"]
+        members["newcomer"] = MemberState("newcomer", "member")
+        repositories = dict(state.repositories)
+        repositories["repo-002000"] = dataclasses.replace(
+            repositories["repo-002000"], visibility="internal", archived=True
+        )
+        write_snapshot(OrgState(members, repositories), tmp_path / "new.snap")
+
+        with Snapshot(tmp_path / "old.snap") as old:
+            with Snapshot(tmp_path / "new.snap") as new:
+                changes = list(diff_snapshots(old, new))
+
+        assert [(c["table"], c["key"], c["change"]) for c in changes] == [
+            ("members", "newcomer", ADDED),
+            ("members", "user-000001", REMOVED),
+            ("repositories", "repo-002000", CHANGED),
+        ]
+        assert set(changes[2]["fields"]) == {"visibility", "archived"}
+
+    def test_read_state_keeps_profile_settings(self, tmp_path, state):
+        repositories = dict(state.repositories)
+        repositories["repo-000007"] = dataclasses.replace(
+            repositories["repo-000007"],
+            protection=BranchProtectionState("main", True, False),
+            topics=("a", "b"),
+            allow_merge_commit=False,
+            allow_squash_merge=True,
+            allow_rebase_merge=False,
+            delete_branch_on_merge=True,
+        )
+        original = OrgState(state.members, repositories)
+        write_snapshot(original, tmp_path / "org.snap")
+
+        assert read_state(tmp_path / "org.snap") == original
+
+    def test_diff_skips_an_older_format(self, tmp_path, state, capsys):
+        write_snapshot(state, tmp_path / "old.snap")
+        write_snapshot(state, tmp_path / "new.snap")
+        old = tmp_path / "old.snap"
+        old.write_bytes(old.read_bytes()[:-1] + b"1")
+
+        with pytest.raises(
+            SnapshotFormatError, match=f"expected {MAGIC[-1:].decode()}"
+        ):
+            Snapshot(old)
+        assert main(["diff", str(old), str(tmp_path / "new.snap")]) == 0
+        assert "Skipping diff" in capsys.readouterr().err
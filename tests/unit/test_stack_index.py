@@ -0,0 +1,72 @@
+"""
+Unit tests for the managed entity index.
+"""
+
+import json
+
+import pytest
+
+from modules.stack_index import (
+    INDEX_OUTPUT,
+    StackIndex,
+    StackIndexError,
+    build_index,
+    main,
+)
+
+
+@pytest.fixture
+def document():
+    return build_index(
+        [("OctoCat", "Mona", "admin", "my-org:OctoCat")],
+        [("Platform-Core", "Platform-Core")],
+        [("Platform-Core", "BPR_1")],
+    )
+
+
+@pytest.mark.unit
+class TestStackIndex:
+    """Test building, lazy loading and lookups."""
+
+    def test_lookups_are_case_insensitive(self, document):
+        index = StackIndex(json.dumps(document))
+
+        assert index.has_member("octocat")
+        member = index.member("OCTOCAT")
+        assert member is not None
+        assert (member.name, member.role, member.id) == (
+            "Mona",
+            "admin",
+            "my-org:OctoCat",
+        )
+        assert index.member("someone-else") is None
+        assert index.repository_id("platform-core") == "Platform-Core"
+        assert index.protection_id("PLATFORM-CORE") == "BPR_1"
+        assert index.counts() == {"members": 1, "repositories": 1, "protections": 1}
+
+    def test_urns_use_program_resource_names(self, document):
+        urns = StackIndex(document).urns("dev")
+
+        assert {u.rsplit("::", 1)[1] for u in urns} == {
+            "github_membership_for_Mona",
+            "Platform-Core",
+            "Platform-Core-main-branch-protection",
+        }
+
+    def test_parsing_is_deferred_and_versioned(self, document):
+        index = StackIndex(json.dumps({**document, "version": 99}))
+
+        with pytest.raises(StackIndexError, match="version 99"):
+            index.has_member("octocat")
+        with pytest.raises(StackIndexError):
+            StackIndex.from_outputs({"deploy_inputs_digest": "abc"})
+
+    def test_cli_requires_entities(self, tmp_path, document, capsys):
+        outputs = tmp_path / "stack-outputs.json"
+        outputs.write_text(json.dumps({INDEX_OUTPUT: document}))
+        empty = tmp_path / "empty-outputs.json"
+        empty.write_text(json.dumps({INDEX_OUTPUT: build_index([], [], [])}))
+
+        assert main([str(outputs), "--require-entities"]) == 0
+        assert "members       1" in capsys.readouterr().out
+        assert main([str(empty), "--require-entities"]) == 1
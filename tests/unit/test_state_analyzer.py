@@ -0,0 +1,188 @@
+"""
+Unit tests for checkpoint analysis, compaction and sharding.
+"""
+
+import io
+import json
+
+import pytest
+
+from modules.state_analyzer import (
+    Checkpoint,
+    analyze,
+    compact,
+    iter_checkpoint,
+    shard,
+)
+
+PREFIX = "urn:pulumi:dev::platform-team-admin::"
+STACK_URN = f"{PREFIX}pulumi:pulumi:Stack::platform-team-admin-dev"
+PROVIDER_URN = f"{PREFIX}pulumi:providers:github::default_6_7_0"
+
+
+def resource(resource_type, name, **extra):
+    return {
+        "urn": f"{PREFIX}{resource_type}::{name}",
+        "custom": True,
+        "type": resource_type,
+        "parent": STACK_URN,
+        "provider": f"{PROVIDER_URN}::provider-id",
+        **extra,
+    }
+
+
+@pytest.fixture
+def checkpoint_path(tmp_path):
+    resources = [
+        {"urn": STACK_URN, "custom": False, "type": "pulumi:pulumi:Stack"},
+        {"urn": PROVIDER_URN, "custom": True, "type": "pulumi:providers:github"},
+    ]
+    for i in range(40):
+        repo = f"repo-{i:03d}"
+        resources.append(
+            resource(
+                "github:index/repository:Repository",
+                repo,
+                inputs={"name": repo},
+                outputs={"name": repo, "template": None, "pages": ["x" * 500]},
+            )
+        )
+        repo_urn = f"{PREFIX}github:index/repository:Repository::{repo}"
+        resources.append(
+            resource(
+                "github:index/branchProtection:BranchProtection",
+                f"{repo}-main-branch-protection",
+                inputs={"pattern": "main"},
+                outputs={"pattern": "main"},
+                dependencies=[repo_urn],
+                propertyDependencies={"repositoryId": [repo_urn]},
+            )
+        )
+    resources.append(
+        resource(
+            "github:index/membership:Membership",
+            "github_membership_for_ada",
+            outputs={"role": "admin"},
+        )
+    )
+    resources.append(
+        resource("github:index/repository:Repository", "old-repo", delete=True)
+    )
+    orphan = resource("github:index/repository:Repository", "orphan")
+    orphan["provider"] = f"{PREFIX}pulumi:providers:github::gone::id"
+    resources.append(orphan)
+
+    path = tmp_path / "state.json"
+    path.write_text(
+        json.dumps(
+            {
+                "version": 3,
+                "deployment": {
+                    "manifest": {"time": "2026-01-01T00:00:00Z", "version": "v3"},
+                    "secrets_providers": {"type": "service"},
+                    "resources": resources,
+                    "pending_operations": [{"type": "creating"}],
+                    "metadata": {"integrity_error": None},
+                },
+                "features": ["refresh"],
+            },
+            indent=2,
+        )
+    )
+    return path
+
+
+@pytest.mark.unit
+class TestStateAnalyzer:
+    """Test streaming checkpoint analysis and rewriting."""
+
+    def test_streaming_parse_matches_json_load(self, checkpoint_path):
+        expected = json.loads(checkpoint_path.read_text())["deployment"]
+        checkpoint = Checkpoint()
+
+        with open(checkpoint_path) as f:
+            resources = list(iter_checkpoint(f, checkpoint, chunk_size=7))
+
+        assert resources == expected["resources"]
+        assert checkpoint.deployment["manifest"] == expected["manifest"]
+        assert checkpoint.pending_operations == expected["pending_operations"]
+
+    def test_analyze_reports_types_and_hot_properties(self, checkpoint_path):
+        with open(checkpoint_path) as f:
+            report = analyze(f).to_dict(top=1)
+
+        repos = report["types"]["github:index/repository:Repository"]
+        assert repos["count"] == 42
+        assert list(report["types"])[0] == "github:index/repository:Repository"
+        assert report["hot_properties"][0]["property"] == "pages"
+        assert report["pending_operations"] == 1
+        assert report["pending_delete"] == [
+            f"{PREFIX}github:index/repository:Repository::old-repo"
+        ]
+        assert report["orphaned"] == [
+            f"{PREFIX}github:index/repository:Repository::orphan"
+        ]
+
+    def test_compact_drops_leftovers(self, checkpoint_path):
+        out = io.StringIO()
+        counts = compact(checkpoint_path, out)
+        deployment = json.loads(out.getvalue())["deployment"]
+
+        assert counts == {
+            "kept": 83,
+            "pending_delete": 1,
+            "orphaned": 1,
+            "pending_operations": 1,
+        }
+        assert len(deployment["resources"]) == 83
+        assert "pending_operations" not in deployment
+        assert deployment["manifest"]["version"] == "v3"
+        assert deployment["metadata"] == {"integrity_error": None}
+        assert list(deployment)[-1] == "metadata"
+
+    def test_compact_drops_dependencies_on_dropped_resources(
+        self, checkpoint_path, tmp_path
+    ):
+        data = json.loads(checkpoint_path.read_text())
+        old_urn = f"{PREFIX}github:index/repository:Repository::old-repo"
+        # The membership is the last resource kept
+        data["deployment"]["resources"][-3]["dependencies"] = [old_urn, STACK_URN]
+        checkpoint_path.write_text(json.dumps(data))
+
+        out = io.StringIO()
+        compact(checkpoint_path, out)
+        last = json.loads(out.getvalue())["deployment"]["resources"][-1]
+
+        assert last["dependencies"] == [STACK_URN]
+
+    def test_shard_keeps_repositories_with_their_protection(
+        self, checkpoint_path, tmp_path
+    ):
+        counts = shard(checkpoint_path, 3, tmp_path / "shards", "dev")
+
+        seen = []
+        for index in range(3):
+            name = f"dev-shard-{index}"
+            data = json.loads((tmp_path / "shards" / f"{name}.json").read_text())
+            urns = [r["urn"] for r in data["deployment"]["resources"]]
+            assert len(urns) == counts[index]
+            assert urns[0].endswith(f"pulumi:pulumi:Stack::platform-team-admin-{name}")
+            assert all(u.startswith(f"urn:pulumi:{name}::") for u in urns)
+            repos = {u.rsplit("::", 1)[1] for u in urns if "Repository::" in u}
+            protected = {
+                u.rsplit("::", 1)[1].removesuffix("-main-branch-protection")
+                for u in urns
+                if "BranchProtection::" in u
+            }
+            assert protected <= repos
+            seen += [u for u in urns if "github:index" in u]
+            for r in data["deployment"]["resources"]:
+                if "BranchProtection::" in r["urn"]:
+                    (dependency,) = r["dependencies"]
+                    assert dependency in urns
+                    assert r["propertyDependencies"]["repositoryId"] == [dependency]
+            assert data["deployment"]["metadata"] == {"integrity_error": None}
+            assert data["features"] == ["refresh"]
+
+        # Every GitHub resource lands in exactly one shard
+        assert len(seen) == 40 * 2 + 3
@@ -0,0 +1,86 @@
+"""
+Unit tests for the opt-in program tracing.
+"""
+
+import json
+
+import pytest
+
+from modules import tracing
+from modules.tracing import Tracer, folded, instrument, main, span
+
+
+class _Resolved:
+    """Stands in for an Output that has already resolved."""
+
+    def apply(self, fn):
+        return fn("urn")
+
+
+def _resource(name, **kwargs):
+    return _Resolved()
+
+
+def _span(name, span_id, start, end, parent=None):
+    document = {
+        "name": name,
+        "spanId": span_id,
+        "startTimeUnixNano": str(start * 1000),
+        "endTimeUnixNano": str(end * 1000),
+    }
+    return {**document, "parentSpanId": parent} if parent else document
+
+
+@pytest.mark.unit
+class TestTracing:
+    """Test the disabled fast path, span nesting and both export formats."""
+
+    def test_disabled_returns_the_original_callables(self, monkeypatch):
+        monkeypatch.setattr(tracing, "TRACER", None)
+
+        assert instrument(_resource, "github.Membership", lambda r: r) is _resource
+        assert span("a") is span("b")
+
+    def test_records_nested_and_resolution_spans(self, monkeypatch, tmp_path):
+        tracer = Tracer()
+        monkeypatch.setattr(tracing, "TRACER", tracer)
+        membership = instrument(_resource, "github.Membership", lambda r: r)
+
+        with span("program.run"):
+            with span("register_members", count=1):
+                membership("github_membership_for_Ada", username="ada")
+
+        run, register, construct, resolve = tracer.spans
+        assert register.parent_id == run.span_id
+        assert construct.parent_id == register.span_id
+        assert construct.attributes == {"resource": "github_membership_for_Ada"}
+        assert (resolve.name, resolve.parent_id) == ("resolve github.Membership", None)
+        assert all(s.end_ns >= s.start_ns > 0 for s in tracer.spans)
+
+        tracer.write(tmp_path / "trace.json")
+        document = json.loads((tmp_path / "trace.json").read_text())
+        spans = document["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [s["name"] for s in spans] == [s.name for s in tracer.spans]
+        assert {"key": "count", "value": {"intValue": "1"}} in spans[1]["attributes"]
+        stacks = (tmp_path / "trace.folded").read_text().splitlines()
+        assert stacks[0].startswith("program.run ")
+        assert "program.run;register_members;github.Membership" in stacks[-2]
+
+    def test_folded_stacks_use_self_time(self):
+        spans = [
+            _span("run", "1", 0, 100),
+            _span("config", "2", 0, 30, parent="1"),
+            _span("register", "3", 30, 90, parent="1"),
+            _span("register", "4", 90, 95, parent="1"),
+        ]
+
+        assert folded(spans) == {"run": 5, "run;config": 30, "run;register": 65}
+
+    def test_summary_lists_the_slowest_spans(self, tmp_path, capsys):
+        tracer = Tracer()
+        with tracer.span("program.run"):
+            pass
+        tracer.write(tmp_path / "trace.json")
+
+        assert main([str(tmp_path / "trace.json")]) == 0
+        assert "program.run" in capsys.readouterr().out
@@ -0,0 +1,66 @@
+"""
+Unit tests for the workspace server protocol.
+"""
+
+import threading
+
+import pytest
+
+from modules import workspace_server
+
+
+class FakeSession:
+    """Stands in for a WorkspaceSession without starting the engine."""
+
+    def __init__(self):
+        self.requests = []
+
+    def handle(self, request, on_output):
+        self.requests.append(request)
+        if request["op"] == "fail":
+            raise workspace_server.WorkspaceError("engine failed")
+        on_output("Previewing update (dev)\n")
+        on_output("Resources: 3 unchanged\n")
+        return {"ok": True, "seconds": 0.1, "change_summary": {"same": 3}}
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = tmp_path / "workspace.sock"
+    session = FakeSession()
+    thread = threading.Thread(
+        target=workspace_server.serve, args=(path, session), daemon=True
+    )
+    thread.start()
+    for _ in range(100):
+        if path.exists():
+            break
+        thread.join(0.01)
+    yield path, session
+    workspace_server.request("shutdown", path)
+    thread.join(5)
+
+
+@pytest.mark.unit
+class TestWorkspaceServer:
+    """Test request handling and output streaming over the socket."""
+
+    def test_streams_output_then_returns_the_result(self, server):
+        path, session = server
+        lines = []
+
+        for _ in range(2):
+            response = workspace_server.request(
+                "preview", path, on_output=lines.append, target=["urn:a"]
+            )
+
+        assert response["change_summary"] == {"same": 3}
+        assert lines == ["Previewing update (dev)\n", "Resources: 3 unchanged\n"] * 2
+        assert session.requests[0] == {"op": "preview", "target": ["urn:a"]}
+        assert (path.stat().st_mode & 0o777) == 0o600
+
+    def test_engine_errors_are_reported(self, server):
+        path, _session = server
+
+        with pytest.raises(workspace_server.WorkspaceError, match="engine failed"):
+            workspace_server.request("fail", path)